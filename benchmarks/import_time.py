@@ -0,0 +1,75 @@
+"""
+Measures the time taken to import pybde in a fresh interpreter.
+
+Each measurement runs ``import pybde`` in a new Python process so the cost of loading pybde and
+its dependencies is included. The script also checks that importing pybde does not load
+matplotlib or the process pool executor, which should only be imported when a plotting method
+is first used or a parallel run first starts.
+
+Usage::
+
+    python benchmarks/import_time.py [--repeat N] [--max-seconds S]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+_IMPORT_SCRIPT = """
+import sys
+import time
+start = time.perf_counter()
+import pybde
+elapsed = time.perf_counter() - start
+print(elapsed, 'matplotlib' in sys.modules, 'concurrent.futures.process' in sys.modules)
+"""
+
+
+def measure_import_time():
+    """
+    Imports pybde in a new Python process.
+
+    Returns
+    -------
+
+    float, bool, bool
+        The import time in seconds and whether matplotlib and the process pool executor were
+        loaded by the import.
+    """
+    output = subprocess.check_output([sys.executable, "-c", _IMPORT_SCRIPT],
+                                     universal_newlines=True)
+    elapsed, matplotlib_loaded, pool_loaded = output.split()
+    return float(elapsed), matplotlib_loaded == "True", pool_loaded == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10,
+                        help="number of fresh interpreters to time (default: 10)")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="fail if the median import time exceeds this value")
+    args = parser.parse_args()
+
+    times = []
+    for _ in range(args.repeat):
+        elapsed, matplotlib_loaded, pool_loaded = measure_import_time()
+        if matplotlib_loaded:
+            print("FAIL: importing pybde loaded matplotlib")
+            return 1
+        if pool_loaded:
+            print("FAIL: importing pybde loaded concurrent.futures.process")
+            return 1
+        times.append(elapsed)
+
+    median = statistics.median(times)
+    print("import pybde: median {:.1f} ms, min {:.1f} ms over {} runs".format(
+        median * 1000, min(times) * 1000, len(times)))
+
+    if args.max_seconds is not None and median > args.max_seconds:
+        print("FAIL: median import time exceeds {} s".format(args.max_seconds))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,471 @@
+"""
+Benchmarks the hot paths of pybde: the solver, the candidate switch finder, Boolean time series
+operations, thresholding and the validator.
+
+Each benchmark is timed over several repeats and the fastest time is reported together with the
+throughput (work units per second, usually switch points per second) and the peak memory
+allocated, measured with tracemalloc in a separate run. Benchmarks belonging to a family are run
+at several sizes and the scaling exponent of the family is the slope of log(time) against
+log(size).
+
+Results are saved as JSON so runs on different commits can be compared with ``--compare``.
+
+Usage::
+
+    python benchmarks/suite.py [--quick] [--filter TEXT] [--repeat N] [--output FILE]
+                               [--compare FILE]
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from pybde import BDESolver, BooleanTimeSeries, BDESolverValidator  # noqa: E402
+from pybde.bde_solver import CandidateSwitchFinder  # noqa: E402
+from pybde.generators import RandomNetwork  # noqa: E402
+
+FORMAT_VERSION = 1
+
+
+class ParityNetwork:
+    """
+    Random network in which each variable is True when an even number of its delayed inputs
+    are True. With one input per variable each variable negates its input, which keeps the
+    number of switches per unit time roughly constant so the work grows linearly with the
+    size of the network, the simulated time and the switch density of the history.
+
+    Parameters
+    ----------
+
+    n_variables : int
+        Number of variables.
+    n_delays : int
+        Number of delays.
+    in_degree : int
+        Number of inputs of each variable.
+    seed : int
+        Seed of the random number generator.
+    """
+    def __init__(self, n_variables, n_delays, in_degree=1, seed=0):
+        rng = random.Random(seed)
+        self.n_variables = n_variables
+        self.delays = [round(rng.uniform(0.5, 1.5), 3) for _ in range(n_delays)]
+        self.inputs = [[(rng.randrange(n_delays), rng.randrange(n_variables))
+                        for _ in range(in_degree)] for _ in range(n_variables)]
+
+    def __call__(self, z):
+        return [sum(z[d][v] for d, v in inputs) % 2 == 0 for inputs in self.inputs]
+
+    def history(self, switches_per_variable=1, seed=0):
+        """
+        Generates a random history as long as the longest delay.
+
+        Parameters
+        ----------
+
+        switches_per_variable : int
+            Number of switch points of each variable.
+        seed : int
+            Seed of the random number generator.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            History of each variable.
+        """
+        rng = random.Random(seed)
+        length = max(self.delays)
+        history = []
+        for _ in range(self.n_variables):
+            times = sorted(set(round(rng.uniform(0.01, length * 0.99), 6)
+                               for _ in range(switches_per_variable)))
+            initial = rng.random() < 0.5
+            states = [initial != (i % 2 == 1) for i in range(len(times) + 1)]
+            history.append(BooleanTimeSeries([0] + times, states, length))
+        return history
+
+
+def random_series(n_switches, end=None, seed=0):
+    """
+    Builds a random Boolean time series with the given number of switch points.
+
+    Parameters
+    ----------
+
+    n_switches : int
+        Number of switch points after the start.
+    end : float
+        End time. Optional. Default is the number of switch points.
+    seed : int
+        Seed of the random number generator.
+
+    Returns
+    -------
+
+    BooleanTimeSeries
+        The time series.
+    """
+    rng = np.random.default_rng(seed)
+    if end is None:
+        end = float(n_switches)
+    times = np.unique(rng.uniform(0, end, n_switches))
+    times = times[times > 0]
+    states = np.arange(len(times) + 1) % 2 == 0
+    return BooleanTimeSeries([0.0] + times.tolist(), states.tolist(), end)
+
+
+def bench_solve(n_variables=8, n_delays=2, end=200.0, switches_per_variable=1):
+    network = ParityNetwork(n_variables, n_delays)
+    history = network.history(switches_per_variable)
+
+    def run():
+        solver = BDESolver(network, network.delays, history)
+        solver.solve(end)
+        return len(solver.res_t)
+    return run
+
+
+def bench_random_network(n_variables=100, in_degree=2, end=20.0, bias=0.2):
+    network = RandomNetwork(n_variables, in_degree=in_degree, bias=bias, seed=0)
+    history = network.history(seed=1)
+
+    def run():
+        solver = BDESolver(network, network.delays, history)
+        solver.solve(end)
+        return len(solver.res_t)
+    return run
+
+
+def bench_candidate_finder(n_switches=10000):
+    delays = [1.0, 0.37, 0.71]
+    x = np.cumsum(np.random.default_rng(0).uniform(0.01, 0.1, n_switches)).tolist()
+    start = x[0] + max(delays)
+    end = x[-1]
+
+    def run():
+        finder = CandidateSwitchFinder(delays, x[:1], start, end)
+        # Feed the finder its own candidates as new switch points, as the solver would when
+        # every candidate changed the state
+        count = 0
+        t = finder.get_next_time()
+        while t is not None and count < n_switches:
+            count += 1
+            finder.add_new_times(t, count)
+            t = finder.get_next_time()
+        return count
+    return run
+
+
+def bench_merge(n_switches=10000, n_series=4):
+    series = [random_series(n_switches, end=1000.0, seed=i) for i in range(n_series)]
+
+    def run():
+        t, _ = BooleanTimeSeries.merge(series)
+        return len(t)
+    return run
+
+
+def bench_unmerge(n_switches=10000, n_series=4):
+    series = [random_series(n_switches, end=1000.0, seed=i) for i in range(n_series)]
+    t, y = BooleanTimeSeries.merge(series)
+
+    def run():
+        BooleanTimeSeries.unmerge(t, y, 1000.0)
+        return len(t)
+    return run
+
+
+def bench_cut(n_switches=100000):
+    bts = random_series(n_switches)
+
+    def run():
+        for i in range(10):
+            bts.cut(i * n_switches / 20, n_switches / 2 + i * n_switches / 20)
+        return 10 * n_switches // 2
+    return run
+
+
+def bench_compress(n_switches=100000):
+    # Every other point repeats the previous state so half the points are removed
+    bts = random_series(2 * n_switches)
+    bts.y = [bool(i // 2 % 2) for i in range(len(bts.y))]
+
+    def run():
+        BooleanTimeSeries.from_trusted_arrays(list(bts.t), list(bts.y), bts.end).compress()
+        return len(bts.t)
+    return run
+
+
+def bench_get_state(n_switches=100000, n_queries=10000, n_single_queries=20):
+    bts = random_series(n_switches)
+    queries = np.random.default_rng(1).uniform(0, n_switches, n_queries).tolist()
+
+    def run():
+        # get_state scans the series so only a few single queries are made
+        for q in queries[:n_single_queries]:
+            bts.get_state(q)
+        bts.get_states(queries)
+        return n_single_queries + n_queries
+    return run
+
+
+def bench_hamming_distance(n_switches=100000):
+    bts1 = random_series(n_switches, seed=1)
+    bts2 = random_series(n_switches, seed=2)
+
+    def run():
+        bts1.hamming_distance(bts2)
+        return 2 * n_switches
+    return run
+
+
+def bench_threshold(n_points=1000000):
+    t = np.linspace(0, 1000, n_points).tolist()
+    y = np.sin(np.linspace(0, 300, n_points)).tolist()
+
+    def run():
+        BooleanTimeSeries.absolute_threshold(t, y, 0.1)
+        BooleanTimeSeries.relative_threshold(t, y, 0.5)
+        return 2 * n_points
+    return run
+
+
+def bench_validate(n_variables=4, end=30.0, n_random=1000):
+    network = ParityNetwork(n_variables, 2)
+    history = network.history()
+    result = BDESolver(network, network.delays, history).solve(end)
+    start = max(network.delays)
+
+    def run():
+        validator = BDESolverValidator(network, network.delays, result)
+        validator.validate(start, end, n_random=n_random, seed=0)
+        return validator.evaluations
+    return run
+
+
+# Each family is (name, benchmark function, parameter varied, sizes, quick sizes, fixed args)
+FAMILIES = [
+    ("solve/variables", bench_solve, "n_variables", [4, 8, 16, 32], [4, 8], {}),
+    ("solve/delays", bench_solve, "n_delays", [1, 2, 4, 8], [1, 2], {}),
+    ("solve/horizon", bench_solve, "end", [100.0, 200.0, 400.0, 800.0], [50.0, 100.0], {}),
+    ("solve/density", bench_solve, "switches_per_variable", [1, 4, 16, 64], [1, 4], {}),
+    ("solve/random_network", bench_random_network, "n_variables", [30, 100, 300, 1000],
+     [30, 100], {}),
+    ("candidate_finder", bench_candidate_finder, "n_switches",
+     [10000, 30000, 100000], [3000, 10000], {}),
+    ("merge", bench_merge, "n_switches", [3000, 10000, 30000], [1000, 3000], {}),
+    ("unmerge", bench_unmerge, "n_switches", [10000, 30000, 100000], [3000, 10000], {}),
+    ("cut", bench_cut, "n_switches", [100000, 300000, 1000000], [10000, 30000], {}),
+    ("compress", bench_compress, "n_switches", [100000, 300000, 1000000], [10000, 30000], {}),
+    ("get_state", bench_get_state, "n_switches", [100000, 300000, 1000000], [10000, 30000], {}),
+    ("hamming_distance", bench_hamming_distance, "n_switches",
+     [30000, 100000, 300000], [10000, 30000], {}),
+    ("threshold", bench_threshold, "n_points", [100000, 300000, 1000000], [10000, 30000], {}),
+    ("validate", bench_validate, "n_random", [1000, 3000, 10000], [300, 1000], {}),
+]
+
+
+def measure(benchmark, repeat):
+    """
+    Times a benchmark and measures its peak memory allocation.
+
+    Parameters
+    ----------
+
+    benchmark : function
+        Benchmark to run, returning the number of work units done.
+    repeat : int
+        Number of timed runs.
+
+    Returns
+    -------
+
+    dict
+        Fastest time in seconds, work units, throughput in units per second and peak memory
+        allocated in bytes.
+    """
+    times = []
+    units = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        units = benchmark()
+        times.append(time.perf_counter() - start)
+
+    # Memory is measured separately as tracing slows the benchmark down
+    tracemalloc.start()
+    try:
+        benchmark()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(times)
+    return {"time": best, "units": units, "throughput": units / best if best > 0 else None,
+            "peak_memory": peak}
+
+
+def scaling_exponent(sizes, times):
+    """
+    Fits time = c * size ** k by least squares on a log-log scale.
+
+    Parameters
+    ----------
+
+    sizes : list of float
+        Problem sizes.
+    times : list of float
+        Times taken.
+
+    Returns
+    -------
+
+    float
+        The exponent k, or None if there are fewer than two sizes.
+    """
+    if len(sizes) < 2:
+        return None
+    slope, _ = np.polyfit(np.log(sizes), np.log(times), 1)
+    return float(slope)
+
+
+def environment():
+    """
+    Describes the environment the benchmarks ran in.
+
+    Returns
+    -------
+
+    dict
+        Git commit, Python, numpy and platform versions and the time of the run.
+    """
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], universal_newlines=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def run_suite(quick=False, name_filter=None, repeat=3):
+    """
+    Runs the benchmark families.
+
+    Parameters
+    ----------
+
+    quick : bool
+        Whether to use the small quick sizes.
+    name_filter : str
+        Only run families whose name contains this text. Optional.
+    repeat : int
+        Number of timed runs of each benchmark.
+
+    Returns
+    -------
+
+    dict
+        The environment, the result of each benchmark and the scaling exponent of each
+        family.
+    """
+    results = []
+    scaling = {}
+    for name, function, parameter, sizes, quick_sizes, fixed in FAMILIES:
+        if name_filter and name_filter not in name:
+            continue
+        family_times = []
+        for size in quick_sizes if quick else sizes:
+            args = dict(fixed)
+            args[parameter] = size
+            result = measure(function(**args), repeat)
+            result["name"] = "{}[{}={}]".format(name, parameter, size)
+            result["family"] = name
+            result["size"] = size
+            results.append(result)
+            family_times.append(result["time"])
+            print("{:45s} {:10.4f} s {:14.0f} units/s {:10.1f} MiB".format(
+                result["name"], result["time"], result["throughput"] or 0,
+                result["peak_memory"] / 2**20))
+            sys.stdout.flush()
+        scaling[name] = scaling_exponent(quick_sizes if quick else sizes, family_times)
+        print("{:45s} scaling exponent {:.2f}".format(name, scaling[name]))
+
+    return {"format_version": FORMAT_VERSION, "environment": environment(),
+            "results": results, "scaling": scaling}
+
+
+def compare(baseline, current):
+    """
+    Prints the change of each benchmark's time relative to a baseline run.
+
+    Parameters
+    ----------
+
+    baseline : dict
+        Results of the baseline run.
+    current : dict
+        Results of the current run.
+    """
+    baseline_times = {result["name"]: result["time"] for result in baseline["results"]}
+    print()
+    print("Compared with {} ({}):".format(baseline["environment"].get("commit"),
+                                          baseline["environment"].get("date")))
+    for result in current["results"]:
+        if result["name"] in baseline_times:
+            ratio = result["time"] / baseline_times[result["name"]]
+            print("{:45s} {:7.2f}x {}".format(result["name"], ratio,
+                                              "slower" if ratio > 1 else "faster"))
+    for name, exponent in current["scaling"].items():
+        old = baseline["scaling"].get(name)
+        if old is not None and exponent is not None and not math.isclose(old, exponent,
+                                                                          abs_tol=0.1):
+            print("{:45s} scaling exponent {:.2f} -> {:.2f}".format(name, old, exponent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="run small sizes only, e.g. as a smoke test")
+    parser.add_argument("--filter", default=None,
+                        help="only run benchmark families whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of timed runs of each benchmark (default: 3)")
+    parser.add_argument("--output", default=None,
+                        help="save the results to this JSON file")
+    parser.add_argument("--compare", default=None,
+                        help="compare with results previously saved to this JSON file")
+    args = parser.parse_args()
+
+    current = run_suite(quick=args.quick, name_filter=args.filter, repeat=args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), current)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
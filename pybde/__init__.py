@@ -1,3 +1,12 @@
-from .bde_solver import BDESolver
+from .bde_solver import (BDESolver, SolveStats, SolveResult, MemoryReport, CancellationToken,
+                         SwitchExplosionError)
 from .boolean_time_series import BooleanTimeSeries
-from .bde_solver_validator import BDESolverValidator
+from .bde_solver_validator import BDESolverValidator, EnsembleValidationResult, validate_many
+from .storage import save_boolean_time_series, load_boolean_time_series
+from .cache import SolveCache
+from .fitting import DelayFitter, FitResult, threshold_search
+from .ensemble import StateFractions, SwitchCounts, DutyCycles, run_ensemble
+from .histories import random_histories
+from .attractors import find_attractors
+from .generators import RandomNetwork
+from .stop_conditions import StopCondition, VariableBecomes, StateMatches, Sequence
@@ -0,0 +1,390 @@
+import bisect
+import hashlib
+import os
+import numpy as np
+from pybde.bde_solver import BDESolver
+from pybde.histories import random_histories
+
+FIXED_POINT = "fixed point"
+PERIODIC = "periodic"
+
+
+class Attractor:
+    """
+    An attractor found by find_attractors.
+
+    Attributes
+    ----------
+
+    kind : str
+        Either FIXED_POINT or PERIODIC.
+    key : str
+        Hexadecimal hash identifying the attractor. Equivalent attractors reached at different
+        phases have the same key.
+    period : float
+        Period of the orbit. 0 for a fixed point.
+    t : list of float
+        Switch times of one period of the orbit, starting at 0. For a fixed point this is
+        [0].
+    y : list of list of bool
+        State of the variables at each switch time.
+    members : list of int
+        Indexes of the histories that reached the attractor.
+    """
+    def __init__(self, kind, key, period, t, y):
+        self.kind = kind
+        self.key = key
+        self.period = period
+        self.t = t
+        self.y = y
+        self.members = []
+
+    def __str__(self):
+        """
+        String describing the attractor.
+
+        Returns
+        -------
+
+        str
+            Description of the attractor.
+        """
+        if self.kind == FIXED_POINT:
+            return "fixed point {} reached by {} histories".format(self.y[0], len(self.members))
+        return "periodic orbit with period {} and {} switches reached by {} histories".format(
+            self.period, len(self.t), len(self.members))
+
+
+class AttractorSearchResult:
+    """
+    Result of find_attractors.
+
+    Attributes
+    ----------
+
+    attractors : list of Attractor
+        The distinct attractors found, in the order they were found.
+    assignments : list of str
+        Key of the attractor reached by each history, or None if the behaviour was not resolved
+        within the maximum time.
+    end_times : list of float
+        Time each simulation was run to.
+    """
+    def __init__(self, attractors, assignments, end_times):
+        self.attractors = attractors
+        self.assignments = assignments
+        self.end_times = end_times
+
+    @property
+    def unresolved(self):
+        """
+        Indexes of the histories whose behaviour was not resolved.
+
+        Returns
+        -------
+
+        list of int
+            The indexes.
+        """
+        return [i for i, key in enumerate(self.assignments) if key is None]
+
+    def basin_fractions(self):
+        """
+        Estimates the size of the basin of attraction of each attractor as the fraction of the
+        histories that reached it.
+
+        Returns
+        -------
+
+        dict
+            Fraction of the histories for each attractor key.
+        """
+        return {attractor.key: len(attractor.members) / len(self.assignments)
+                for attractor in self.attractors}
+
+
+def find_attractors(func, delays, histories, max_time, chunk=None, max_workers=None,
+                    batch_size=None, decimals=6, rel_tol=1e-09, abs_tol=0.0):
+    """
+    Simulates a model from many histories, in parallel using a process pool, and classifies
+    the long term behaviour of each simulation as a fixed point, a periodic orbit or
+    unresolved.
+
+    The future of a simulation is determined by the state of the variables over the last
+    max(delays) time units, the state window. Each simulation is extended a chunk at a time.
+    It is classified as a fixed point once no variable has switched for a whole window, and as
+    periodic once the window at a switch repeats an earlier one. Attractors are identified by
+    the smallest of the windows at the switches of one period, so orbits reached at different
+    phases are recognised as the same attractor. A simulation stops as soon as its window
+    matches one of the attractors already found, so most simulations end shortly after their
+    transient.
+
+    Windows are compared after rounding times to the given number of decimal places. Forcing
+    inputs are not supported as they make the behaviour depend on time.
+
+    Parameters
+    ----------
+
+    func : function func(Z)
+        Model function, see BDESolver. When max_workers is not 1 the function is sent to
+        worker processes so it must be picklable, i.e. defined at module level.
+    delays : list of float
+        Values of the time delays.
+    histories : list of list of BooleanTimeSeries
+        Histories to simulate from, see random_histories.
+    max_time : float
+        Maximum time to simulate after the end of each history before the behaviour is
+        regarded as unresolved.
+    chunk : float
+        Time by which simulations are extended between checks. Optional. Default is four times
+        the longest delay.
+    max_workers : int
+        Number of worker processes. Optional. Default is None which uses one per CPU. A value
+        of 1 simulates all the histories in the current process.
+    batch_size : int
+        Number of histories simulated before the attractors found are shared with the workers.
+        Optional. Default is four per worker process.
+    decimals : int
+        Number of decimal places times are rounded to when comparing windows. Optional.
+        Default is 6.
+    rel_tol : float
+        Relative tolerance used when comparing times. Default is 1e-09
+    abs_tol : float
+        Absolute tolerance used when comparing times. Default is 0.0
+
+    Returns
+    -------
+
+    AttractorSearchResult
+        The attractors and the attractor reached by each history.
+    """
+    tau = max(delays)
+    if tau <= 0:
+        raise ValueError("At least one delay must be positive")
+    if chunk is None:
+        chunk = 4 * tau
+
+    n_workers = 1 if max_workers == 1 else (max_workers or os.cpu_count() or 1)
+    if batch_size is None:
+        batch_size = 4 * n_workers
+
+    attractors = {}
+    known_windows = {}
+    assignments = []
+    end_times = []
+
+    executor = None
+    if n_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        for first in range(0, len(histories), batch_size):
+            tasks = [(func, delays, history, max_time, chunk, known_windows, decimals,
+                      rel_tol, abs_tol)
+                     for history in histories[first:first + batch_size]]
+            if executor is None:
+                outcomes = map(_classify, tasks)
+            else:
+                outcomes = executor.map(_classify, tasks)
+
+            for i, (key, end_time, attractor, windows) in enumerate(outcomes, first):
+                if attractor is not None and key not in attractors:
+                    attractors[key] = attractor
+                    for window in windows:
+                        known_windows[window] = key
+                if key is not None:
+                    attractors[key].members.append(i)
+                assignments.append(key)
+                end_times.append(end_time)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return AttractorSearchResult(list(attractors.values()), assignments, end_times)
+
+
+def _classify(task):
+    """
+    Simulates the model from one history until its behaviour is classified.
+
+    Parameters
+    ----------
+
+    task : tuple
+        The model function, delays, history, maximum time, chunk, known windows, decimal
+        places and tolerances.
+
+    Returns
+    -------
+
+    str, float, Attractor, list of tuple
+        The key of the attractor reached or None, the time simulated to, the attractor if it
+        was not already known or None, and the windows of the attractor if it was not already
+        known.
+    """
+    func, delays, history, max_time, chunk, known_windows, decimals, rel_tol, abs_tol = task
+
+    solver = BDESolver(func, delays, history, rel_tol=rel_tol, abs_tol=abs_tol)
+    tau = max(delays)
+    rounded_tau = round(tau, decimals)
+    start = solver.start_t
+    last_time = start + max_time
+
+    seen = {}
+    checked = 0
+    end = min(start + chunk, last_time)
+    solver.solve(end)
+    while True:
+        t, y = _switches(solver.res_t, solver.res_y)
+
+        # Only switches after the start have a window that is a simulated state
+        first = max(checked, bisect.bisect_left(t, start))
+        for k in range(first, len(t)):
+            window = _window(t, y, k, tau, rounded_tau, decimals)
+            if window in known_windows:
+                return known_windows[window], end, None, None
+            if window in seen:
+                key, attractor, windows = _new_periodic(
+                    t, y, seen[window], k, tau, rounded_tau, decimals)
+                return key, end, attractor, windows
+            seen[window] = k
+        checked = len(t)
+
+        if round(end - t[-1], decimals) >= rounded_tau:
+            key = _hash("fixed", y[-1].tobytes())
+            attractor = Attractor(FIXED_POINT, key, 0.0, [0.0], [y[-1].tolist()])
+            return key, end, attractor, []
+
+        if end >= last_time:
+            return None, end, None, None
+
+        end = min(end + chunk, last_time)
+        solver.resolve(end=end)
+
+
+def _new_periodic(t, y, j, k, tau, rounded_tau, decimals):
+    """
+    Builds a newly found periodic attractor from a repeated window.
+
+    Parameters
+    ----------
+
+    t : numpy array of float
+        Switch times.
+    y : 2D numpy array of bool
+        State at each switch time.
+    j : int
+        Index of the earlier switch with the repeated window.
+    k : int
+        Index of the later switch with the repeated window.
+    tau : float
+        Window length.
+    rounded_tau : float
+        Rounded window length.
+    decimals : int
+        Number of decimal places times are rounded to.
+
+    Returns
+    -------
+
+    str, Attractor, list of tuple
+        The key of the attractor, the attractor and its windows.
+    """
+    period = t[k] - t[j]
+    orbit = list(range(j + 1, k + 1))
+    windows = [_window(t, y, i, tau, rounded_tau, decimals) for i in orbit]
+
+    # Canonical phase is the switch with the smallest window
+    phase = min(range(len(orbit)), key=lambda i: windows[i])
+    orbit = orbit[phase:] + orbit[:phase]
+    orbit_t = [float((t[i] - t[orbit[0]]) % period) for i in orbit]
+    orbit_y = [y[i].tolist() for i in orbit]
+
+    key = _hash("periodic", repr((round(period, decimals), windows[phase])).encode())
+    return key, Attractor(PERIODIC, key, float(period), orbit_t, orbit_y), windows
+
+
+def _switches(res_t, res_y):
+    """
+    Removes result entries where the state does not change.
+
+    Parameters
+    ----------
+
+    res_t : list of float
+        Switch point times.
+    res_y : list of list of bool
+        State of the variables at each switch point.
+
+    Returns
+    -------
+
+    numpy array of float, 2D numpy array of bool
+        Times and states at which the state changes, starting with the initial state.
+    """
+    t = np.asarray(res_t, dtype=float)
+    y = np.asarray(res_y, dtype=bool)
+    keep = np.ones(len(t), dtype=bool)
+    keep[1:] = np.any(y[1:] != y[:-1], axis=1)
+    return t[keep], y[keep]
+
+
+def _window(t, y, k, tau, rounded_tau, decimals):
+    """
+    Encodes the state window of length tau ending at a switch.
+
+    Parameters
+    ----------
+
+    t : numpy array of float
+        Switch times.
+    y : 2D numpy array of bool
+        State at each switch time.
+    k : int
+        Index of the switch ending the window.
+    tau : float
+        Window length.
+    rounded_tau : float
+        Rounded window length.
+    decimals : int
+        Number of decimal places times are rounded to.
+
+    Returns
+    -------
+
+    tuple
+        The state at the start of the window followed by the rounded time before the end of
+        the window and the state of each switch in the window.
+    """
+    lo = int(np.searchsorted(t, t[k] - tau - 2 * 10.0 ** -decimals))
+    switches = []
+    for i in range(k, lo - 1, -1):
+        offset = round(float(t[k] - t[i]), decimals)
+        if offset >= rounded_tau:
+            break
+        switches.append((offset, y[i].tobytes()))
+    initial = y[max(k - len(switches), 0)].tobytes()
+    return (initial,) + tuple(switches)
+
+
+def _hash(kind, data):
+    """
+    Calculates the key of an attractor.
+
+    Parameters
+    ----------
+
+    kind : str
+        Kind of attractor.
+    data : bytes
+        Canonical description of the attractor.
+
+    Returns
+    -------
+
+    str
+        Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256(kind.encode())
+    digest.update(data)
+    return digest.hexdigest()
@@ -3,8 +3,13 @@ import sys
 import math
 import logging
 import heapq
-import matplotlib.pyplot as plt
+import bisect
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
 from pybde.boolean_time_series import BooleanTimeSeries
+from pybde.export import export_result
 
 
 class IndexType(IntEnum):
@@ -54,6 +59,8 @@ class CandidateSwitchFinder:
     def __init__(self, delays, x, start, end, forced_x=None, rel_tol=1e-09, abs_tol=0.0):
 
         self.logger = logging.getLogger(__name__ + ".CandidateSwitchFinder")
+        # Checked once, building the log messages is a large share of each step
+        self.debug = self.logger.isEnabledFor(logging.DEBUG)
 
         self.rel_tol = rel_tol
         self.abs_tol = abs_tol
@@ -79,24 +86,27 @@ class CandidateSwitchFinder:
             for j, t in enumerate(x):
                 if self.is_time_before_end(t + d):
                     heapq.heappush(self.times, (t + d, i, IndexType.VARIABLE, j))
-                    self.logger.debug("Adding CSP (%s, %s, %s, %s)",
-                                      t + d, i, IndexType.VARIABLE, j)
+                    if self.debug:
+                        self.logger.debug("Adding CSP (%s, %s, %s, %s)",
+                                          t + d, i, IndexType.VARIABLE, j)
 
             if self.have_forced_inputs:
                 for j, t in enumerate(forced_x):
                     if self.is_time_before_end(t + d):
                         heapq.heappush(self.times, (t + d, i, IndexType.FORCED_INPUT, j))
-                        self.logger.debug("Adding CSP (%s, %s, %s, %s)",
-                                          t + d, i, IndexType.FORCED_INPUT, j)
+                        if self.debug:
+                            self.logger.debug("Adding CSP (%s, %s, %s, %s)",
+                                              t + d, i, IndexType.FORCED_INPUT, j)
 
         # pop all the indexes until start - this gets all the index correct before start
         self.pop_until_start()
-        self.logger.debug("Processed all CSPs before start.")
 
         # Add the start time in case it is not a candidate - give it no new index information
         heapq.heappush(self.times, (start, -1, IndexType.NONE, -1))
-        self.logger.debug("Adding CSP (%s, %s, %s, %s)",
-                          start, -1, IndexType.NONE, -1)
+        if self.debug:
+            self.logger.debug("Processed all CSPs before start.")
+            self.logger.debug("Adding CSP (%s, %s, %s, %s)",
+                              start, -1, IndexType.NONE, -1)
 
     def add_new_times(self, t, variable_state_index):
         """
@@ -110,16 +120,13 @@ class CandidateSwitchFinder:
         variable_state_index:
             Index into the state variables array for this switch point.
         """
-        for i in range(0, len(self.delays)):
-            new_time = self.delays[i] + t
-            if self.is_time_before_end(new_time):
+        for i, delay in enumerate(self.delays):
+            new_time = delay + t
+            if new_time < self.end or self.times_are_equal(new_time, self.end):
                 heapq.heappush(self.times, (new_time, i, IndexType.VARIABLE, variable_state_index))
-                self.logger.debug("Adding CSP "
-                                  ""
-                                  ""
-                                  ""
-                                  "(%s, %s, %s, %s)",
-                                  new_time, i, IndexType.VARIABLE, variable_state_index)
+                if self.debug:
+                    self.logger.debug("Adding CSP (%s, %s, %s, %s)",
+                                      new_time, i, IndexType.VARIABLE, variable_state_index)
 
     def get_next_time(self):
         """
@@ -132,20 +139,23 @@ class CandidateSwitchFinder:
             The time of the next candidate switch point, or None if not candidate switch
             points left.
         """
-        self.logger.debug("CSPs: %s", self.times)
+        if self.debug:
+            self.logger.debug("CSPs: %s", self.times)
 
-        times = []
         if self.times:
             next_time = self.pop_and_update_indices()
-            times.append(next_time)
 
-            while self.times and self.times_are_equal(self.times[0][0], next_time):
-                times.append(self.times[0][0])
-                self.pop_and_update_indices()
+            if self.times and self.times_are_equal(self.times[0][0], next_time):
+                times = [next_time]
+                while self.times and self.times_are_equal(self.times[0][0], next_time):
+                    times.append(self.times[0][0])
+                    self.pop_and_update_indices()
 
-            # take the median time to avoid drift towards the lowest
-            next_time = times[len(times)//2]
-            self.logger.debug("Next time is: %s", next_time)
+                # take the median time to avoid drift towards the lowest
+                next_time = times[len(times)//2]
+
+            if self.debug:
+                self.logger.debug("Next time is: %s", next_time)
 
             return next_time
 
@@ -193,6 +203,26 @@ class CandidateSwitchFinder:
 
         return self.times_are_equal(t, self.end)
 
+    def restore_state(self, times, indices, forced_indices=None):
+        """
+        Replaces the candidate switch points and indices, for example to continue a run from a
+        checkpoint.
+
+        Parameters
+        ----------
+
+        times : list of tuple
+            Candidate switch points, in heap order.
+        indices : list of int
+            Index into the variables state array for each delay.
+        forced_indices : list of int
+            Index into the forced input state array for each delay. Default value is None.
+        """
+        self.times = times
+        self.indices = indices
+        if self.have_forced_inputs:
+            self.forced_indices = forced_indices
+
     def pop_until_start(self):
         """
         Removes all candidate end points that occur before the simulation start time,
@@ -222,222 +252,2010 @@ class CandidateSwitchFinder:
         return next_time
 
 
-class BDESolver:
+class SolveStats:
     """
-    Boolean Delay Equation solver.
+    Counters and timers of a simulation run. The counters are updated as the simulation runs.
 
-    Parameters
+    Attributes
     ----------
 
-    func : function func(Z) or func(Z1,Z2) if forced inputs are used
-        Z is a list of lists - first index is delay, second is variable
-        so Z[0][2] is the values of the 3rd variable at the 1st delay.
-        If forcing inputs are used then a second argument Z2 is passed.
-        The indexes are the same except they refer to the forcing inputs.
+    candidates_popped : int
+        Number of candidate switch points removed from the heap, including those before the
+        start time.
+    ties_coalesced : int
+        Number of candidate switch points merged with another candidate at the same time.
+    model_evaluations : int
+        Number of calls to the model function.
+    state_changes : int
+        Number of times the state of the variables changed.
+    heap_high_water : int
+        Largest number of candidate switch points held in the heap.
+    model_time : float
+        Time spent in the model function, in seconds.
+    heap_time : float
+        Time spent finding candidate switch points, in seconds.
+    results_time : float
+        Time spent building the result time series, in seconds.
+    total_time : float
+        Total time of the run, in seconds. Set when the run finishes.
+    """
+    def __init__(self):
+        self.reset()
 
-    delays : list of float
-        Values of the time delays.
-    history: list of BooleanTimeSeries
-        History time series for each variable.
-    forcing_inputs: list of BooleanTimeSeries
-        Time series for each forcing input. Default value is None.
-    rel_tol : float
-        Relative tolerance used when comparing times. Default is 1e-08
-    abs_tol : float
-        Absolute tolerance used when comparing times. Default is 0.0
+    def reset(self):
+        """
+        Sets all the counters and timers to zero.
+        """
+        self.candidates_popped = 0
+        self.ties_coalesced = 0
+        self.model_evaluations = 0
+        self.state_changes = 0
+        self.heap_high_water = 0
+        self.model_time = 0.0
+        self.heap_time = 0.0
+        self.results_time = 0.0
+        self.total_time = 0.0
+
+    @property
+    def loop_time(self):
+        """
+        Time spent in the simulation loop outside the model function and heap, mostly
+        gathering the model inputs and storing new states.
+
+        Returns
+        -------
+
+        float
+            Time in seconds.
+        """
+        return max(self.total_time - self.model_time - self.heap_time - self.results_time, 0.0)
+
+    def __str__(self):
+        """
+        String showing the counters and timers.
+
+        Returns
+        -------
+
+        str
+            The counters and timers, one per line.
+        """
+        return "\n".join([
+            "candidates popped : {}".format(self.candidates_popped),
+            "ties coalesced    : {}".format(self.ties_coalesced),
+            "model evaluations : {}".format(self.model_evaluations),
+            "state changes     : {}".format(self.state_changes),
+            "heap high water   : {}".format(self.heap_high_water),
+            "model time        : {:.6f}s".format(self.model_time),
+            "heap time         : {:.6f}s".format(self.heap_time),
+            "loop time         : {:.6f}s".format(self.loop_time),
+            "results time      : {:.6f}s".format(self.results_time),
+            "total time        : {:.6f}s".format(self.total_time)])
+
+
+class _InstrumentedCandidateSwitchFinder(CandidateSwitchFinder):
     """
-    def __init__(self, func, delays, history, forcing_inputs=None,
-                 rel_tol=1e-09, abs_tol=0.0):
+    CandidateSwitchFinder that records its work in a SolveStats object.
+    """
+    def __init__(self, stats, *args, **kwargs):
+        self.stats = stats
+        start = time.perf_counter()
+        super().__init__(*args, **kwargs)
+        self.stats.heap_time += time.perf_counter() - start
+        self.stats.heap_high_water = max(self.stats.heap_high_water, len(self.times))
 
-        self.logger = logging.getLogger(__name__)
+    def add_new_times(self, t, variable_state_index):
+        start = time.perf_counter()
+        super().add_new_times(t, variable_state_index)
+        self.stats.heap_time += time.perf_counter() - start
+        self.stats.heap_high_water = max(self.stats.heap_high_water, len(self.times))
+        # New times are added for each new state
+        self.stats.state_changes += 1
 
-        self.rel_tol = rel_tol
-        self.abs_tol = abs_tol
+    def get_next_time(self):
+        start = time.perf_counter()
+        popped = self.stats.candidates_popped
+        next_time = super().get_next_time()
+        if self.stats.candidates_popped > popped:
+            self.stats.ties_coalesced += self.stats.candidates_popped - popped - 1
+        self.stats.heap_time += time.perf_counter() - start
+        return next_time
+
+    def pop_and_update_indices(self):
+        self.stats.heap_high_water = max(self.stats.heap_high_water, len(self.times))
+        self.stats.candidates_popped += 1
+        return super().pop_and_update_indices()
 
+
+class _TimedModel:
+    """
+    Model function wrapper that records calls in a SolveStats object.
+    """
+    def __init__(self, func, stats):
         self.func = func
-        self.delays = delays
-        self.t, self.y = BooleanTimeSeries.merge(history)
-        self.history = history
-        self.results = None
+        self.stats = stats
+
+    def __call__(self, *args):
+        start = time.perf_counter()
+        new_state = self.func(*args)
+        self.stats.model_time += time.perf_counter() - start
+        self.stats.model_evaluations += 1
+        return new_state
+
+
+MemorySample = namedtuple("MemorySample", [
+    "t", "result_rows", "result_bytes", "heap_entries", "heap_bytes", "live_rows"])
+MemorySample.__doc__ = """
+Sizes of the solver's data structures at one simulated time. Bytes are estimated from the sizes
+of the Python objects.
+
+Attributes
+----------
+
+t : float
+    Simulated time of the sample.
+result_rows : int
+    Number of switch points in the result arrays, including the history.
+result_bytes : int
+    Estimated size of the result arrays.
+heap_entries : int
+    Number of candidate switch points in the heap.
+heap_bytes : int
+    Estimated size of the heap.
+live_rows : int
+    Number of result rows from the oldest row still referenced by a delay index, i.e. the rows
+    the rest of the simulation can still read.
+"""
+
+
+class MemoryReport:
+    """
+    Memory use of a simulation run, sampled over simulated time.
 
-        # Validate history switch points
-        for data in history:
-            if data.t[0] != 0:
-                raise ValueError("All history data must start at t=0")
+    The sizes of the result arrays and the candidate switch point heap are sampled at evenly
+    spaced simulated times and the peak memory allocated by Python is measured with
+    tracemalloc, separately for the simulation and for building the result time series.
 
-        # All histories must end at the same time, this will be the simulation start time
-        self.start_t = history[0].end
-        for inp in history:
-            if inp.end != self.start_t:
-                raise ValueError("All history data must end at same time.")
+    Parameters
+    ----------
 
-        # Validate forced inputs
-        if forcing_inputs:
-            for data in forcing_inputs:
-                if data.t[0] != 0:
-                    raise ValueError("All forced input data must start at t=0")
+    n_samples : int
+        Number of samples taken over the simulated time. Optional. Default is 100.
 
-        self.forced_inputs = forcing_inputs
-        self.forced_t = None
-        self.forced_y = None
-        self.have_forced_inputs = (forcing_inputs is not None)
-        if self.have_forced_inputs:
-            self.forced_t, self.forced_y = BooleanTimeSeries.merge(forcing_inputs)
+    Attributes
+    ----------
 
-        self.res_t = None
-        self.res_y = None
-        self.end_t = None
+    samples : list of MemorySample
+        The samples, the last one at the end time.
+    peak_heap_entries : int
+        Largest number of candidate switch points held in the heap, checked at every step.
+    peak_live_rows : int
+        Largest number of live result rows, see MemorySample.
+    results_bytes : int
+        Estimated size of the result BooleanTimeSeries.
+    traced_peak : int
+        Peak memory allocated by Python during the simulation, in bytes.
+    traced_results_peak : int
+        Peak memory allocated by Python while building the result time series, in bytes.
+    """
+    def __init__(self, n_samples=100):
+        if n_samples < 1:
+            raise ValueError("n_samples must be at least 1")
+        self.n_samples = n_samples
+        self.reset()
 
-        # Validate delays are all positive
-        for d in delays:
-            if d < 0:
-                raise ValueError("All delays time must be positive")
+    def reset(self):
+        """
+        Discards the samples and measurements.
+        """
+        self.samples = []
+        self.peak_heap_entries = 0
+        self.peak_live_rows = 0
+        self.results_bytes = 0
+        self.traced_peak = 0
+        self.traced_results_peak = 0
+
+    @property
+    def final(self):
+        """
+        The sample at the end time.
 
-        if self.start_t < max(self.delays):
-            raise ValueError(
-                "History must extend greater than or equal to the maximum delay ({}).".format(
-                    max(self.delays)))
+        Returns
+        -------
 
-    def solve(self, end):
+        MemorySample
+            The last sample, or None if no samples have been taken.
         """
-        Run the simulation from the given start time until the given end time.
+        return self.samples[-1] if self.samples else None
+
+    def sample(self, t, res_t, res_y, heap, indices):
+        """
+        Records the sizes of the solver's data structures.
 
         Parameters
         ----------
 
-        end : float
-            End time.
+        t : float
+            Simulated time.
+        res_t : list of float
+            Result switch point times.
+        res_y : list of list of bool
+            Result states.
+        heap : list of tuple
+            Candidate switch point heap.
+        indices : list of int
+            Current result index of each delay.
+        """
+        live_rows = len(res_t) - min(indices) if indices else len(res_t)
+        self.peak_live_rows = max(self.peak_live_rows, live_rows)
+        self.samples.append(MemorySample(
+            t, len(res_t), _result_store_bytes(res_t, res_y), len(heap), _heap_bytes(heap),
+            live_rows))
+
+    def __str__(self):
+        """
+        String summarising the report.
 
         Returns
         -------
 
-        list of BooleanTimeSeries
-            A list containing a BooleanTimeSeries for each simulated variable.
+        str
+            The summary, one measurement per line.
+        """
+        final = self.final
+        result_rows, result_bytes = (final.result_rows, final.result_bytes) if final else (0, 0)
+        peak_heap_bytes = max((s.heap_bytes for s in self.samples), default=0)
+        return "\n".join([
+            "samples             : {}".format(len(self.samples)),
+            "result rows         : {} ({})".format(result_rows, _format_bytes(result_bytes)),
+            "heap entries peak   : {} (sampled {})".format(
+                self.peak_heap_entries, _format_bytes(peak_heap_bytes)),
+            "live rows peak      : {}".format(self.peak_live_rows),
+            "result time series  : {}".format(_format_bytes(self.results_bytes)),
+            "traced peak run     : {}".format(_format_bytes(self.traced_peak)),
+            "traced peak results : {}".format(_format_bytes(self.traced_results_peak))])
+
+
+class _MemorySampler:
+    """
+    Hook of the simulation loop, see _next_time, that samples memory use in a MemoryReport.
+    """
+    def __init__(self, finder, report, res_t, res_y, start, end):
+        self.finder = finder
+        self.report = report
+        self.res_t = res_t
+        self.res_y = res_y
+        self.interval = (end - start) / report.n_samples
+        self.next_sample_t = start
+
+    def before_next(self):
         """
+        Called before the next candidate switch point is requested.
 
-        if self.start_t >= end:
-            raise ValueError("end time ({}) must be greater than simulation start time({})".format(
-                end, self.start_t))
+        Returns
+        -------
 
-        self.end_t = end
+        bool
+            Always False, sampling never stops the run.
+        """
+        return False
 
-        # Result arrays - we start with the given history
-        self.res_t = self.t.copy()
-        self.res_y = self.y.copy()
+    def after_next(self, t):
+        """
+        Samples memory use after the next candidate switch point has been requested.
 
-        candidate_switch_finder = CandidateSwitchFinder(
-            self.delays, self.t, self.start_t, self.end_t, self.forced_t,
-            rel_tol=self.rel_tol, abs_tol=self.abs_tol)
+        Parameters
+        ----------
 
-        t = candidate_switch_finder.get_next_time()
-        while t is not None:
-            self.logger.debug("======================================================")
-            self.logger.debug("t=%f", t)
-            Z = []
-            for d_index in range(len(candidate_switch_finder.indices)):
-                i = candidate_switch_finder.indices[d_index]
-                self.logger.debug(
-                    "Delay %s is at index %s of result list = %s", d_index, i, self.res_y)
-                Z.append(self.res_y[i])
+        t : float
+            The next candidate switch point, or None at the end of the run.
 
-            if not self.have_forced_inputs:
-                new_state = self.func(Z)
-                self.logger.debug("Input to model function for time t=%f is %s", t, Z)
-            else:
-                Z2 = []
-                for i in candidate_switch_finder.forced_indices:
-                    Z2.append(self.forced_y[i])
-                new_state = self.func(Z, Z2)
-                self.logger.debug("Input to model function for time t=%f is %s, %s", t, Z, Z2)
+        Returns
+        -------
 
-            self.logger.debug("New state at t=%f is %s", t, new_state)
+        float
+            The candidate switch point, unchanged.
+        """
+        heap = self.finder.times
+        if len(heap) > self.report.peak_heap_entries:
+            self.report.peak_heap_entries = len(heap)
+        if t is None:
+            # The finder's end is brought forward if the run is stopped early
+            self.report.sample(self.finder.end, self.res_t, self.res_y, heap,
+                               self.finder.indices)
+        elif t >= self.next_sample_t:
+            self.report.sample(t, self.res_t, self.res_y, heap, self.finder.indices)
+            self.next_sample_t = t + self.interval
+        return t
+
+
+class CancellationToken:
+    """
+    Token used to cancel a running simulation from another thread, see BDESolver.solve.
+    """
+    def __init__(self):
+        self._event = threading.Event()
 
-            # Keep this state if it has changed or this is the end of the simulation
-            if new_state != self.res_y[-1] or t == self.end_t:
-                self.logger.debug("State has changed so adding new state: %s", new_state)
-                self.res_t.append(t)
-                self.res_y.append(new_state)
-                candidate_switch_finder.add_new_times(t, len(self.res_t) - 1)
-            else:
-                self.logger.debug("State has not changed")
+    def cancel(self):
+        """
+        Requests the cancellation of the simulations using the token.
+        """
+        self._event.set()
 
-            t = candidate_switch_finder.get_next_time()
+    @property
+    def cancelled(self):
+        """
+        Whether cancellation has been requested.
 
-        # Copy over labels and styles
-        self.results = BooleanTimeSeries.unmerge(self.res_t, self.res_y, self.end_t)
-        for i, result in enumerate(self.results):
-            result.label = self.history[i].label
-            result.style = self.history[i].style
+        Returns
+        -------
 
-        return self.results
+        bool
+            True if cancel has been called.
+        """
+        return self._event.is_set()
 
-    def print_result(self, file=sys.stdout):
+
+class SwitchExplosionError(RuntimeError):
+    """
+    Raised when a simulation exceeds one of the switch budgets of a BDESolver. After solve or
+    resolve the solver holds the results up to the time the simulation stopped.
+
+    Attributes
+    ----------
+
+    budget : str
+        The budget exceeded, one of 'max_switches', 'max_heap_size' or 'max_switch_rate'.
+    limit : float
+        Value of the budget.
+    value : float
+        Value that exceeded the budget.
+    t : float
+        Simulated time at which the simulation stopped.
+    switches : int
+        Number of switch points found by the run.
+    heap_size : int
+        Number of candidate switch points in the heap when the simulation stopped.
+    densest_window : (float, float)
+        The window of simulated time, rate_window long, with the most switch points.
+    densest_count : int
+        Number of switch points in the densest window.
+    busiest_variables : list of (int, int)
+        Index and number of switches of the variables that switched most in the densest
+        window, most first. At most five variables are listed.
+    results : list of BooleanTimeSeries
+        The results up to the time the simulation stopped.
+    """
+    def __init__(self, budget, limit, value, t, switches, heap_size, densest_window,
+                 densest_count, busiest_variables):
+        self.budget = budget
+        self.limit = limit
+        self.value = value
+        self.t = t
+        self.switches = switches
+        self.heap_size = heap_size
+        self.densest_window = densest_window
+        self.densest_count = densest_count
+        self.busiest_variables = busiest_variables
+        self.results = None
+        super().__init__(
+            "{} of {} exceeded with {} at t={} after {} switch points with {} candidates in the "
+            "heap. Densest window [{}, {}] has {} switch points, busiest variables "
+            "(index, switches): {}".format(
+                budget, limit, value, t, switches, heap_size, densest_window[0],
+                densest_window[1], densest_count, busiest_variables))
+
+
+class SolveResult:
+    """
+    Result of a simulation run by BDESolver.run. It holds everything the run produced so the
+    solver is not changed and can be shared by concurrent runs.
+
+    Parameters
+    ----------
+
+    delays : list of float
+        Values of the time delays used by the run.
+    end_t : float
+        End time of the run.
+    res_t : list of float
+        Times of the result rows, starting with the history.
+    res_y : list of list of bool
+        State of the variables at each result row.
+    stats : SolveStats
+        Counters and timers of the run, or None.
+    memory_report : MemoryReport
+        Memory use of the run, or None.
+
+    Attributes
+    ----------
+
+    results : list of BooleanTimeSeries
+        A BooleanTimeSeries for each simulated variable.
+    res_t : list of float
+        Times of the merged result, including the history.
+    res_y : list of list of bool
+        State of the variables at each time in res_t.
+    end_t : float
+        End time of the results, earlier than the requested end time if the run was
+        cancelled or stopped.
+    delays : list of float
+        Values of the time delays used by the run.
+    stats : SolveStats
+        Counters and timers of the run. None unless the solver collects statistics.
+    memory_report : MemoryReport
+        Memory use of the run. None unless the solver profiles memory, and always None for
+        results returned by BDESolver.run.
+    cancelled : bool
+        Whether the run was cancelled.
+    stopped_by : StopCondition or function
+        The stop condition that ended the run, or None.
+    """
+    def __init__(self, delays, end_t, res_t, res_y, stats=None, memory_report=None):
+        self.delays = delays
+        self.end_t = end_t
+        self.res_t = res_t
+        self.res_y = res_y
+        self.stats = stats
+        self.memory_report = memory_report
+        self.results = None
+        self.cancelled = False
+        self.stopped_by = None
+
+
+class _RunMonitor:
+    """
+    Hook of the simulation loop, see _next_time, that reports progress, writes checkpoints
+    and stops the run when cancelled, when a stop condition is met or when a switch budget is
+    exceeded. A stopped run ends at the next candidate switch point, which is not evaluated,
+    and the finder's end is brought forward to it.
+
+    Cancellation and checkpoints are handled before the next candidate switch point is
+    removed from the heap, when the finder and result arrays hold everything needed to
+    continue the run.
+
+    Parameters
+    ----------
+
+    progress : function progress(t, switches, heap_size)
+        Progress callback, or None.
+    progress_interval : float
+        Least wall time between progress calls, in seconds, or None.
+    progress_step : float
+        Least simulated time between progress calls, or None.
+    cancel : CancellationToken
+        Token checked at each candidate switch point, or None.
+    max_switches : int
+        Budget of switch points found by the run, or None.
+    max_heap_size : int
+        Budget of candidate switch points in the heap, or None.
+    max_switch_rate : float
+        Budget of switch points per unit simulated time over rate_window, or None.
+    rate_window : float
+        Window of simulated time over which the switch rate is measured.
+    stop_conditions : list of StopCondition or function func(t, state)
+        Conditions tested at each new switch point, or None.
+    checkpoint : function checkpoint(finder, res_t, res_y, first_row)
+        Writes a checkpoint of the run, or None.
+    checkpoint_interval : float
+        Least wall time between checkpoints, in seconds, or None.
+    checkpoint_step : float
+        Least simulated time between checkpoints, or None.
+
+    Attributes
+    ----------
+
+    stop_t : float
+        Time at which the run was stopped, or None.
+    exceeded : (str, float, float)
+        Name, limit and value of the budget that stopped the run, or None.
+    stopped_by : StopCondition or function
+        The stop condition that stopped the run, or None.
+    """
+    def __init__(self, progress=None, progress_interval=None, progress_step=None, cancel=None,
+                 max_switches=None, max_heap_size=None, max_switch_rate=None,
+                 rate_window=None, stop_conditions=None, checkpoint=None,
+                 checkpoint_interval=None, checkpoint_step=None):
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.progress_step = progress_step
+        self.cancel = cancel
+        self.max_switches = max_switches
+        self.max_heap_size = max_heap_size
+        self.max_switch_rate = max_switch_rate
+        self.rate_window = rate_window
+        self.stop_conditions = stop_conditions
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_step = checkpoint_step
+        self.have_budgets = (max_switches is not None or max_heap_size is not None
+                             or max_switch_rate is not None)
+        self.stop_t = None
+        self.exceeded = None
+        self.stopped_by = None
+
+    def attach(self, finder, res_t, res_y, first_row=None):
         """
-        Prints the result of the simulation.
+        Starts monitoring a run.
 
         Parameters
         ----------
 
-        file: file
-            The file to write to.  Optional.  The default value is sys.stdout.
+        finder : CandidateSwitchFinder
+            Finder set up for the run.
+        res_t : list of float
+            Result switch point times, holding the result before the start of the run.
+        res_y : list of list of bool
+            Result states, holding the result before the start of the run.
+        first_row : int
+            Index of the first row found by the run, when continuing a run from a checkpoint.
+            Optional. Default is the number of rows in the result arrays.
+        """
+        self.finder = finder
+        self.res_t = res_t
+        self.res_y = res_y
+        self.first_row = len(res_t) if first_row is None else first_row
+        self.checked_rows = len(res_t)
+        self.stop_t = None
+        self.exceeded = None
+        self.stopped_by = None
+        if self.stop_conditions is not None:
+            for condition in self.stop_conditions:
+                start = getattr(condition, "start", None)
+                if start is not None:
+                    start(finder.start, res_y[-1])
+        self.next_call_time = time.perf_counter()
+        self.next_call_t = -math.inf
+        if self.checkpoint_interval is not None:
+            self.next_checkpoint_time = time.perf_counter() + self.checkpoint_interval
+        if self.checkpoint_step is not None:
+            self.next_checkpoint_t = finder.start + self.checkpoint_step
+
+    def before_next(self):
         """
+        Tests the stop conditions and handles cancellation and checkpoints before the next
+        candidate switch point is removed from the heap.
 
-        for i in range(len(self.res_t) - 1):
-            print("{:8.2f} -> {:8.2f} : {}".format(
-                self.res_t[i], self.res_t[i + 1],
-                BDESolver._boolean_list_to_string(self.res_y[i]), file=file))
-        if self.res_t[-2] != self.res_t[-1]:
-            print("{:8.2f} -> {:8.2f} : {}".format(
-                self.res_t[-1],
-                self.res_t[-1],
-                BDESolver._boolean_list_to_string(self.res_y[-1]),
-                file=file))
+        Returns
+        -------
 
-    def plot_result(self):
+        bool
+            True if the run has been stopped.
         """
-        Plots the simulation result to matplotlib.
+        # A new switch point is stored before the next candidate is requested
+        if self.stop_conditions is not None and len(self.res_t) > self.checked_rows:
+            stop_t = self._check_stop_conditions()
+            if stop_t is not None:
+                self._stop(stop_t)
+                return True
+
+        heap = self.finder.times
+        if heap:
+            if self.cancel is not None and self.cancel.cancelled:
+                # Save the work done so far
+                if self.checkpoint is not None:
+                    self._write_checkpoint()
+                self._stop(heap[0][0])
+                return True
+            if self.checkpoint is not None and self._checkpoint_due(heap[0][0]):
+                self._write_checkpoint()
+        return False
+
+    def after_next(self, t):
         """
+        Checks the switch budgets and reports progress after the next candidate switch point
+        has been removed from the heap.
 
-        to_plot = self.results
-        if self.forced_inputs:
-            to_plot += self.forced_inputs
+        Parameters
+        ----------
 
-        BooleanTimeSeries.plot_many(to_plot)
-        plt.legend()
-        plt.xlabel("time")
-        plt.tight_layout()
+        t : float
+            The next candidate switch point, or None at the end of the run.
 
-    def show_result(self):
+        Returns
+        -------
 
+        float
+            The candidate switch point, or None if the run has ended or been stopped.
         """
-        Plots the simulation result to matplotlib and shows it.
+        if self.stop_t is not None:
+            return None
+        if t is None:
+            self._report_progress(self.finder.end)
+            return None
+
+        if self.have_budgets:
+            self.exceeded = self._check_budgets(t)
+            if self.exceeded is not None:
+                self._stop(t)
+                return None
+
+        if self.progress is not None:
+            if self.progress_step is not None and t >= self.next_call_t:
+                self._report_progress(t)
+            elif (self.progress_interval is not None
+                  and time.perf_counter() >= self.next_call_time):
+                self._report_progress(t)
+        return t
+
+    def _stop(self, t):
         """
+        Stops the run before the given candidate switch point.
 
-        self.plot_result()
-        plt.show()
+        Parameters
+        ----------
 
+        t : float
+            The candidate switch point.
+        """
+        self.stop_t = t
+        self.finder.end = t
+        self._report_progress(t)
 
-    @staticmethod
-    def _boolean_list_to_string(l):
+    def _checkpoint_due(self, t):
         """
-        Converts a boolean list to a string of T and F characters.
+        Tests whether a checkpoint is due.
 
         Parameters
         ----------
 
-        l : boolean list
-            Boolean list to convert.
+        t : float
+            Time of the next candidate switch point.
 
         Returns
         -------
 
-        str
-           string of T and F characters representing the content of the boolean list.
+        bool
+            True if a checkpoint should be written.
         """
-        res = ""
-        for x in l:
-            if x:
-                res += "T "
-            else:
-                res += "F "
-        return res
+        if self.checkpoint_step is not None and t >= self.next_checkpoint_t:
+            return True
+        return (self.checkpoint_interval is not None
+                and time.perf_counter() >= self.next_checkpoint_time)
+
+    def _write_checkpoint(self):
+        """
+        Writes a checkpoint and sets when the next one is due.
+        """
+        self.checkpoint(self.finder, self.res_t, self.res_y, self.first_row)
+        if self.checkpoint_interval is not None:
+            self.next_checkpoint_time = time.perf_counter() + self.checkpoint_interval
+        if self.checkpoint_step is not None:
+            self.next_checkpoint_t = self.finder.times[0][0] + self.checkpoint_step
+
+    def _check_stop_conditions(self):
+        """
+        Tests the stop conditions at the switch points stored since the last check.
+
+        Returns
+        -------
+
+        float
+            Time of the switch point at which a condition was met, or None.
+        """
+        res_t = self.res_t
+        res_y = self.res_y
+        for i in range(self.checked_rows, len(res_t)):
+            # The state at the end time is stored even if it has not changed
+            if res_y[i] == res_y[i - 1]:
+                continue
+            for condition in self.stop_conditions:
+                if condition(res_t[i], res_y[i]):
+                    self.stopped_by = condition
+                    self.checked_rows = len(res_t)
+                    return res_t[i]
+        self.checked_rows = len(res_t)
+        return None
+
+    def _check_budgets(self, t):
+        """
+        Checks the switch budgets.
+
+        Parameters
+        ----------
+
+        t : float
+            Current simulated time.
+
+        Returns
+        -------
+
+        (str, float, float)
+            Name, limit and value of the first budget exceeded, or None.
+        """
+        res_t = self.res_t
+        switches = len(res_t) - self.first_row
+        if self.max_switches is not None and switches > self.max_switches:
+            return "max_switches", self.max_switches, switches
+
+        heap_size = len(self.finder.times)
+        if self.max_heap_size is not None and heap_size > self.max_heap_size:
+            return "max_heap_size", self.max_heap_size, heap_size
+
+        if self.max_switch_rate is not None:
+            recent = len(res_t) - bisect.bisect_right(res_t, t - self.rate_window,
+                                                      lo=self.first_row)
+            rate = recent / self.rate_window
+            if rate > self.max_switch_rate:
+                return "max_switch_rate", self.max_switch_rate, rate
+
+        return None
+
+    def _report_progress(self, t):
+        """
+        Calls the progress callback and sets when it is next due.
+
+        Parameters
+        ----------
+
+        t : float
+            Current simulated time.
+        """
+        if self.progress is None:
+            return
+        self.progress(t, len(self.res_t) - self.first_row, len(self.finder.times))
+        if self.progress_interval is not None:
+            self.next_call_time = time.perf_counter() + self.progress_interval
+        if self.progress_step is not None:
+            self.next_call_t = t + self.progress_step
+
+
+def _next_time(finder, hooks):
+    """
+    Gets the next candidate switch point of a run. This is the hook point of the simulation
+    loops: each hook's before_next method is called before the candidate is removed from the
+    heap and may stop the run, then each hook's after_next method is called with the
+    candidate, or None, and may stop the run by returning None.
+
+    Parameters
+    ----------
+
+    finder : CandidateSwitchFinder
+        Finder of the run.
+    hooks : list
+        Objects with before_next() and after_next(t) methods, such as _RunMonitor and
+        _MemorySampler.
+
+    Returns
+    -------
+
+    float
+        The time of the next candidate switch point, or None if the run has ended.
+    """
+    t = None
+    if not any(hook.before_next() for hook in hooks):
+        t = finder.get_next_time()
+    for hook in hooks:
+        t = hook.after_next(t)
+    return t
+
+
+def _result_store_bytes(res_t, res_y):
+    """
+    Estimates the size of the result arrays. All the rows are assumed to be the size of the
+    last one.
+
+    Parameters
+    ----------
+
+    res_t : list of float
+        Result switch point times.
+    res_y : list of list of bool
+        Result states.
+
+    Returns
+    -------
+
+    int
+        Estimated size in bytes.
+    """
+    size = sys.getsizeof(res_t) + len(res_t) * _FLOAT_BYTES + sys.getsizeof(res_y)
+    if res_y:
+        size += len(res_y) * sys.getsizeof(res_y[-1])
+    return size
+
+
+def _heap_bytes(heap):
+    """
+    Estimates the size of the candidate switch point heap.
+
+    Parameters
+    ----------
+
+    heap : list of tuple
+        Candidate switch point heap.
+
+    Returns
+    -------
+
+    int
+        Estimated size in bytes.
+    """
+    return sys.getsizeof(heap) + len(heap) * (_CANDIDATE_BYTES + _FLOAT_BYTES)
+
+
+def _time_series_bytes(time_series):
+    """
+    Estimates the size of a list of BooleanTimeSeries.
+
+    Parameters
+    ----------
+
+    time_series : list of BooleanTimeSeries
+        The time series.
+
+    Returns
+    -------
+
+    int
+        Estimated size in bytes.
+    """
+    size = sys.getsizeof(time_series)
+    for bts in time_series:
+        size += (sys.getsizeof(bts) + sys.getsizeof(bts.__dict__) + sys.getsizeof(bts.t)
+                 + len(bts.t) * _FLOAT_BYTES + sys.getsizeof(bts.y))
+    return size
+
+
+def _format_bytes(n_bytes):
+    """
+    Formats a size for display.
+
+    Parameters
+    ----------
+
+    n_bytes : int
+        Size in bytes.
+
+    Returns
+    -------
+
+    str
+        The size in bytes, KiB or MiB.
+    """
+    if n_bytes < 1024:
+        return "{} B".format(n_bytes)
+    if n_bytes < 1024 * 1024:
+        return "{:.1f} KiB".format(n_bytes / 1024)
+    return "{:.1f} MiB".format(n_bytes / (1024 * 1024))
+
+
+def _explosion_diagnostics(res_t, res_y, first_row, window):
+    """
+    Finds where the switch points of a run are densest.
+
+    Parameters
+    ----------
+
+    res_t : list of float
+        Result switch point times.
+    res_y : list of list of bool
+        Result states.
+    first_row : int
+        Index of the first row found by the run.
+    window : float
+        Length of the window of simulated time.
+
+    Returns
+    -------
+
+    (float, float), int, list of (int, int)
+        The densest window, the number of switch points in it and the index and number of
+        switches of the variables that switched most in it, at most five.
+    """
+    if first_row >= len(res_t):
+        return (res_t[-1] - window, res_t[-1]), 0, []
+
+    # Sliding window ending at each switch point of the run
+    best_lo, best_hi = first_row, first_row
+    lo = first_row
+    for hi in range(first_row, len(res_t)):
+        while res_t[hi] - res_t[lo] > window:
+            lo += 1
+        if hi - lo > best_hi - best_lo:
+            best_lo, best_hi = lo, hi
+
+    counts = [0] * len(res_y[0])
+    for i in range(max(best_lo, 1), best_hi + 1):
+        before = res_y[i - 1]
+        for v, state in enumerate(res_y[i]):
+            if state != before[v]:
+                counts[v] += 1
+    busiest = sorted(((v, n) for v, n in enumerate(counts) if n), key=lambda c: -c[1])[:5]
+
+    return (res_t[best_hi] - window, res_t[best_hi]), best_hi - best_lo + 1, busiest
+
+
+def _reset_traced_peak():
+    """
+    Resets the peak memory traced by tracemalloc to the current size, where supported
+    (Python 3.9 and later). On older versions the peak covers the whole time tracing.
+    """
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+
+
+_FLOAT_BYTES = sys.getsizeof(0.0)
+_CANDIDATE_BYTES = sys.getsizeof((0.0, 0, IndexType.VARIABLE, 0))
+
+
+class BDESolver:
+    """
+    Boolean Delay Equation solver.
+
+    Parameters
+    ----------
+
+    func : function func(Z) or func(Z1,Z2) if forced inputs are used
+        Z is a list of lists - first index is delay, second is variable
+        so Z[0][2] is the values of the 3rd variable at the 1st delay.
+        If forcing inputs are used then a second argument Z2 is passed.
+        The indexes are the same except they refer to the forcing inputs.
+
+    delays : list of float
+        Values of the time delays.
+    history: list of BooleanTimeSeries
+        History time series for each variable.
+    forcing_inputs: list of BooleanTimeSeries
+        Time series for each forcing input. Default value is None.
+    rel_tol : float
+        Relative tolerance used when comparing times. Default is 1e-08
+    abs_tol : float
+        Absolute tolerance used when comparing times. Default is 0.0
+    collect_stats : bool
+        Whether to collect counters and timers of each run in the stats attribute. Default is
+        False.
+    profile_memory : bool or int
+        Whether to sample the memory use of each run in the memory_report attribute. An int
+        gives the number of samples, True takes 100. Tracing allocations slows the simulation
+        down several times. Default is False.
+    max_switches : int
+        Largest number of switch points a call to solve or resolve may find. Default is None
+        for no limit.
+    max_heap_size : int
+        Largest number of candidate switch points that may wait in the heap. Default is None
+        for no limit.
+    max_switch_rate : float
+        Largest number of switch points per unit simulated time, measured over rate_window.
+        Default is None for no limit.
+    rate_window : float
+        Window of simulated time over which the switch rate is measured. Default is None
+        which uses the longest delay.
+
+    When a simulation exceeds one of the switch budgets it stops at the next candidate switch
+    point and a SwitchExplosionError is raised, describing where the switch points were
+    densest. The solver holds the results up to that time.
+
+    Attributes
+    ----------
+
+    stats : SolveStats
+        Counters and timers of the latest call to solve or resolve, updated as it runs. None
+        unless collect_stats is True.
+    memory_report : MemoryReport
+        Memory use of the latest call to solve or resolve. None unless profile_memory is set.
+    cancelled : bool
+        Whether the latest call to solve or resolve was cancelled, in which case the results
+        end at the time it stopped.
+    stopped_by : StopCondition or function
+        The stop condition that ended the latest call to solve or resolve, in which case the
+        results end at the switch point that met it. None otherwise.
+    """
+    def __init__(self, func, delays, history, forcing_inputs=None,
+                 rel_tol=1e-09, abs_tol=0.0, collect_stats=False, profile_memory=False,
+                 max_switches=None, max_heap_size=None, max_switch_rate=None,
+                 rate_window=None):
+
+        self.logger = logging.getLogger(__name__)
+
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+
+        self.func = func
+        self.delays = delays
+        self.t, self.y = BooleanTimeSeries.merge(history)
+        self.history = history
+        self.results = None
+
+        # Validate history switch points
+        for data in history:
+            if data.t[0] != 0:
+                raise ValueError("All history data must start at t=0")
+
+        # All histories must end at the same time, this will be the simulation start time
+        self.start_t = history[0].end
+        for inp in history:
+            if inp.end != self.start_t:
+                raise ValueError("All history data must end at same time.")
+
+        # Validate forced inputs
+        if forcing_inputs:
+            for data in forcing_inputs:
+                if data.t[0] != 0:
+                    raise ValueError("All forced input data must start at t=0")
+
+        self.forced_inputs = forcing_inputs
+        self.forced_t = None
+        self.forced_y = None
+        self.have_forced_inputs = (forcing_inputs is not None)
+        if self.have_forced_inputs:
+            self.forced_t, self.forced_y = BooleanTimeSeries.merge(forcing_inputs)
+
+        self.res_t = None
+        self.res_y = None
+        self.end_t = None
+        self.cancelled = False
+        self.stopped_by = None
+
+        self.observers = []
+
+        self.stats = SolveStats() if collect_stats else None
+
+        self.memory_report = None
+        if profile_memory is True:
+            self.memory_report = MemoryReport()
+        elif profile_memory:
+            self.memory_report = MemoryReport(profile_memory)
+
+        for name, budget in [("max_switches", max_switches), ("max_heap_size", max_heap_size),
+                             ("max_switch_rate", max_switch_rate), ("rate_window", rate_window)]:
+            if budget is not None and budget <= 0:
+                raise ValueError("{} must be positive".format(name))
+        self.max_switches = max_switches
+        self.max_heap_size = max_heap_size
+        self.max_switch_rate = max_switch_rate
+        self.rate_window = rate_window
+
+        self._validate_delays(delays)
+
+    def add_observer(self, observer):
+        """
+        Registers an observer of the simulation events.
+
+        After each simulation the observer's on_start(t, state) method is called with the start
+        time and the state of the variables at that time, then on_switch(t, state) is called
+        for each time the state of the variables changes and finally on_end(t) is called with
+        the end time. States are lists of bool with one value per variable. The events are
+        passed on from the result arrays once the simulation has finished, so the simulation's
+        full result is held in memory whether or not there are observers.
+
+        Parameters
+        ----------
+
+        observer : object
+            Object with on_start, on_switch and on_end methods, for example an accumulator from
+            pybde.ensemble.
+        """
+        self.observers.append(observer)
+
+    def solve(self, end, progress=None, progress_interval=1.0, progress_step=None,
+              cancel=None, stop=None, checkpoint=None, checkpoint_interval=600.0,
+              checkpoint_step=None):
+        """
+        Run the simulation from the given start time until the given end time.
+
+        If the cancellation token is cancelled the simulation stops at the next candidate
+        switch point and the results end at that time. The cancelled attribute is then True and
+        the simulation can be continued with resolve(end=end).
+
+        Stop conditions are tested at each switch point found by the simulation. The
+        simulation ends at the first switch point that meets one of them, which is the end
+        time of the results and is stored in end_t, and the condition met is stored in
+        stopped_by.
+
+        Parameters
+        ----------
+
+        end : float
+            End time.
+        progress : function progress(t, switches, heap_size)
+            Called during the simulation with the current time, the number of switch points
+            found so far and the number of candidate switch points in the heap, and once more
+            at the end. Optional. Default is None.
+        progress_interval : float
+            Least wall time between calls to progress, in seconds, or None. Optional. Default
+            is 1.
+        progress_step : float
+            Least simulated time between calls to progress, or None. When both intervals are
+            given progress is called when either has passed. Optional. Default is None.
+        cancel : CancellationToken
+            Token that cancels the simulation, for example from another thread. Optional.
+            Default is None.
+        stop : StopCondition or function func(t, state), or a list of them
+            Conditions that end the simulation early, see pybde.stop_conditions. Optional.
+            Default is None.
+        checkpoint : str
+            File to write checkpoints of the simulation to, see resume. A checkpoint is also
+            written when the simulation is cancelled. Optional. Default is None.
+        checkpoint_interval : float
+            Least wall time between checkpoints, in seconds, or None. Optional. Default is
+            600.
+        checkpoint_step : float
+            Least simulated time between checkpoints, or None. Optional. Default is None.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            A list containing a BooleanTimeSeries for each simulated variable.
+        """
+
+        self._validate_end(end)
+
+        self.end_t = end
+
+        # Result arrays - we start with the given history
+        self.res_t = self.t.copy()
+        self.res_y = self.y.copy()
+
+        return self._run_to_results(self.start_t, self._make_monitor(
+            self.delays, progress, progress_interval, progress_step, cancel, stop, checkpoint,
+            checkpoint_interval, checkpoint_step))
+
+    def run(self, end, delays=None, progress=None, progress_interval=1.0, progress_step=None,
+            cancel=None, stop=None, checkpoint=None, checkpoint_interval=600.0,
+            checkpoint_step=None):
+        """
+        Runs the simulation until the given end time without changing the solver and returns
+        everything the run produced.
+
+        Unlike solve, the results, end time and statistics are stored in the returned
+        SolveResult rather than in the solver. The merged history and forcing inputs
+        prepared by the solver are only read, so one solver can run many simulations at once,
+        for example from the threads of a server. The model function, observers, progress
+        callbacks and stop conditions are shared by such runs so they must be safe to call
+        concurrently, and stateful stop conditions must not be shared.
+
+        Memory profiling uses tracemalloc, which traces the whole process, so concurrent runs
+        would measure each other's allocations. run raises ValueError if the solver was
+        created with profile_memory; use solve to profile memory.
+
+        Parameters
+        ----------
+
+        end : float
+            End time.
+        delays : list of float
+            Values of the time delays. Optional. Default is None which uses the solver's
+            delays.
+        progress : function progress(t, switches, heap_size)
+            Progress callback, see solve. Optional. Default is None.
+        progress_interval : float
+            Least wall time between calls to progress, in seconds. Optional. Default is 1.
+        progress_step : float
+            Least simulated time between calls to progress. Optional. Default is None.
+        cancel : CancellationToken
+            Token that cancels the simulation, see solve. Optional. Default is None.
+        stop : StopCondition or function func(t, state), or a list of them
+            Conditions that end the simulation early, see solve. Optional. Default is None.
+        checkpoint : str
+            File to write checkpoints of the simulation to, see solve. Optional. Default is
+            None.
+        checkpoint_interval : float
+            Least wall time between checkpoints, in seconds. Optional. Default is 600.
+        checkpoint_step : float
+            Least simulated time between checkpoints. Optional. Default is None.
+
+        Returns
+        -------
+
+        SolveResult
+            The results of the run and how it ended.
+        """
+        if delays is None:
+            delays = self.delays
+        else:
+            self._validate_delays(delays)
+        self._validate_end(end)
+
+        if self.memory_report is not None:
+            raise ValueError("run cannot profile memory as tracemalloc traces the whole "
+                             "process, use solve instead")
+
+        stats = SolveStats() if self.stats is not None else None
+        result = SolveResult(delays, end, self.t.copy(), self.y.copy(), stats, None)
+        monitor = self._make_monitor(
+            delays, progress, progress_interval, progress_step, cancel, stop, checkpoint,
+            checkpoint_interval, checkpoint_step)
+        self._execute(result, self.start_t, monitor)
+        self._check_exceeded(monitor, result)
+        return result
+
+    def solve_decomposed(self, end, dependencies, max_workers=None, partial=False):
+        """
+        Runs the simulation until the given end time by splitting the model into its strongly
+        connected components and simulating independent components in parallel processes.
+        Variables that other components depend on are passed to them as forcing inputs.
+
+        After returning the solver holds the result as if solve had been called. The switch
+        times agree with those found by solve within the solver's tolerances but can differ in
+        the last few bits, as each component coalesces ties among its own candidate switch
+        points.
+
+        Parameters
+        ----------
+
+        end : float
+            End time.
+        dependencies : list of list of int
+            For each variable, the indexes of the variables it depends on at any delay. The
+            model function is called with False for the variables a component does not depend
+            on so the dependencies must be complete.
+        max_workers : int
+            Number of worker processes. Optional. Default is None which uses one per CPU. A
+            value of 1 simulates all the components in the current process. When not 1 the
+            model function must be picklable, i.e. defined at module level.
+        partial : bool
+            If True the model function is called with a keyword argument ``variables``
+            listing the indexes of the variables to calculate and must return the new states
+            of just those variables, in the same order. This avoids calculating the whole
+            network for each component. Optional. Default is False.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            A list containing a BooleanTimeSeries for each simulated variable.
+        """
+        from pybde.decomposition import solve_decomposed
+        return solve_decomposed(self, end, dependencies, max_workers=max_workers,
+                                partial=partial)
+
+    def resolve(self, delays=None, end=None, progress=None, progress_interval=1.0,
+                progress_step=None, cancel=None, stop=None, checkpoint=None,
+                checkpoint_interval=600.0, checkpoint_step=None):
+        """
+        Re-runs the previous simulation with new delays and/or a new end time, reusing the
+        part of the previous result that cannot be affected by the change.
+
+        Changing a delay from d to d' can only affect the model at times at least min(d, d')
+        after a switch point, so the previous result is kept up to the first such time and the
+        simulation is restarted from there. Extending the end time restarts the simulation from
+        the previous end time.
+
+        Parameters
+        ----------
+
+        delays : list of float
+            New values of the time delays. Must be the same number of delays as before.
+            Optional. Default is the current delays.
+        end : float
+            New end time. Optional. Default is the previous end time.
+        progress : function progress(t, switches, heap_size)
+            Progress callback, see solve. Optional. Default is None.
+        progress_interval : float
+            Least wall time between calls to progress, in seconds. Optional. Default is 1.
+        progress_step : float
+            Least simulated time between calls to progress. Optional. Default is None.
+        cancel : CancellationToken
+            Token that cancels the simulation, see solve. Optional. Default is None.
+        stop : StopCondition or function func(t, state), or a list of them
+            Conditions that end the simulation early, see solve. Optional. Default is None.
+        checkpoint : str
+            File to write checkpoints of the simulation to, see solve. Optional. Default is
+            None.
+        checkpoint_interval : float
+            Least wall time between checkpoints, in seconds. Optional. Default is 600.
+        checkpoint_step : float
+            Least simulated time between checkpoints. Optional. Default is None.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            A list containing a BooleanTimeSeries for each simulated variable.
+        """
+
+        if self.res_t is None:
+            raise ValueError("solve must be called before resolve")
+
+        if delays is None:
+            delays = self.delays
+        if len(delays) != len(self.delays):
+            raise ValueError("Number of delays ({}) must be the same as before ({})".format(
+                len(delays), len(self.delays)))
+        self._validate_delays(delays)
+
+        if end is None:
+            end = self.end_t
+        self._validate_end(end)
+
+        restart_t = min(self._divergence_time(delays), self.end_t, end)
+
+        # Keep the result before the restart time, switches within tolerance of the restart
+        # time will be found again
+        keep = bisect.bisect_left(self.res_t, restart_t)
+        while keep > 0 and math.isclose(self.res_t[keep-1], restart_t,
+                                        rel_tol=self.rel_tol, abs_tol=self.abs_tol):
+            keep -= 1
+        keep = max(keep, len(self.t))
+
+        self.delays = delays
+        self.end_t = end
+        del self.res_t[keep:]
+        del self.res_y[keep:]
+
+        return self._run_to_results(max(restart_t, self.start_t), self._make_monitor(
+            self.delays, progress, progress_interval, progress_step, cancel, stop, checkpoint,
+            checkpoint_interval, checkpoint_step))
+
+    def resume(self, path, progress=None, progress_interval=1.0, progress_step=None,
+               cancel=None, stop=None, checkpoint=None, checkpoint_interval=600.0,
+               checkpoint_step=None):
+        """
+        Continues a simulation from a checkpoint written by solve, resolve or resume. The
+        result is identical to the one the interrupted simulation would have produced.
+
+        The solver must be created with the same model function, history, forcing inputs and
+        tolerances as the one that wrote the checkpoint. The delays and end time are restored
+        from the checkpoint. Observers and stop conditions are not saved in checkpoints, they
+        only see the part of the simulation after the checkpoint.
+
+        Parameters
+        ----------
+
+        path : str
+            Checkpoint file to continue from.
+        progress : function progress(t, switches, heap_size)
+            Progress callback, see solve. Optional. Default is None.
+        progress_interval : float
+            Least wall time between calls to progress, in seconds. Optional. Default is 1.
+        progress_step : float
+            Least simulated time between calls to progress. Optional. Default is None.
+        cancel : CancellationToken
+            Token that cancels the simulation, see solve. Optional. Default is None.
+        stop : StopCondition or function func(t, state), or a list of them
+            Conditions that end the simulation early, see solve. Optional. Default is None.
+        checkpoint : str
+            File to write further checkpoints to, which can be the same as path. Optional.
+            Default is None.
+        checkpoint_interval : float
+            Least wall time between checkpoints, in seconds. Optional. Default is 600.
+        checkpoint_step : float
+            Least simulated time between checkpoints. Optional. Default is None.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            A list containing a BooleanTimeSeries for each simulated variable.
+        """
+        from pybde.checkpoint import load_checkpoint, fingerprint
+
+        state = load_checkpoint(path)
+        if state["fingerprint"] != fingerprint(self):
+            raise ValueError("Checkpoint {} was written by a solver with a different history or "
+                             "forcing inputs".format(path))
+        if (state["rel_tol"], state["abs_tol"]) != (self.rel_tol, self.abs_tol):
+            raise ValueError("Checkpoint {} was written by a solver with different "
+                             "tolerances".format(path))
+        self._validate_delays(state["delays"])
+
+        self.delays = state["delays"]
+        self.end_t = state["end"]
+        self.res_t = state["res_t"]
+        self.res_y = state["res_y"]
+
+        heap = state["heap"]
+        start = heap[0][0] if heap else self.end_t
+        return self._run_to_results(start, self._make_monitor(
+            self.delays, progress, progress_interval, progress_step, cancel, stop, checkpoint,
+            checkpoint_interval, checkpoint_step), state)
+
+    def _divergence_time(self, delays):
+        """
+        Finds the earliest time the model inputs could differ if the delays were changed.
+
+        Parameters
+        ----------
+
+        delays : list of float
+            New values of the time delays.
+
+        Returns
+        -------
+
+        float
+            The earliest time at which the simulation using the new delays could differ from
+            the previous result, or infinity if it can not differ.
+        """
+        switch_times = self.res_t[1:]
+        if self.have_forced_inputs:
+            switch_times = sorted(switch_times + self.forced_t[1:])
+
+        divergence_t = math.inf
+        for old_delay, new_delay in zip(self.delays, delays):
+            if old_delay == new_delay:
+                continue
+            shortest, longest = sorted([old_delay, new_delay])
+            # A switch at time s changes the inputs of the model between s+shortest and
+            # s+longest, find the first switch that does so after the simulation start
+            i = bisect.bisect_left(switch_times, self.start_t - longest)
+            if i < len(switch_times):
+                divergence_t = min(divergence_t, max(switch_times[i] + shortest, self.start_t))
+
+        return divergence_t
+
+    def _validate_delays(self, delays):
+        """
+        Checks the delays are valid for this solver's history.
+
+        Parameters
+        ----------
+
+        delays : list of float
+            Values of the time delays.
+        """
+        # Validate delays are all positive
+        for d in delays:
+            if d < 0:
+                raise ValueError("All delays time must be positive")
+
+        if self.start_t < max(delays):
+            raise ValueError(
+                "History must extend greater than or equal to the maximum delay ({}).".format(
+                    max(delays)))
+
+    def _validate_end(self, end):
+        """
+        Checks the end time is after the simulation start time.
+
+        Parameters
+        ----------
+
+        end : float
+            End time.
+        """
+        if self.start_t >= end:
+            raise ValueError("end time ({}) must be greater than simulation start time({})".format(
+                end, self.start_t))
+
+    def _make_monitor(self, delays, progress, progress_interval, progress_step, cancel, stop,
+                      checkpoint=None, checkpoint_interval=None, checkpoint_step=None):
+        """
+        Creates the monitor of a run if progress is reported, the run can be cancelled or
+        stopped by a condition, there are switch budgets or checkpoints are written.
+
+        Parameters
+        ----------
+
+        delays : list of float
+            Values of the time delays used by the run.
+        progress : function progress(t, switches, heap_size)
+            Progress callback, or None.
+        progress_interval : float
+            Least wall time between progress calls, in seconds, or None.
+        progress_step : float
+            Least simulated time between progress calls, or None.
+        cancel : CancellationToken
+            Token checked at each candidate switch point, or None.
+        stop : StopCondition or function func(t, state), or a list of them
+            Stop conditions, or None.
+        checkpoint : str
+            File to write checkpoints to, or None.
+        checkpoint_interval : float
+            Least wall time between checkpoints, in seconds, or None.
+        checkpoint_step : float
+            Least simulated time between checkpoints, or None.
+
+        Returns
+        -------
+
+        _RunMonitor
+            The monitor, or None if there is nothing to monitor.
+        """
+        if stop is not None and not isinstance(stop, (list, tuple)):
+            stop = [stop]
+        have_budgets = (self.max_switches is not None or self.max_heap_size is not None
+                        or self.max_switch_rate is not None)
+        if (progress is None and cancel is None and not stop and not have_budgets
+                and checkpoint is None):
+            return None
+
+        write_checkpoint = None
+        if checkpoint is not None:
+            from pybde.checkpoint import save_checkpoint
+
+            def write_checkpoint(finder, res_t, res_y, first_row):
+                save_checkpoint(checkpoint, self, finder, res_t, res_y, first_row)
+
+        return _RunMonitor(progress, progress_interval, progress_step, cancel,
+                           self.max_switches, self.max_heap_size, self.max_switch_rate,
+                           self._rate_window(delays), stop or None, write_checkpoint,
+                           checkpoint_interval, checkpoint_step)
+
+    def _rate_window(self, delays):
+        """
+        Gets the window over which the switch rate is measured.
+
+        Parameters
+        ----------
+
+        delays : list of float
+            Values of the time delays used by the run.
+
+        Returns
+        -------
+
+        float
+            The rate window, by default the longest delay.
+        """
+        if self.rate_window is not None:
+            return self.rate_window
+        return max(delays) or 1.0
+
+    def _check_exceeded(self, monitor, result):
+        """
+        Raises SwitchExplosionError if the run was stopped by a switch budget.
+
+        Parameters
+        ----------
+
+        monitor : _RunMonitor
+            Monitor of the run, or None.
+        result : SolveResult
+            The result of the run.
+        """
+        if monitor is None or monitor.exceeded is None:
+            return
+        budget, limit, value = monitor.exceeded
+        window = self._rate_window(result.delays)
+        densest_window, densest_count, busiest_variables = _explosion_diagnostics(
+            result.res_t, result.res_y, monitor.first_row, window)
+        error = SwitchExplosionError(
+            budget, limit, value, monitor.stop_t, len(result.res_t) - monitor.first_row,
+            len(monitor.finder.times), densest_window, densest_count, busiest_variables)
+        error.results = result.results
+        raise error
+
+    def _run_to_results(self, start, monitor=None, state=None):
+        """
+        Runs the simulation held by the solver from the given start time and stores the
+        results in the solver.
+
+        Parameters
+        ----------
+
+        start : float
+            Time from which to run the simulation.
+        monitor : _RunMonitor
+            Monitor reporting progress and checking for cancellation, or None.
+        state : dict
+            State of the run loaded from a checkpoint, or None.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            A list containing a BooleanTimeSeries for each simulated variable.
+        """
+        result = SolveResult(self.delays, self.end_t, self.res_t, self.res_y, self.stats,
+                             self.memory_report)
+        self._execute(result, start, monitor, state)
+
+        self.end_t = result.end_t
+        self.results = result.results
+        self.cancelled = result.cancelled
+        self.stopped_by = result.stopped_by
+
+        self._check_exceeded(monitor, result)
+        return self.results
+
+    def _execute(self, result, start, monitor=None, state=None):
+        """
+        Runs a simulation from the given start time and builds its results, collecting
+        statistics and profiling memory if enabled.
+
+        Parameters
+        ----------
+
+        result : SolveResult
+            The run, with result arrays holding the result up to, but not including, the start
+            time. Filled in as the simulation runs.
+        start : float
+            Time from which to run the simulation.
+        monitor : _RunMonitor
+            Monitor reporting progress and checking for cancellation, or None.
+        state : dict
+            State of the run loaded from a checkpoint, or None.
+        """
+        stats = result.stats
+        report = result.memory_report
+        if stats is None and report is None:
+            self._run(result, start, monitor, state)
+            result.results = self._build_results(result.res_t, result.res_y, result.end_t)
+            return
+
+        if report is not None:
+            report.reset()
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            else:
+                _reset_traced_peak()
+            traced_start = tracemalloc.get_traced_memory()[0]
+
+        if stats is not None:
+            stats.reset()
+        run_start = time.perf_counter()
+        try:
+            self._run(result, start, monitor, state)
+            if report is not None:
+                current, peak = tracemalloc.get_traced_memory()
+                report.traced_peak = peak - traced_start
+                _reset_traced_peak()
+                traced_start = current
+            results_start = time.perf_counter()
+            result.results = self._build_results(result.res_t, result.res_y, result.end_t)
+            if stats is not None:
+                stats.results_time = time.perf_counter() - results_start
+                stats.total_time = time.perf_counter() - run_start
+            if report is not None:
+                report.traced_results_peak = tracemalloc.get_traced_memory()[1] - traced_start
+                report.results_bytes = _time_series_bytes(result.results)
+        finally:
+            if report is not None and started_tracing:
+                tracemalloc.stop()
+
+    def _run(self, result, start, monitor=None, state=None):
+        """
+        Runs the simulation from the given start time, appending to the result arrays.
+
+        Parameters
+        ----------
+
+        result : SolveResult
+            The run, with result arrays holding the result up to, but not including, the start
+            time.
+        start : float
+            Time from which to run the simulation.
+        monitor : _RunMonitor
+            Monitor reporting progress and checking for cancellation, or None.
+        state : dict
+            State of the run loaded from a checkpoint, or None. The candidate switch points
+            and indices are restored from it rather than found from the result arrays.
+        """
+
+        x, forced_x = result.res_t, self.forced_t
+        if state is not None:
+            x = []
+            forced_x = [] if self.have_forced_inputs else None
+
+        func = self.func
+        stats = result.stats
+        if stats is None:
+            candidate_switch_finder = CandidateSwitchFinder(
+                result.delays, x, start, result.end_t, forced_x,
+                rel_tol=self.rel_tol, abs_tol=self.abs_tol)
+        else:
+            func = _TimedModel(func, stats)
+            candidate_switch_finder = _InstrumentedCandidateSwitchFinder(
+                stats, result.delays, x, start, result.end_t, forced_x,
+                rel_tol=self.rel_tol, abs_tol=self.abs_tol)
+
+        if state is not None:
+            candidate_switch_finder.restore_state(
+                state["heap"], state["indices"], state["forced_indices"])
+
+        # The memory sampler comes after the monitor so it sees where a stopped run ends
+        hooks = []
+        if monitor is not None:
+            monitor.attach(candidate_switch_finder, result.res_t, result.res_y,
+                           None if state is None else state["first_row"])
+            hooks.append(monitor)
+
+        if result.memory_report is not None:
+            hooks.append(_MemorySampler(
+                candidate_switch_finder, result.memory_report, result.res_t, result.res_y,
+                start, result.end_t))
+
+        # Check the logging level once, the fast loop does no logging at all
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._run_verbose(result, candidate_switch_finder, func, hooks)
+        else:
+            self._run_fast(result, candidate_switch_finder, func, hooks)
+
+        stopped = monitor is not None and monitor.stop_t is not None
+        result.stopped_by = monitor.stopped_by if stopped else None
+        result.cancelled = stopped and monitor.exceeded is None and monitor.stopped_by is None
+        if stopped:
+            result.end_t = monitor.stop_t
+
+        # The state at the end time is stored even if it has not changed
+        if (not stopped and stats is not None and len(result.res_y) > 1
+                and result.res_y[-1] == result.res_y[-2]):
+            stats.state_changes -= 1
+
+    def _run_fast(self, result, finder, func, hooks=None):
+        """
+        Runs the simulation loop without logging.
+
+        Parameters
+        ----------
+
+        result : SolveResult
+            The run.
+        finder : CandidateSwitchFinder
+            Finder set up for the run.
+        func : function
+            Model function.
+        hooks : list
+            Hooks called around each candidate switch point, see _next_time. Optional.
+            Default is None.
+        """
+        res_t = result.res_t
+        res_y = result.res_y
+        end_t = result.end_t
+        forced_y = self.forced_y
+        indices = finder.indices
+        add_new_times = finder.add_new_times
+        if hooks:
+            def get_next_time():
+                return _next_time(finder, hooks)
+        else:
+            get_next_time = finder.get_next_time
+
+        t = get_next_time()
+        if not self.have_forced_inputs:
+            while t is not None:
+                new_state = func([res_y[i] for i in indices])
+
+                # Keep this state if it has changed or this is the end of the simulation
+                if new_state != res_y[-1] or t == end_t:
+                    res_t.append(t)
+                    res_y.append(new_state)
+                    add_new_times(t, len(res_t) - 1)
+
+                t = get_next_time()
+        else:
+            forced_indices = finder.forced_indices
+            while t is not None:
+                new_state = func([res_y[i] for i in indices],
+                                 [forced_y[i] for i in forced_indices])
+
+                if new_state != res_y[-1] or t == end_t:
+                    res_t.append(t)
+                    res_y.append(new_state)
+                    add_new_times(t, len(res_t) - 1)
+
+                t = get_next_time()
+
+    def _run_verbose(self, result, finder, func, hooks=None):
+        """
+        Runs the simulation loop logging each step at DEBUG level.
+
+        Parameters
+        ----------
+
+        result : SolveResult
+            The run.
+        finder : CandidateSwitchFinder
+            Finder set up for the run.
+        func : function
+            Model function.
+        hooks : list
+            Hooks called around each candidate switch point, see _next_time. Optional.
+            Default is None.
+        """
+        t = _next_time(finder, hooks or [])
+        while t is not None:
+            self.logger.debug("======================================================")
+            self.logger.debug("t=%f", t)
+            Z = []
+            for d_index in range(len(finder.indices)):
+                i = finder.indices[d_index]
+                self.logger.debug(
+                    "Delay %s is at index %s of result list = %s", d_index, i, result.res_y)
+                Z.append(result.res_y[i])
+
+            if not self.have_forced_inputs:
+                new_state = func(Z)
+                self.logger.debug("Input to model function for time t=%f is %s", t, Z)
+            else:
+                Z2 = []
+                for i in finder.forced_indices:
+                    Z2.append(self.forced_y[i])
+                new_state = func(Z, Z2)
+                self.logger.debug("Input to model function for time t=%f is %s, %s", t, Z, Z2)
+
+            self.logger.debug("New state at t=%f is %s", t, new_state)
+
+            # Keep this state if it has changed or this is the end of the simulation
+            if new_state != result.res_y[-1] or t == result.end_t:
+                self.logger.debug("State has changed so adding new state: %s", new_state)
+                result.res_t.append(t)
+                result.res_y.append(new_state)
+                finder.add_new_times(t, len(result.res_t) - 1)
+            else:
+                self.logger.debug("State has not changed")
+
+            t = _next_time(finder, hooks or [])
+
+    def _set_results(self, res_t, res_y, end):
+        """
+        Stores result arrays found without simulating, for example read from a cache, as if
+        solve had been called and builds the result time series. The outcome and statistics of
+        the previous run are reset.
+
+        Parameters
+        ----------
+
+        res_t : list of float
+            Times of the result rows, starting with the history.
+        res_y : list of list of bool
+            State of the variables at each result row.
+        end : float
+            End time of the result.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            A list containing a BooleanTimeSeries for each simulated variable.
+        """
+        self.res_t = res_t
+        self.res_y = res_y
+        self.end_t = end
+        self.cancelled = False
+        self.stopped_by = None
+        if self.stats is not None:
+            self.stats.reset()
+        if self.memory_report is not None:
+            self.memory_report.reset()
+        return self._make_results()
+
+    def _make_results(self):
+        """
+        Builds the result time series from the result arrays held by the solver and passes
+        the simulation events to the observers.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            A list containing a BooleanTimeSeries for each simulated variable.
+        """
+        self.results = self._build_results(self.res_t, self.res_y, self.end_t)
+        return self.results
+
+    def _build_results(self, res_t, res_y, end_t):
+        """
+        Builds the result time series from result arrays and passes the simulation events to
+        the observers.
+
+        Parameters
+        ----------
+
+        res_t : list of float
+            Times of the result rows, starting with the history.
+        res_y : list of list of bool
+            State of the variables at each result row.
+        end_t : float
+            End time of the result.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            A list containing a BooleanTimeSeries for each simulated variable.
+        """
+        if self.observers:
+            self._notify_observers(res_t, res_y, end_t)
+
+        # Copy over labels and styles
+        results = BooleanTimeSeries.unmerge(res_t, res_y, end_t)
+        for i, result in enumerate(results):
+            result.label = self.history[i].label
+            result.style = self.history[i].style
+
+        return results
+
+    def _notify_observers(self, res_t, res_y, end_t):
+        """
+        Passes the events of the simulation in the result arrays to the observers.
+
+        Parameters
+        ----------
+
+        res_t : list of float
+            Times of the result rows, starting with the history.
+        res_y : list of list of bool
+            State of the variables at each result row.
+        end_t : float
+            End time of the result.
+        """
+        first = len(self.t)
+        state = res_y[first-1]
+        for observer in self.observers:
+            observer.on_start(self.start_t, state)
+
+        for i in range(first, len(res_t)):
+            if res_y[i] != state:
+                state = res_y[i]
+                for observer in self.observers:
+                    observer.on_switch(res_t[i], state)
+
+        for observer in self.observers:
+            observer.on_end(end_t)
+
+    def print_result(self, file=sys.stdout):
+        """
+        Prints the result of the simulation.
+
+        Parameters
+        ----------
+
+        file: file
+            The file to write to.  Optional.  The default value is sys.stdout.
+        """
+
+        self.export_result(file, fmt="text")
+
+    def export_result(self, file, fmt="text", chunk_size=65536):
+        """
+        Writes the result of the simulation to a file in bulk.
+
+        Parameters
+        ----------
+
+        file: str or file
+            Path of the file to write to or a file object opened for writing text.
+        fmt: str
+            One of 'text' (the layout used by print_result), 'csv' or 'tsv'. Optional. Default
+            is 'text'.
+        chunk_size: int
+            Number of rows formatted per write. Optional. Default is 65536.
+        """
+
+        labels = [
+            bts.label if bts.label is not None else "x{}".format(i)
+            for i, bts in enumerate(self.history)]
+        export_result(file, self.res_t, self.res_y, end=self.end_t, fmt=fmt, labels=labels,
+                      chunk_size=chunk_size)
+
+    def plot_result(self, x_range=None, width=None):
+        """
+        Plots the simulation result to matplotlib.
+
+        Parameters
+        ----------
+
+        x_range : (float, float)
+            Visible time range, see BooleanTimeSeries.plot. Optional. Default is the full range
+            of the results.
+
+        width : int
+            Width of the plot in pixels. If specified the plot data is decimated, see
+            BooleanTimeSeries.plot. Optional. Default is None which plots every switch point.
+        """
+        import matplotlib.pyplot as plt
+
+        to_plot = self.results
+        if self.forced_inputs:
+            to_plot = to_plot + self.forced_inputs
+
+        BooleanTimeSeries.plot_many(to_plot, x_range=x_range, width=width)
+        plt.legend()
+        plt.xlabel("time")
+        plt.tight_layout()
+
+    def show_result(self, x_range=None, width=None):
+
+        """
+        Plots the simulation result to matplotlib and shows it.
+
+        Parameters
+        ----------
+
+        x_range : (float, float)
+            Visible time range, see BooleanTimeSeries.plot. Optional. Default is the full range
+            of the results.
+
+        width : int
+            Width of the plot in pixels. If specified the plot data is decimated, see
+            BooleanTimeSeries.plot. Optional. Default is None which plots every switch point.
+        """
+        import matplotlib.pyplot as plt
+
+        self.plot_result(x_range=x_range, width=width)
+        plt.show()
@@ -1,5 +1,7 @@
 import heapq
+import os
 import random
+import numpy as np
 from pybde import BooleanTimeSeries
 
 
@@ -49,7 +51,7 @@ class ValidatorCandidateSwitchPoints:
         if self.start <= t <= self.end:
             heapq.heappush(self._times, t)
 
-    def add_random(self, n_random_times):
+    def add_random(self, n_random_times, rng=None):
         """
         Adds some random candidate switch times.
 
@@ -58,7 +60,16 @@ class ValidatorCandidateSwitchPoints:
 
         n_random_times : float
             Number of random times to add.
+        rng : numpy.random.Generator
+            Random number generator to use. Optional. Default is None which uses the random
+            module.
         """
+        if rng is not None:
+            times = rng.uniform(self.start, self.end, n_random_times)
+            self._times.extend(times.tolist())
+            heapq.heapify(self._times)
+            return
+
         for x in range(n_random_times):
             r = random.random()
             heapq.heappush(self._times, r * (self.end-self.start) + self.start)
@@ -73,9 +84,10 @@ class ValidatorCandidateSwitchPoints:
         bts : BooleanTimeSeries
             Boolean time series.
         """
-        for t in bts.t:
-            self.add(t)
-        self.add(bts.end)
+        times = np.append(np.asarray(bts.t, dtype=float), bts.end)
+        times = times[(self.start <= times) & (times <= self.end)]
+        self._times.extend(times.tolist())
+        heapq.heapify(self._times)
 
     def times(self):
         """
@@ -84,6 +96,18 @@ class ValidatorCandidateSwitchPoints:
         while self._times:
             yield heapq.heappop(self._times)
 
+    def to_array(self):
+        """
+        Obtains the distinct candidate switch times.
+
+        Returns
+        -------
+
+        numpy array of float
+            The distinct candidate switch times in order.
+        """
+        return np.unique(np.asarray(self._times, dtype=float))
+
 
 class BDESolverValidator:
     """
@@ -106,17 +130,32 @@ class BDESolverValidator:
         The output of BDE simulation.
     forcing_inputs: list of BooleanTimeSeries
         Time series for each forcing input. Default value is None.
+    vectorized : bool
+        If True the model function is called once for many times. Z (and Z2) are then numpy
+        arrays where Z[i][j] is a numpy array of bool holding the state of the jth variable at
+        the ith delay for each time, and the function must return a sequence with an array of
+        bool (or a single bool) for each variable. The function must use numpy operations such
+        as ~, & and | rather than not, and and or. Default value is False.
     """
-    def __init__(self, func, delays, variables, forcing_inputs=None):
+    def __init__(self, func, delays, variables, forcing_inputs=None, vectorized=False):
         self.func = func
         self.delays = delays
         self.variables_bts = variables
         self.inputs = forcing_inputs
+        self.vectorized = vectorized
+        self.evaluations = 0
 
-    def validate(self, start, end):
+    def validate(self, start, end, n_random=1000, seed=None, max_evaluations=None,
+                 refinement_rounds=0, refinement_points=100, max_discrepancy=None):
         """
         Validates the outputs of the simulation satisfy the model equations.
 
+        The model is evaluated in stages. First at the switch points of the simulation output
+        and forcing inputs, then at random times and finally, if requested, over a number of
+        refinement rounds. Each refinement round adds random times close to the switch points
+        of the simulation output and inside the periods where the output was found to be
+        invalid. At every stage any switch found adds candidate times one delay later.
+
         Parameters
         ----------
 
@@ -126,60 +165,535 @@ class BDESolverValidator:
         end : float
             end time of the simulation
 
+        n_random : int
+            Number of uniformly distributed random times to test. Optional. Default is 1000.
+
+        seed : int or numpy.random.Generator
+            Seed for the random times so validation is reproducible. Optional. Default is None
+            which draws a seed from the random module, so seeding it with random.seed also
+            makes validation reproducible.
+
+        max_evaluations : int
+            Maximum number of model evaluations. The switch points of the output and inputs,
+            and the times derived from them, are always evaluated. Random and refinement
+            times, including the times derived from the switches they find, are only evaluated
+            while the total is below the limit. Optional. Default is None which means no limit.
+
+        refinement_rounds : int
+            Number of refinement rounds. Optional. Default is 0.
+
+        refinement_points : int
+            Number of times added by each refinement round. Optional. Default is 100.
+
+        max_discrepancy : float
+            Stop validating as soon as the result of a stage exceeds this value. Optional.
+            Default is None which always completes all the stages.
+
         Returns
         -------
 
         Sum of the the period of time each variable is in an invalid state. The maximum value
         is the length of the simulation multiplied by the number of variables.  The minimum
         value is 0.
+
+        The number of model evaluations performed is available in the evaluations attribute
+        after validation.
         """
+        if seed is None:
+            seed = random.getrandbits(64)
+        rng = np.random.default_rng(seed)
+        self.evaluations = 0
 
+        # Stage 1: switch points of the output and inputs
         candidate_switch_points = ValidatorCandidateSwitchPoints(self.delays, start, end)
-
         for bts in self.variables_bts:
             candidate_switch_points.add_boolean_time_series(bts)
         if self.inputs:
             for bts in self.inputs:
                 candidate_switch_points.add_boolean_time_series(bts)
-
-        candidate_switch_points.add_random(1000)
         candidate_switch_points.add(start)
 
-        res_times = []
-        res_variables_states = []
+        res_times = np.empty(0)
+        res_variables_states = np.empty((0, len(self.variables_bts)), dtype=bool)
+        res_times, res_variables_states = self._add_candidate_times(
+            res_times, res_variables_states, candidate_switch_points.to_array(), start, end)
+        accuracy, differences = self._accuracy(res_times, res_variables_states, start, end)
+
+        # Stage 2: random times
+        n_random = self._remaining_budget(n_random, max_evaluations)
+        if n_random > 0 and not self._exceeds(accuracy, max_discrepancy):
+            candidate_switch_points = ValidatorCandidateSwitchPoints(self.delays, start, end)
+            candidate_switch_points.add_random(n_random, rng=rng)
+            res_times, res_variables_states = self._add_candidate_times(
+                res_times, res_variables_states, candidate_switch_points.to_array(), start, end,
+                max_evaluations)
+            accuracy, differences = self._accuracy(res_times, res_variables_states, start, end)
+
+        # Stage 3: refinement around switch points and invalid periods
+        switch_times = np.unique(np.concatenate(
+            [np.asarray(bts.t[1:], dtype=float) for bts in self.variables_bts]))
+        switch_times = switch_times[(start < switch_times) & (switch_times < end)]
+        neighbourhood = min(d for d in self.delays if d > 0) / 2 if any(self.delays) else 0
+
+        for _ in range(refinement_rounds):
+            n_points = self._remaining_budget(refinement_points, max_evaluations)
+            if n_points <= 0 or self._exceeds(accuracy, max_discrepancy):
+                break
+
+            new_times = self._refinement_times(
+                n_points, switch_times, neighbourhood, self._invalid_periods(differences), rng)
+            new_times = new_times[(start <= new_times) & (new_times <= end)]
+            res_times, res_variables_states = self._add_candidate_times(
+                res_times, res_variables_states, np.setdiff1d(new_times, res_times), start, end,
+                max_evaluations)
+            accuracy, differences = self._accuracy(res_times, res_variables_states, start, end)
+
+        return float(accuracy)
+
+    def _add_candidate_times(self, res_times, res_variables_states, new_times, start, end,
+                             max_evaluations=None):
+        """
+        Evaluates the model at new candidate times, and at further candidate times produced by
+        any switches found, and merges them into the results.
 
-        for t in candidate_switch_points.times():
-            z = []
-            z2 = []
-            for d in self.delays:
-                states = []
-                for v_bts in self.variables_bts:
-                    states.append(v_bts.get_state(t-d))
-                z.append(states)
+        Parameters
+        ----------
 
-                if self.inputs:
-                    z2_states = []
-                    for input_bts in self.inputs:
-                        z2_states.append(input_bts.get_state(t-d))
-                    z2.append(z2_states)
+        res_times : numpy array of float
+            Times evaluated so far, in order.
+        res_variables_states : 2D numpy array of bool
+            Model state at each of the times evaluated so far.
+        new_times : numpy array of float
+            Distinct candidate times that have not been evaluated.
+        start : float
+            Start time of the simulation.
+        end : float
+            End time of the simulation.
+        max_evaluations : int
+            Evaluation budget, or None for no limit. Candidate times beyond the budget are not
+            evaluated.
 
-            if self.inputs:
-                s = self.func(z, z2)
-            else:
-                s = self.func(z)
+        Returns
+        -------
+
+        numpy array of float, 2D numpy array of bool
+            The updated times and states.
+        """
+        delays = np.asarray(self.delays, dtype=float)
+
+        # The state given by the model equations at a time depends only on the simulation
+        # output, so candidate times can be evaluated in batches.  Each switch found adds the
+        # delays as new candidate times until no new candidate times are produced.
+        while new_times.size:
+            n_times = self._remaining_budget(len(new_times), max_evaluations)
+            if n_times <= 0:
+                break
+            new_times = new_times[:n_times]
+            new_states = self._evaluate(new_times)
+            self.evaluations += len(new_times)
+
+            res_times = np.concatenate((res_times, new_times))
+            res_variables_states = np.concatenate((res_variables_states, new_states))
+            order = np.argsort(res_times, kind='stable')
+            res_times = res_times[order]
+            res_variables_states = res_variables_states[order]
+
+            switched = np.ones(len(res_times), dtype=bool)
+            switched[1:] = np.any(res_variables_states[1:] != res_variables_states[:-1], axis=1)
+
+            new_times = (res_times[switched, np.newaxis] + delays).ravel()
+            new_times = new_times[(start <= new_times) & (new_times <= end)]
+            new_times = np.setdiff1d(new_times, res_times)
+
+        return res_times, res_variables_states
+
+    def _accuracy(self, res_times, res_variables_states, start, end):
+        """
+        Compares the state given by the model equations with the simulation output.
+
+        Parameters
+        ----------
+
+        res_times : numpy array of float
+            Times evaluated, in order.
+        res_variables_states : 2D numpy array of bool
+            Model state at each of the times.
+        start : float
+            Start time of the simulation.
+        end : float
+            End time of the simulation.
 
-            if (not res_times) or res_variables_states[-1] != s:
-                res_times.append(t)
-                res_variables_states.append(s)
-                candidate_switch_points.add_delays(t)
+        Returns
+        -------
 
+        float, list of BooleanTimeSeries
+            The total period of time the variables are invalid and, for each variable, a time
+            series that is True while the variable is invalid.
+        """
         # Turn into Boolean Time Series
         res_variables_bts = BooleanTimeSeries.unmerge(res_times, res_variables_states, end)
 
-        # Calculate the accuracy
         accuracy = 0
+        differences = []
         for v_i, res_var_bts in enumerate(res_variables_bts):
             bts_from_start = self.variables_bts[v_i].cut(start, end)
-            accuracy += res_var_bts.hamming_distance(bts_from_start)
+            difference = _difference(res_var_bts, bts_from_start)
+            times = np.append(np.asarray(difference.t, dtype=float), difference.end)
+            accuracy += np.diff(times)[np.asarray(difference.y, dtype=bool)].sum()
+            differences.append(difference)
+
+        return accuracy, differences
+
+    @staticmethod
+    def _invalid_periods(differences):
+        """
+        Finds the periods where any variable is invalid.
+
+        Parameters
+        ----------
+
+        differences : list of BooleanTimeSeries
+            For each variable a time series that is True while the variable is invalid.
+
+        Returns
+        -------
+
+        list of (float, float)
+            The start and end of each period when any variable is invalid.
+        """
+        times, states = BooleanTimeSeries.merge(differences)
+        times.append(differences[0].end)
+        return [(times[i], times[i+1]) for i, state in enumerate(states) if any(state)]
+
+    @staticmethod
+    def _refinement_times(n_points, switch_times, neighbourhood, invalid_periods, rng):
+        """
+        Chooses random times close to switch points and inside invalid periods.
+
+        Parameters
+        ----------
+
+        n_points : int
+            Number of times to choose.
+        switch_times : numpy array of float
+            Switch points of the simulation output.
+        neighbourhood : float
+            Maximum distance of the times chosen around switch points.
+        invalid_periods : list of (float, float)
+            Periods where the simulation output is invalid.
+        rng : numpy.random.Generator
+            Random number generator.
+
+        Returns
+        -------
+
+        numpy array of float
+            The chosen times.
+        """
+        n_invalid = n_points // 2 if invalid_periods else 0
+        n_switch = n_points - n_invalid if switch_times.size else 0
+
+        times = [rng.choice(switch_times, n_switch) +
+                 rng.uniform(-neighbourhood, neighbourhood, n_switch)]
+
+        if n_invalid:
+            period_starts, period_ends = np.array(invalid_periods, dtype=float).T
+            lengths = period_ends - period_starts
+            chosen = rng.choice(len(lengths), n_invalid, p=lengths / lengths.sum())
+            times.append(rng.uniform(period_starts[chosen], period_ends[chosen]))
+
+        return np.unique(np.concatenate(times))
+
+    def _remaining_budget(self, n, max_evaluations):
+        """
+        Limits a number of evaluations to the remaining evaluation budget.
+
+        Parameters
+        ----------
+
+        n : int
+            Number of evaluations wanted.
+        max_evaluations : int
+            Evaluation budget, or None for no limit.
+
+        Returns
+        -------
+
+        int
+            The number of evaluations that can be made.
+        """
+        if max_evaluations is None:
+            return n
+        return min(n, max_evaluations - self.evaluations)
+
+    @staticmethod
+    def _exceeds(accuracy, max_discrepancy):
+        """
+        Tests if the accuracy exceeds the discrepancy threshold.
+
+        Parameters
+        ----------
+
+        accuracy : float
+            Total period of time the variables are invalid.
+        max_discrepancy : float
+            Discrepancy threshold, or None for no threshold.
+
+        Returns
+        -------
+
+        bool
+            True if there is a threshold and it is exceeded.
+        """
+        return max_discrepancy is not None and accuracy > max_discrepancy
+
+    def _evaluate(self, times):
+        """
+        Evaluates the model equations at the given times.
+
+        Parameters
+        ----------
+
+        times : numpy array of float
+            Times at which to evaluate the model.
+
+        Returns
+        -------
+
+        2D numpy array of bool
+            The state of each variable (columns) given by the model at each time (rows).
+        """
+        # Arrays indexed by delay, variable and time
+        z = np.array([[bts.get_states(times - d) for bts in self.variables_bts]
+                      for d in self.delays], dtype=bool).reshape(
+                          len(self.delays), len(self.variables_bts), len(times))
+        if self.inputs:
+            z2 = np.array([[bts.get_states(times - d) for bts in self.inputs]
+                           for d in self.delays], dtype=bool).reshape(
+                               len(self.delays), len(self.inputs), len(times))
+
+        if self.vectorized:
+            if self.inputs:
+                states = self.func(z, z2)
+            else:
+                states = self.func(z)
+            return np.stack([np.broadcast_to(np.asarray(s, dtype=bool), times.shape)
+                             for s in states], axis=1)
+
+        # Model function works on lists of lists for a single time
+        z = z.transpose(2, 0, 1).tolist()
+        if self.inputs:
+            z2 = z2.transpose(2, 0, 1).tolist()
+            states = [self.func(z_t, z2_t) for z_t, z2_t in zip(z, z2)]
+        else:
+            states = [self.func(z_t) for z_t in z]
+        return np.array(states, dtype=bool).reshape(len(times), len(self.variables_bts))
+
+
+class EnsembleValidationResult:
+    """
+    Result of validating an ensemble of simulation results.
+
+    Parameters
+    ----------
+
+    accuracies : list of float
+        The result of BDESolverValidator.validate for each ensemble member.
+    evaluations : list of int
+        The number of model evaluations used for each ensemble member.
+    tolerance : float
+        Largest accuracy value regarded as valid.
+
+    Attributes
+    ----------
+
+    accuracies : numpy array of float
+        The result of BDESolverValidator.validate for each ensemble member.
+    evaluations : numpy array of int
+        The number of model evaluations used for each ensemble member.
+    tolerance : float
+        Largest accuracy value regarded as valid.
+    """
+    def __init__(self, accuracies, evaluations, tolerance=0.0):
+        self.accuracies = np.asarray(accuracies, dtype=float)
+        self.evaluations = np.asarray(evaluations, dtype=np.int64)
+        self.tolerance = tolerance
+
+    def __str__(self):
+        """
+        String summarising the ensemble validation.
+
+        Returns
+        -------
+
+        str
+            Summary of the ensemble validation.
+        """
+        return 'members={}, invalid={}, mean={}, max={}, evaluations={}'.format(
+            len(self.accuracies), len(self.invalid_members()), self.mean(), self.max(),
+            self.evaluations.sum())
+
+    def mean(self):
+        """
+        Calculates the mean accuracy over the ensemble members.
+
+        Returns
+        -------
+
+        float
+            Mean accuracy over the ensemble members.
+        """
+        return float(self.accuracies.mean())
+
+    def std(self):
+        """
+        Calculates the standard deviation of the accuracy over the ensemble members.
+
+        Returns
+        -------
+
+        float
+            Standard deviation of the accuracy over the ensemble members.
+        """
+        return float(self.accuracies.std())
+
+    def max(self):
+        """
+        Finds the largest accuracy of any ensemble member.
+
+        Returns
+        -------
+
+        float
+            Largest accuracy of any ensemble member.
+        """
+        return float(self.accuracies.max())
 
-        return accuracy
+    def invalid_members(self):
+        """
+        Finds the ensemble members whose accuracy exceeds the tolerance.
+
+        Returns
+        -------
+
+        list of int
+            Indices of the ensemble members whose accuracy exceeds the tolerance.
+        """
+        return np.flatnonzero(self.accuracies > self.tolerance).tolist()
+
+    def fraction_valid(self):
+        """
+        Calculates the fraction of the ensemble members whose accuracy is within the tolerance.
+
+        Returns
+        -------
+
+        float
+            Fraction of the ensemble members whose accuracy is within the tolerance.
+        """
+        return float(np.mean(self.accuracies <= self.tolerance))
+
+
+def validate_many(func, members, start, end, max_workers=None, vectorized=False, tolerance=0.0,
+                  **validate_args):
+    """
+    Validates an ensemble of simulation results, in parallel using a process pool.
+
+    Every member is validated with the same arguments, including the random seed, so members
+    that share delays and forcing inputs are tested at the same random times.
+
+    Parameters
+    ----------
+
+    func : function func(Z) or func(Z1,Z2) if forced inputs are used
+        Model function, see BDESolverValidator. When max_workers is not 1 the function is sent
+        to worker processes so it must be picklable, i.e. defined at module level.
+    members : list of (list of float, list of BooleanTimeSeries, list of BooleanTimeSeries)
+        The delays, simulation output and forcing inputs (or None) of each ensemble member.
+    start : float
+        start time of the simulations.
+    end : float
+        end time of the simulations.
+    max_workers : int
+        Number of worker processes. Optional. Default is None which uses one per CPU. A value
+        of 1 validates all the members in the current process.
+    vectorized : bool
+        Whether the model function accepts arrays, see BDESolverValidator. Optional. Default is
+        False.
+    tolerance : float
+        Largest accuracy value regarded as valid in the summary. Optional. Default is 0.
+    validate_args :
+        Further keyword arguments passed to BDESolverValidator.validate.
+
+    Returns
+    -------
+
+    EnsembleValidationResult
+        The accuracy of each member and summary statistics.
+    """
+    if "seed" not in validate_args or validate_args["seed"] is None:
+        # One seed for the whole ensemble so members are tested at the same random times
+        validate_args["seed"] = random.getrandbits(64)
+
+    tasks = [(func, delays, variables, forcing_inputs, vectorized, start, end, validate_args)
+             for delays, variables, forcing_inputs in members]
+
+    if max_workers == 1:
+        outcomes = [_validate_member(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        n_workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(1, len(tasks) // (4 * n_workers))
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            outcomes = list(executor.map(_validate_member, tasks, chunksize=chunk_size))
+
+    accuracies = [accuracy for accuracy, _ in outcomes]
+    evaluations = [n_evaluations for _, n_evaluations in outcomes]
+    return EnsembleValidationResult(accuracies, evaluations, tolerance=tolerance)
+
+
+def _validate_member(task):
+    """
+    Validates a single ensemble member.
+
+    Parameters
+    ----------
+
+    task : tuple
+        The model function, delays, variables, forcing inputs, vectorized flag, start time, end
+        time and validate keyword arguments.
+
+    Returns
+    -------
+
+    float, int
+        The accuracy and number of model evaluations used.
+    """
+    func, delays, variables, forcing_inputs, vectorized, start, end, validate_args = task
+    validator = BDESolverValidator(func, delays, variables, forcing_inputs, vectorized=vectorized)
+    accuracy = validator.validate(start, end, **validate_args)
+    return accuracy, validator.evaluations
+
+
+def _difference(bts1, bts2):
+    """
+    Builds a Boolean time series that is True where two time series over the same range differ.
+
+    Parameters
+    ----------
+
+    bts1 : BooleanTimeSeries
+        A Boolean time series.
+    bts2 : BooleanTimeSeries
+        A Boolean time series with the same range.
+
+    Returns
+    -------
+
+    BooleanTimeSeries
+        Time series that is True when the two time series have different states.
+    """
+    times, states = BooleanTimeSeries.merge([bts1, bts2])
+    [difference] = BooleanTimeSeries.unmerge(
+        times, [[state[0] != state[1]] for state in states], bts1.end)
+    return difference
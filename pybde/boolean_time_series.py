@@ -1,5 +1,5 @@
 import math
-import matplotlib.pyplot as plt
+import operator
 import numpy as np
 
 
@@ -57,20 +57,47 @@ class BooleanTimeSeries:
         self.style = style
 
         # Pad out the state values to be the length of the inputs
-        while len(y) < len(t):
-            y.append(not y[-1])
+        while len(self.y) < len(self.t):
+            self.y.append(not self.y[-1])
 
-        if len(y) > len(t):
-            raise ValueError("Cannot specify more value elements (y) than time elements (t).")
+        BooleanTimeSeries._validate(self.t, self.y, self.end)
 
-        for i in range(len(t)-1):
-            if t[i] >= t[i+1]:
-                raise ValueError("Time values (t) must be incrementing.")
+    @classmethod
+    def from_trusted_arrays(cls, t, y, end, label=None, style=None):
+        """
+        Creates a Boolean time series without validating or converting the inputs.
 
-        if not BooleanTimeSeries._is_time_before_or_equal(t[-1], end):
-            raise ValueError(
-                "End time ({}) must be equal to or greater than last switch time ({})".format(
-                    end, t[-1]))
+        This is intended for code that already guarantees the invariants of a Boolean time
+        series, for example series derived from other Boolean time series or from the output of
+        the solver. The inputs are stored as given so no padding of the state values is done.
+
+        Parameters
+        ----------
+
+        t : list of float, or numpy array of float
+            Strictly increasing time points at which state changes occur.
+        y : list of bool, or numpy array of bool
+            New state at each of the time points in t. Must be the same length as t.
+        end : float
+            The end time of the time series. Must not be before the last time point.
+        label : str
+            Label used when plotting the time series. Optional. Default value is None.
+        style : str
+            matplotlib style used when plotting the time series. Optional. Default value is None.
+
+        Returns
+        -------
+
+        BooleanTimeSeries
+            New Boolean time series sharing the given time and state sequences.
+        """
+        bts = cls.__new__(cls)
+        bts.t = t
+        bts.y = y
+        bts.end = end
+        bts.label = label
+        bts.style = style
+        return bts
 
     def __str__(self):
         """
@@ -150,7 +177,8 @@ class BooleanTimeSeries:
             res_t.append(new_start)
             res_y.append(last_state_before_start)
 
-        return BooleanTimeSeries(res_t, res_y, new_end, label=self.label, style=self.style)
+        return BooleanTimeSeries.from_trusted_arrays(
+            res_t, res_y, new_end, label=self.label, style=self.style)
 
     def compress(self):  # Remove redundant switch points
         """
@@ -163,16 +191,23 @@ class BooleanTimeSeries:
         BooleanTimeSeries
             self
         """
-        previous_y = None
-        res_t = []
-        res_y = []
-        for i, yy in enumerate(self.y):
-            if yy != previous_y:
-                res_t.append(self.t[i])
-                res_y.append(yy)
-                previous_y = yy
-        self.t = res_t
-        self.y = res_y
+        y = np.asarray(self.y, dtype=bool)
+
+        # Keep the first point and every point whose state differs from the previous one
+        keep = np.empty(len(y), dtype=bool)
+        keep[0] = True
+        np.not_equal(y[1:], y[:-1], out=keep[1:])
+        index = np.flatnonzero(keep)
+
+        if isinstance(self.t, np.ndarray):
+            self.t = self.t[index].tolist()
+        elif len(index) == 1:
+            self.t = [self.t[0]]
+        elif len(index) < len(y):
+            # Picking the kept items is faster than converting the whole list to an array
+            self.t = list(operator.itemgetter(*index.tolist())(self.t))
+        if isinstance(self.y, np.ndarray) or len(index) < len(y):
+            self.y = y[index].tolist()
 
         return self
 
@@ -203,6 +238,44 @@ class BooleanTimeSeries:
                 return self.y[-1]
         raise ValueError("Time outside range of time series")
 
+    def get_states(self, times):
+        """
+        Obtains the state at each of the given times.
+
+        This is equivalent to calling get_state for each time but uses a binary search so it is
+        much faster for many times.
+
+        Parameters
+        -----------
+
+        times : list of float, or numpy array of float
+            Times
+
+        Returns
+        -------
+
+        numpy array of bool
+            The state at each of the given times. Raises a ValueError if any time is outside the
+            range.
+        """
+        t = np.asarray(self.t, dtype=float)
+        times = np.asarray(times, dtype=float)
+
+        indices = np.searchsorted(t, times, side='right') - 1
+
+        # Times within tolerance of the next switch point take the state of that switch point
+        next_indices = np.minimum(indices + 1, len(t) - 1)
+        on_next = (indices + 1 < len(t)) & BooleanTimeSeries._times_are_equal_array(
+            times, t[next_indices])
+        indices = np.where(on_next, next_indices, indices)
+
+        after_end = (times > self.end) & ~BooleanTimeSeries._times_are_equal_array(
+            times, self.end)
+        if np.any(indices < 0) or np.any(after_end):
+            raise ValueError("Time outside range of time series")
+
+        return np.asarray(self.y, dtype=bool)[indices]
+
     def hamming_distance(self, other):
         """
         Calculates the Hamming distance comparing this Boolean time series with another.
@@ -232,7 +305,7 @@ class BooleanTimeSeries:
 
         return distance
 
-    def plot(self, offset=0, scale=1):
+    def plot(self, offset=0, scale=1, x_range=None, width=None):
         """
         Plots the Boolean time series to a matplotlib plot.
 
@@ -252,12 +325,41 @@ class BooleanTimeSeries:
         scale : float
             Specifies that the value to plot for True is a value other than 1. This can be useful
             when plotting Boolean time series alongside experimental data.  Optional. Default is 1.
-        """
-        plot_t, plot_y = self.to_plot_data(offset=offset, scale=scale)
+
+        x_range : (float, float)
+            Visible time range, only the part of the time series inside it is plotted.
+            Optional. Default is the full range of the time series.
+
+        width : int
+            Width of the plot in pixels. If specified the plot data is decimated so that runs of
+            switches closer together than a pixel are drawn as filled activity regions. This
+            keeps plotting responsive for very long time series. Optional. Default is None which
+            plots every switch point.
+        """
+        import matplotlib.pyplot as plt
+
+        if width is None:
+            time_series = self
+            if x_range is not None:
+                lo = max(x_range[0], self.t[0])
+                hi = min(x_range[1], self.end)
+                if hi <= lo:
+                    raise ValueError("Visible range does not overlap the time series.")
+                time_series = self.cut(lo, hi)
+            plot_t, plot_y = time_series._plot_arrays(offset, scale)
+            regions = []
+        else:
+            plot_t, plot_y, regions = self.to_decimated_plot_data(
+                width, x_range=x_range, offset=offset, scale=scale)
+
         if self.style:
-            plt.plot(plot_t, plot_y, self.style, label=self.label)
+            [line] = plt.plot(plot_t, plot_y, self.style, label=self.label)
         else:
-            plt.plot(plot_t, plot_y, label=self.label)
+            [line] = plt.plot(plot_t, plot_y, label=self.label)
+
+        if regions:
+            plt.gca().broken_barh([(r_start, r_end - r_start) for r_start, r_end in regions],
+                                  (offset, scale), color=line.get_color(), alpha=0.5)
 
     def show(self, offset=0, scale=1):
         """
@@ -277,11 +379,9 @@ class BooleanTimeSeries:
             Specifies that the value to plot for True is a value other than 1. This can be useful
             when plotting Boolean time series alongside experimental data.  Optional. Default is 1.
         """
-        plot_t, plot_y = self.to_plot_data(offset=offset, scale=scale)
-        if self.style:
-            plt.plot(plot_t, plot_y, self.style, label=self.label)
-        else:
-            plt.plot(plot_t, plot_y, label=self.label)
+        import matplotlib.pyplot as plt
+
+        self.plot(offset=offset, scale=scale)
         plt.yticks([0, 1])
         plt.grid(True)
         plt.tight_layout()
@@ -312,25 +412,143 @@ class BooleanTimeSeries:
             The first list contains the time values, the second list contains the corresponding y
             values.
         """
-        res_y = []
-        res_t = [self.t[0]]
-        for i in range(1, len(self.t)):
-            res_t.append(self.t[i])
-            res_t.append(self.t[i])
-        if self.t[-1] < self.end and not np.isclose(self.t[-1], self.end):
-            res_t.append(self.end)
-
-        for i in range(len(self.y)-1):
-            res_y.append(self.y[i] * scale + offset)
-            res_y.append(self.y[i] * scale + offset)
-        res_y.append(self.y[-1] * scale + offset)
-        if self.t[-1] < self.end and not np.isclose(self.t[-1], self.end):
-            res_y.append(self.y[-1] * scale + offset)
-
-        return res_t, res_y
+        plot_t, plot_y = self._plot_arrays(offset, scale)
+        return plot_t.tolist(), plot_y.tolist()
+
+    def to_decimated_plot_data(self, width, x_range=None, offset=0, scale=1):
+        """
+        Obtains plot data for the visible part of the Boolean time series reduced to the
+        resolution of the plot.
+
+        The visible time range is split into one bin per pixel. Runs of bins that contain more
+        than one switch point cannot be resolved on screen so they are returned as activity
+        regions instead of individual switches. The line data holds the state before each
+        activity region until the end of the region and the state after it from then on.
+
+        Parameters
+        ----------
+
+        width : int
+            Width of the plot in pixels.
+
+        x_range : (float, float)
+            Visible time range. Optional. Default is the full range of the time series.
+
+        offset : float
+            Specifies an offset from 0 and 1 at which to plot the line. Optional. Default is 0.
+
+        scale : float
+            Specifies that the value to plot for True is a value other than 1. Optional.
+            Default is 1.
+
+        Returns
+        -------
+
+        numpy array of float, numpy array of float, list of (float, float)
+            The time values and corresponding y values of the line and the start and end times
+            of each activity region.
+        """
+        if width < 1:
+            raise ValueError("Plot width must be at least one pixel.")
+
+        t = np.asarray(self.t, dtype=float)
+        y = np.asarray(self.y, dtype=bool)
+
+        if x_range is None:
+            x_range = (t[0], self.end)
+        lo = max(x_range[0], t[0])
+        hi = min(x_range[1], self.end)
+        if hi <= lo:
+            raise ValueError("Visible range does not overlap the time series.")
+
+        # State at the start of the visible range and the switches inside it
+        first = np.searchsorted(t, lo, side='right') - 1
+        last = np.searchsorted(t, hi, side='right')
+        switch_t = t[first+1:last]
+        switch_y = y[first+1:last]
+
+        bin_width = (hi - lo) / width
+        bins = np.minimum(((switch_t - lo) / bin_width).astype(np.int64), width - 1)
+        busy_bins = np.bincount(bins, minlength=width) > 1
+
+        # Runs of busy bins become activity regions
+        edges = np.diff(np.concatenate(([0], busy_bins.astype(np.int8), [0])))
+        region_start_bins = np.flatnonzero(edges == 1)
+        region_end_bins = np.flatnonzero(edges == -1)
+        region_starts = lo + region_start_bins * bin_width
+        region_ends = np.minimum(lo + region_end_bins * bin_width, hi)
+
+        # Each region ends in the state of its last switch, unless a kept switch is at the
+        # same time. Region ends go before switches so the switch gives the later state.
+        last_in_region = np.searchsorted(bins, region_end_bins, side='left') - 1
+        keep = ~busy_bins[bins]
+        end_state = ~np.isin(region_ends, switch_t[keep])
+
+        line_t = np.concatenate(([lo], region_ends[end_state], switch_t[keep]))
+        line_y = np.concatenate(([y[first]], switch_y[last_in_region][end_state],
+                                 switch_y[keep]))
+        order = np.argsort(line_t, kind='stable')
+
+        plot_t, plot_y = BooleanTimeSeries._step_arrays(
+            line_t[order], line_y[order], hi, offset, scale)
+        return plot_t, plot_y, list(zip(region_starts.tolist(), region_ends.tolist()))
+
+    def _plot_arrays(self, offset, scale):
+        """
+        Obtains the plot data of the Boolean time series as numpy arrays.
+
+        Parameters
+        ----------
+
+        offset : float
+            Offset from 0 and 1 at which to plot the line.
+
+        scale : float
+            Value to plot for True.
+
+        Returns
+        -------
+
+        numpy array of float, numpy array of float
+            The time values and the corresponding y values.
+        """
+        return BooleanTimeSeries._step_arrays(
+            np.asarray(self.t), np.asarray(self.y), self.end, offset, scale)
+
+    @staticmethod
+    def _step_arrays(t, y, end, offset, scale):
+        """
+        Converts switch points to the corner points of a step line.
+
+        Parameters
+        ----------
+
+        t : numpy array of float
+            Time points at which state changes occur.
+        y : numpy array
+            New state at each of the time points in t.
+        end : float
+            End time of the line.
+        offset : float
+            Offset from 0 and 1 at which to plot the line.
+        scale : float
+            Value to plot for True.
+
+        Returns
+        -------
+
+        numpy array of float, numpy array of float
+            The time values and the corresponding y values.
+        """
+        plot_t = np.repeat(t, 2)[1:]
+        plot_y = np.repeat(y * scale + offset, 2)[:-1]
+        if t[-1] < end and not np.isclose(t[-1], end):
+            plot_t = np.append(plot_t, end)
+            plot_y = np.append(plot_y, plot_y[-1])
+        return plot_t, plot_y
 
     @staticmethod
-    def plot_many(list_of_time_series, offset=0.05):
+    def plot_many(list_of_time_series, offset=0.05, x_range=None, width=None):
         """
         Plots multiple Boolean time series to a matplotlib plot.
 
@@ -345,15 +563,25 @@ class BooleanTimeSeries:
 
         offset : float
             Specifies an vertical axis offset between each plot. Optional. Default is 0.05
+
+        x_range : (float, float)
+            Visible time range, see BooleanTimeSeries.plot. Optional. Default is the full range
+            of each time series.
+
+        width : int
+            Width of the plot in pixels. If specified the plot data is decimated, see
+            BooleanTimeSeries.plot. Optional. Default is None which plots every switch point.
         """
+        import matplotlib.pyplot as plt
+
         for i, time_series in enumerate(list_of_time_series):
-            time_series.plot(offset=offset*i)
+            time_series.plot(offset=offset*i, x_range=x_range, width=width)
         plt.yticks([0, 1])
         plt.grid(True)
         plt.tight_layout()
 
     @staticmethod
-    def show_many(list_of_time_series, offset=0.05):
+    def show_many(list_of_time_series, offset=0.05, x_range=None, width=None):
         """
         Plots multiple Boolean time series to a matplotlib plot and shows it.
 
@@ -365,8 +593,19 @@ class BooleanTimeSeries:
 
         offset : float
             Specifies an vertical axis offset between each plot. Optional. Default is 0.05
+
+        x_range : (float, float)
+            Visible time range, see BooleanTimeSeries.plot. Optional. Default is the full range
+            of each time series.
+
+        width : int
+            Width of the plot in pixels. If specified the plot data is decimated, see
+            BooleanTimeSeries.plot. Optional. Default is None which plots every switch point.
         """
-        BooleanTimeSeries.plot_many(list_of_time_series, offset=offset)
+        import matplotlib.pyplot as plt
+
+        BooleanTimeSeries.plot_many(list_of_time_series, offset=offset, x_range=x_range,
+                                    width=width)
         plt.show()
 
     @staticmethod
@@ -499,28 +738,66 @@ class BooleanTimeSeries:
         Parameters
         ----------
 
-        t : list of float
+        t : list of float, or numpy array of float
             List of switch time points.
-        y : list of list of bool
+        y : list of list of bool, or 2D numpy array of bool
             List of lists of state variables at each time point.
+        end : float
+            The end time of the time series.
 
         Returns
         -------
 
         list of BooleanTimeSeries:
-            List of the BooleanTimeSeries data.
+            List of the BooleanTimeSeries data. Each time series only contains the time points
+            at which its own state changes.
         """
+        times = np.asarray(t)
+        # One contiguous row per variable so each change search is a single pass
+        columns = np.ascontiguousarray(np.asarray(y, dtype=bool).T)
+
         result = []
-        num_values = len(y[0])
-        for i in range(num_values):
-            y_data = []
-            for yy in y:
-                y_data.append(yy[i])
-            result.append(BooleanTimeSeries(t, y_data, end).compress())
+        for column in columns:
+            indices = np.flatnonzero(column[1:] != column[:-1]) + 1
+            indices = np.concatenate(([0], indices))
+            result.append(BooleanTimeSeries.from_trusted_arrays(
+                times[indices].tolist(), column[indices].tolist(), end))
 
         return result
 
 
+    @staticmethod
+    def _validate(t, y, end):
+        """
+        Checks the time points, state values and end time describe a valid Boolean time series.
+
+        Parameters
+        ----------
+
+        t : list of float
+            Time points at which state changes occur.
+        y : list of bool
+            New state at each of the time points in t.
+        end : float
+            The end time of the time series.
+
+        Raises
+        ------
+
+        ValueError
+            If the time series is not valid.
+        """
+        if len(y) > len(t):
+            raise ValueError("Cannot specify more value elements (y) than time elements (t).")
+
+        if len(t) > 1 and np.any(np.diff(np.asarray(t, dtype=float)) <= 0):
+            raise ValueError("Time values (t) must be incrementing.")
+
+        if not BooleanTimeSeries._is_time_before_or_equal(t[-1], end):
+            raise ValueError(
+                "End time ({}) must be equal to or greater than last switch time ({})".format(
+                    end, t[-1]))
+
     @staticmethod
     def _get_state(indexes, list_of_boolean_time_series):
         """
@@ -612,6 +889,31 @@ class BooleanTimeSeries:
         return math.isclose(
             t1, t2, rel_tol=BooleanTimeSeries.rel_tol, abs_tol=BooleanTimeSeries.abs_tol)
 
+    @staticmethod
+    def _times_are_equal_array(t1, t2):
+        """
+        Compares if times are equal within tolerance element by element. Uses the same
+        comparison as math.isclose.
+
+        Parameters
+        ----------
+
+        t1 : numpy array of float
+            Time points.
+        t2 : numpy array of float, or float
+            Time points.
+
+        Returns
+        -------
+
+        numpy array of bool
+            True where the two times are equal, False otherwise.
+        """
+        tolerance = np.maximum(
+            BooleanTimeSeries.rel_tol * np.maximum(np.abs(t1), np.abs(t2)),
+            BooleanTimeSeries.abs_tol)
+        return np.abs(t1 - t2) <= tolerance
+
     @staticmethod
     def _is_time_before(t1, t2):
         """
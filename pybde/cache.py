@@ -0,0 +1,237 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+import numpy as np
+
+CACHE_FORMAT_VERSION = 1
+
+_ENTRY_SUFFIX = ".npz"
+
+
+class SolveCache:
+    """
+    Content-addressed on-disk cache of simulation results.
+
+    Results are keyed by a hash of a user supplied model identity, the delays, history, forcing
+    inputs, end time and tolerances. The model function itself cannot be hashed reliably so the
+    model identity must change whenever the model function changes, for example by including a
+    version number.
+
+    Each result is stored as a single uncompressed ``.npz`` file holding the switch point times
+    and the state matrix. Files are written to a temporary name and renamed into place so
+    the cache can be shared by many processes. When the total size of the cache exceeds the
+    maximum size the least recently used results are removed.
+
+    Parameters
+    ----------
+
+    directory : str
+        Directory holding the cached results. It is created if it does not exist.
+    max_size : int
+        Maximum total size of the cached results in bytes. Optional. Default is None which
+        means no limit.
+
+    Attributes
+    ----------
+
+    hits : int
+        Number of results read from the cache.
+    misses : int
+        Number of results that had to be simulated.
+    """
+    def __init__(self, directory, max_size=None):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def solve(self, solver, end, model_id):
+        """
+        Runs the simulation using the given solver unless the result is already cached.
+
+        After returning the solver holds the result exactly as if its solve method had been
+        called, so methods such as print_result and plot_result can be used.
+
+        Parameters
+        ----------
+
+        solver : BDESolver
+            Solver configured with the model function, delays, history and forcing inputs.
+        end : float
+            End time.
+        model_id : str
+            Identity of the model function, including its version.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            A list containing a BooleanTimeSeries for each simulated variable.
+        """
+        key = self.key(solver, end, model_id)
+
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            res_t, res_y = cached
+            return solver._set_results(res_t.tolist(), res_y.tolist(), end)
+
+        self.misses += 1
+        results = solver.solve(end)
+        self.put(key, solver.res_t, solver.res_y)
+        return results
+
+    @staticmethod
+    def key(solver, end, model_id):
+        """
+        Calculates the cache key of a simulation.
+
+        Parameters
+        ----------
+
+        solver : BDESolver
+            Solver configured with the model function, delays, history and forcing inputs.
+        end : float
+            End time.
+        model_id : str
+            Identity of the model function, including its version.
+
+        Returns
+        -------
+
+        str
+            Hexadecimal SHA-256 digest identifying the simulation.
+        """
+        digest = hashlib.sha256()
+
+        def add(value):
+            data = np.ascontiguousarray(value)
+            digest.update("{}{}".format(data.dtype.str, data.shape).encode())
+            digest.update(data.tobytes())
+
+        digest.update("pybde-solve-cache-{}:{}".format(CACHE_FORMAT_VERSION, model_id).encode())
+        add(np.asarray(solver.delays, dtype=np.float64))
+        add(np.asarray(solver.t, dtype=np.float64))
+        add(np.asarray(solver.y, dtype=np.bool_))
+        if solver.have_forced_inputs:
+            add(np.asarray(solver.forced_t, dtype=np.float64))
+            add(np.asarray(solver.forced_y, dtype=np.bool_))
+        add(np.array([end, solver.rel_tol, solver.abs_tol], dtype=np.float64))
+
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Reads a cached result.
+
+        Parameters
+        ----------
+
+        key : str
+            Cache key.
+
+        Returns
+        -------
+
+        numpy array of float, 2D numpy array of bool
+            The switch point times and state matrix, or None if the result is not cached.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as entry:
+                res_t = entry["t"]
+                res_y = entry["y"]
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            # Missing, evicted by another process or unreadable
+            return None
+
+        # Record the use for least recently used eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return res_t, res_y
+
+    def put(self, key, res_t, res_y):
+        """
+        Stores a result in the cache.
+
+        Parameters
+        ----------
+
+        key : str
+            Cache key.
+        res_t : list of float
+            Switch point times.
+        res_y : list of list of bool
+            State of the variables at each switch point.
+        """
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, t=np.asarray(res_t, dtype=np.float64),
+                         y=np.asarray(res_y, dtype=np.bool_))
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        if self.max_size is not None:
+            self.evict(self.max_size)
+
+    def evict(self, max_size):
+        """
+        Removes the least recently used results until the cache is no larger than the given
+        size.
+
+        Parameters
+        ----------
+
+        max_size : int
+            Maximum total size of the cached results in bytes.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(_ENTRY_SUFFIX):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total_size <= max_size:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        """
+        Removes all the cached results.
+        """
+        self.evict(0)
+
+    def _path(self, key):
+        """
+        Obtains the path of the file holding a cached result.
+
+        Parameters
+        ----------
+
+        key : str
+            Cache key.
+
+        Returns
+        -------
+
+        str
+            Path of the file.
+        """
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
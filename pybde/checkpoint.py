@@ -0,0 +1,141 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+from pybde.bde_solver import IndexType
+
+FORMAT_NAME = "pybde-solver-checkpoint"
+FORMAT_VERSION = 1
+
+
+def save_checkpoint(path, solver, finder, res_t, res_y, first_row):
+    """
+    Writes the state of a running simulation to a compressed numpy .npz file.
+
+    The file holds the result arrays, the heap of candidate switch points in heap order, the
+    indices of each delay into the result and forcing input arrays, the delays, end time and
+    tolerances, and a fingerprint of the history and forcing inputs. It is written to a
+    temporary name and renamed into place so an interrupted write never leaves a partial
+    checkpoint.
+
+    Parameters
+    ----------
+
+    path : str
+        File to write.
+    solver : BDESolver
+        The solver running the simulation.
+    finder : CandidateSwitchFinder
+        The finder of the run, between candidate switch points.
+    res_t : list of float
+        Times of the result rows of the run.
+    res_y : list of list of bool
+        State of the variables at each result row.
+    first_row : int
+        Index of the first row of the result arrays found by the run.
+    """
+    heap = finder.times
+    forced_indices = finder.forced_indices if finder.have_forced_inputs else []
+    arrays = {
+        "format": np.array(FORMAT_NAME),
+        "version": np.array(FORMAT_VERSION),
+        "fingerprint": np.array(fingerprint(solver)),
+        "res_t": np.asarray(res_t, dtype=np.float64),
+        "res_y": np.asarray(res_y, dtype=np.bool_),
+        "delays": np.asarray(finder.delays, dtype=np.float64),
+        "end": np.array(finder.end, dtype=np.float64),
+        "tolerances": np.array([solver.rel_tol, solver.abs_tol], dtype=np.float64),
+        "heap_t": np.array([c[0] for c in heap], dtype=np.float64),
+        "heap_delay": np.array([c[1] for c in heap], dtype=np.int64),
+        "heap_type": np.array([c[2] for c in heap], dtype=np.int8),
+        "heap_index": np.array([c[3] for c in heap], dtype=np.int64),
+        "indices": np.asarray(finder.indices, dtype=np.int64),
+        "forced_indices": np.asarray(forced_indices, dtype=np.int64),
+        "first_row": np.array(first_row, dtype=np.int64),
+    }
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def load_checkpoint(path):
+    """
+    Reads a checkpoint written by save_checkpoint.
+
+    Parameters
+    ----------
+
+    path : str
+        File to read.
+
+    Returns
+    -------
+
+    dict
+        The saved state with keys fingerprint, res_t, res_y, delays, end, rel_tol, abs_tol,
+        heap, indices, forced_indices and first_row, as Python lists and numbers.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        if "format" not in data or data["format"].item() != FORMAT_NAME:
+            raise ValueError("{} is not a pybde solver checkpoint.".format(path))
+        if data["version"].item() != FORMAT_VERSION:
+            raise ValueError("Unsupported checkpoint format version: {}".format(
+                data["version"].item()))
+
+        heap = list(zip(data["heap_t"].tolist(), data["heap_delay"].tolist(),
+                        [IndexType(k) for k in data["heap_type"].tolist()],
+                        data["heap_index"].tolist()))
+        rel_tol, abs_tol = data["tolerances"].tolist()
+        return {
+            "fingerprint": data["fingerprint"].item(),
+            "res_t": data["res_t"].tolist(),
+            "res_y": data["res_y"].tolist(),
+            "delays": data["delays"].tolist(),
+            "end": data["end"].item(),
+            "rel_tol": rel_tol,
+            "abs_tol": abs_tol,
+            "heap": heap,
+            "indices": data["indices"].tolist(),
+            "forced_indices": data["forced_indices"].tolist(),
+            "first_row": data["first_row"].item(),
+        }
+
+
+def fingerprint(solver):
+    """
+    Calculates a fingerprint of a solver's history and forcing inputs, used to check a
+    checkpoint is resumed by an equivalent solver.
+
+    Parameters
+    ----------
+
+    solver : BDESolver
+        The solver.
+
+    Returns
+    -------
+
+    str
+        Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+
+    def add(value):
+        data = np.ascontiguousarray(value)
+        digest.update("{}{}".format(data.dtype.str, data.shape).encode())
+        digest.update(data.tobytes())
+
+    digest.update("{}-{}".format(FORMAT_NAME, FORMAT_VERSION).encode())
+    add(np.asarray(solver.t, dtype=np.float64))
+    add(np.asarray(solver.y, dtype=np.bool_))
+    if solver.have_forced_inputs:
+        add(np.asarray(solver.forced_t, dtype=np.float64))
+        add(np.asarray(solver.forced_y, dtype=np.bool_))
+    return digest.hexdigest()
@@ -0,0 +1,316 @@
+import os
+import numpy as np
+from pybde.bde_solver import BDESolver
+
+
+def strongly_connected_components(dependencies):
+    """
+    Finds the strongly connected components of a model's dependency graph.
+
+    Parameters
+    ----------
+
+    dependencies : list of list of int
+        For each variable, the indexes of the variables it depends on at any delay.
+
+    Returns
+    -------
+
+    list of list of int
+        The variables in each component. Components come after all the components they depend
+        on.
+    """
+    n = len(dependencies)
+    for i, inputs in enumerate(dependencies):
+        for j in inputs:
+            if not 0 <= j < n:
+                raise ValueError("Variable {} depends on unknown variable {}".format(i, j))
+
+    # Iterative version of Tarjan's algorithm, large networks would exceed the recursion limit.
+    # Components are completed dependencies first.
+    index = [None] * n
+    low_link = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] is not None:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, child = work.pop()
+            if child == 0:
+                index[v] = low_link[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+
+            inputs = dependencies[v]
+            while child < len(inputs):
+                w = inputs[child]
+                child += 1
+                if index[w] is None:
+                    work.append((v, child))
+                    work.append((w, 0))
+                    break
+                if on_stack[w]:
+                    low_link[v] = min(low_link[v], index[w])
+            else:
+                if low_link[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(sorted(component))
+                if work:
+                    parent = work[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[v])
+
+    return components
+
+
+def solve_decomposed(solver, end, dependencies, max_workers=None, partial=False):
+    """
+    Runs the simulation of a BDESolver by splitting the model into its strongly connected
+    components and simulating each component separately, in parallel using a process pool.
+
+    Each component is simulated with the full trajectories of the variables it depends on in
+    other components as forcing inputs, so a component is started as soon as the components
+    it depends on have finished. The model function is called with the state of all the
+    variables, with False for the variables that the component does not depend on, so the
+    dependencies must list every variable each output depends on.
+
+    The result is stored in the solver as if solve had been called and matches the result of
+    solve within the solver's tolerances rel_tol and abs_tol. The result arrays res_t and res_y
+    have the same rows as after solve, but switch times can differ in the last few bits, as each
+    component coalesces ties among its own candidate switch points.
+
+    Each component evaluates the model function at its own switch times, so when many
+    components switch at the same times the model function is called more often than by
+    solve. Use partial model functions so that each call only calculates the outputs of one
+    component.
+
+    Parameters
+    ----------
+
+    solver : BDESolver
+        Solver configured with the model function, delays, history and forcing inputs.
+    end : float
+        End time.
+    dependencies : list of list of int
+        For each variable, the indexes of the variables it depends on at any delay.
+    max_workers : int
+        Number of worker processes. Optional. Default is None which uses one per CPU. A value
+        of 1 simulates all the components in the current process. When not 1 the model
+        function is sent to worker processes so it must be picklable, i.e. defined at module
+        level.
+    partial : bool
+        If True the model function is called with a keyword argument ``variables`` listing
+        the indexes of the variables to calculate and must return the new states of just
+        those variables, in the same order. Without the argument it must calculate all the
+        variables. Optional. Default is False.
+
+    Returns
+    -------
+
+    list of BooleanTimeSeries
+        A list containing a BooleanTimeSeries for each simulated variable.
+    """
+    if len(dependencies) != len(solver.history):
+        raise ValueError("Number of dependency lists ({}) must equal number of variables ({})"
+                         .format(len(dependencies), len(solver.history)))
+    solver._validate_end(end)
+
+    components = strongly_connected_components(dependencies)
+    if len(components) == 1:
+        return solver.solve(end)
+
+    component_of = [0] * len(dependencies)
+    for c, component in enumerate(components):
+        for v in component:
+            component_of[v] = c
+
+    upstream = []
+    for component in components:
+        inputs = set()
+        for v in component:
+            inputs.update(w for w in dependencies[v] if component_of[w] != component_of[v])
+        upstream.append(sorted(inputs))
+
+    trajectories = [None] * len(dependencies)
+    # Components whose solver kept a row at the end time
+    ended = []
+
+    def make_task(c):
+        forcing_inputs = [trajectories[v] for v in upstream[c]]
+        if solver.have_forced_inputs:
+            forcing_inputs += solver.forced_inputs
+        return (solver.func, solver.delays, len(dependencies), components[c], upstream[c],
+                [solver.history[v] for v in components[c]], forcing_inputs or None,
+                solver.have_forced_inputs, partial, end, solver.rel_tol, solver.abs_tol)
+
+    def store(c, outcome):
+        # Results include the history so they are complete trajectories
+        results, has_end_row = outcome
+        for v, result in zip(components[c], results):
+            trajectories[v] = result
+        if has_end_row:
+            ended.append(c)
+
+    if max_workers == 1:
+        # Components are in dependency order
+        for c in range(len(components)):
+            store(c, _solve_component(make_task(c)))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+        waiting_for = [set(component_of[v] for v in inputs) for inputs in upstream]
+        downstream = [[] for _ in components]
+        for c, inputs in enumerate(waiting_for):
+            for u in inputs:
+                downstream[u].append(c)
+
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+            running = {executor.submit(_solve_component, make_task(c)): c
+                       for c in range(len(components)) if not waiting_for[c]}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    c = running.pop(future)
+                    store(c, future.result())
+                    for d in downstream[c]:
+                        waiting_for[d].discard(c)
+                        if not waiting_for[d]:
+                            running[executor.submit(_solve_component, make_task(d))] = d
+
+    res_t, res_y = _merge_trajectories(trajectories, end, bool(ended), solver.rel_tol,
+                                       solver.abs_tol)
+    return solver._set_results(res_t, res_y, end)
+
+
+class _ComponentModel:
+    """
+    Model function of one component, calling the model function of the whole network.
+
+    Parameters
+    ----------
+
+    func : function func(Z) or func(Z1,Z2) if forced inputs are used
+        Model function of the whole network.
+    n_variables : int
+        Number of variables in the whole network.
+    variables : list of int
+        Variables of the component.
+    upstream : list of int
+        Variables in other components the component depends on. These are the first forcing
+        inputs of the component.
+    have_forced_inputs : bool
+        Whether the network has forcing inputs. These follow the upstream variables in the
+        forcing inputs of the component.
+    partial : bool
+        Whether the model function accepts the variables to calculate.
+    """
+    def __init__(self, func, n_variables, variables, upstream, have_forced_inputs, partial):
+        self.func = func
+        self.n_variables = n_variables
+        self.variables = variables
+        self.upstream = upstream
+        self.have_forced_inputs = have_forced_inputs
+        self.partial = partial
+        self._full_z = None
+
+    def __call__(self, z, z2=None):
+        # Only the entries of the component and upstream variables change between calls
+        if self._full_z is None:
+            self._full_z = [[False] * self.n_variables for _ in z]
+        full_z = self._full_z
+        for d in range(len(z)):
+            state = full_z[d]
+            for i, v in enumerate(self.variables):
+                state[v] = z[d][i]
+            for i, v in enumerate(self.upstream):
+                state[v] = z2[d][i]
+
+        args = [full_z]
+        if self.have_forced_inputs:
+            n_upstream = len(self.upstream)
+            args.append([inputs[n_upstream:] for inputs in z2])
+
+        if self.partial:
+            return list(self.func(*args, variables=self.variables))
+
+        new_state = self.func(*args)
+        return [new_state[v] for v in self.variables]
+
+
+def _solve_component(task):
+    """
+    Simulates one component.
+
+    Parameters
+    ----------
+
+    task : tuple
+        The model function, delays, number of variables, component variables, upstream
+        variables, component history, forcing inputs, whether the network has forcing inputs,
+        whether the model function is partial, end time and tolerances.
+
+    Returns
+    -------
+
+    list of BooleanTimeSeries, bool
+        The simulation result of each variable in the component and whether the solver kept a
+        row at the end time.
+    """
+    (func, delays, n_variables, variables, upstream, history, forcing_inputs,
+     have_forced_inputs, partial, end, rel_tol, abs_tol) = task
+    model = _ComponentModel(func, n_variables, variables, upstream, have_forced_inputs, partial)
+    solver = BDESolver(model, delays, history, forcing_inputs, rel_tol=rel_tol, abs_tol=abs_tol)
+    results = solver.solve(end)
+    return results, solver.res_t[-1] == end
+
+
+def _merge_trajectories(trajectories, end, has_end_row, rel_tol, abs_tol):
+    """
+    Builds solver result arrays from the trajectories of all the variables.
+
+    Parameters
+    ----------
+
+    trajectories : list of BooleanTimeSeries
+        Trajectory of each variable.
+    end : float
+        End time.
+    has_end_row : bool
+        Whether to include a row at the end time. The solver keeps one when a switch point
+        candidate falls on the end time, which happens in the whole network if it happens in
+        any component.
+    rel_tol : float
+        Relative tolerance used to decide if switch points in different components are equal.
+    abs_tol : float
+        Absolute tolerance used to decide if switch points in different components are equal.
+
+    Returns
+    -------
+
+    list of float, list of list of bool
+        The switch point times and the state of the variables at each time.
+    """
+    times = [np.asarray(bts.t, dtype=float) for bts in trajectories]
+    if has_end_row:
+        times.append(np.array([end]))
+    times = np.unique(np.concatenate(times))
+
+    # The solver treats switch points within tolerance as one, so only keep the last time of
+    # each run of times that are equal within tolerance
+    limits = np.maximum(rel_tol * np.maximum(np.abs(times[1:]), np.abs(times[:-1])), abs_tol)
+    times = times[np.append(np.diff(times) > limits, True)]
+    states = np.empty((len(times), len(trajectories)), dtype=bool)
+    for i, bts in enumerate(trajectories):
+        indexes = np.searchsorted(np.asarray(bts.t, dtype=float), times, side="right") - 1
+        states[:, i] = np.asarray(bts.y, dtype=bool)[indexes]
+    return times.tolist(), states.tolist()
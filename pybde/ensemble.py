@@ -0,0 +1,458 @@
+import copy
+import os
+from abc import ABC, abstractmethod
+import numpy as np
+from pybde.bde_solver import BDESolver
+
+
+class EnsembleAccumulator(ABC):
+    """
+    Base class of accumulators of statistics over an ensemble of simulations.
+
+    An accumulator is registered as an observer of a BDESolver (see BDESolver.add_observer)
+    and updates its statistics from the events of each simulation, so the trajectories of the
+    ensemble members do not need to be kept once simulated. The events are passed to the
+    observers when a simulation has finished, so the memory needed is that of one member's
+    full result at a time. Accumulators from different processes can be combined with merge.
+
+    Attributes
+    ----------
+
+    members : int
+        Number of simulations accumulated.
+    """
+    def __init__(self):
+        self.members = 0
+
+    @abstractmethod
+    def on_start(self, t, state):
+        """
+        Called at the start of a simulation.
+
+        Parameters
+        ----------
+
+        t : float
+            Start time.
+        state : list of bool
+            State of the variables at the start time.
+        """
+
+    @abstractmethod
+    def on_switch(self, t, state):
+        """
+        Called when the state of the variables changes.
+
+        Parameters
+        ----------
+
+        t : float
+            Time of the switch.
+        state : list of bool
+            New state of the variables.
+        """
+
+    @abstractmethod
+    def on_end(self, t):
+        """
+        Called at the end of a simulation.
+
+        Parameters
+        ----------
+
+        t : float
+            End time.
+        """
+
+    @abstractmethod
+    def merge(self, other):
+        """
+        Adds the statistics of another accumulator of the same kind and configuration.
+
+        Parameters
+        ----------
+
+        other : EnsembleAccumulator
+            Accumulator to add.
+        """
+
+    @abstractmethod
+    def reset(self):
+        """
+        Discards the accumulated statistics.
+        """
+
+    def empty(self):
+        """
+        Creates an accumulator with the same configuration and no statistics.
+
+        Returns
+        -------
+
+        EnsembleAccumulator
+            The new accumulator.
+        """
+        other = copy.deepcopy(self)
+        other.reset()
+        return other
+
+    def _check_compatible(self, other):
+        """
+        Checks another accumulator can be merged into this one.
+
+        Parameters
+        ----------
+
+        other : EnsembleAccumulator
+            Accumulator to check.
+        """
+        if type(other) is not type(self):
+            raise ValueError("Cannot merge {} into {}".format(
+                type(other).__name__, type(self).__name__))
+
+
+class StateFractions(EnsembleAccumulator):
+    """
+    Accumulates the fraction of ensemble members with each variable True at each time of a
+    time grid.
+
+    Parameters
+    ----------
+
+    times : list of float
+        The time grid.
+
+    Attributes
+    ----------
+
+    times : numpy array of float
+        The time grid.
+    true_counts : 2D numpy array of int
+        Number of members with each variable True, one row per grid time and one column per
+        variable. None until the first simulation starts.
+    member_counts : numpy array of int
+        Number of members simulated at each grid time.
+    """
+    def __init__(self, times):
+        super().__init__()
+        self.times = np.asarray(times, dtype=float)
+        self.reset()
+
+    def reset(self):
+        self.members = 0
+        self.true_counts = None
+        self.member_counts = np.zeros(len(self.times), dtype=np.int64)
+
+    @property
+    def fractions(self):
+        """
+        The fraction of members with each variable True at each grid time. Grid times at which
+        no member was simulated are NaN.
+
+        Returns
+        -------
+
+        2D numpy array of float
+            One row per grid time and one column per variable.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.true_counts / self.member_counts[:, np.newaxis]
+
+    def on_start(self, t, state):
+        if self.true_counts is None:
+            self.true_counts = np.zeros((len(self.times), len(state)), dtype=np.int64)
+        self._index = int(np.searchsorted(self.times, t, side="left"))
+        self._state = np.asarray(state, dtype=bool)
+
+    def on_switch(self, t, state):
+        # The old state holds at grid times before the switch
+        self._fill(int(np.searchsorted(self.times, t, side="left")))
+        self._state = np.asarray(state, dtype=bool)
+
+    def on_end(self, t):
+        self._fill(int(np.searchsorted(self.times, t, side="right")))
+        self.members += 1
+
+    def merge(self, other):
+        self._check_compatible(other)
+        if not np.array_equal(self.times, other.times):
+            raise ValueError("Cannot merge state fractions on different time grids")
+        if other.true_counts is not None:
+            if self.true_counts is None:
+                self.true_counts = other.true_counts.copy()
+            else:
+                self.true_counts += other.true_counts
+        self.member_counts += other.member_counts
+        self.members += other.members
+
+    def _fill(self, index):
+        """
+        Records the current state at the grid times up to the given index.
+
+        Parameters
+        ----------
+
+        index : int
+            Index of the first grid time not to record.
+        """
+        if index > self._index:
+            self.true_counts[self._index:index] += self._state
+            self.member_counts[self._index:index] += 1
+            self._index = index
+
+
+class SwitchCounts(EnsembleAccumulator):
+    """
+    Accumulates the distribution of the number of times each variable switches in a
+    simulation.
+
+    Parameters
+    ----------
+
+    max_count : int
+        Largest number of switches given its own histogram bin. Larger numbers are counted in a
+        final overflow bin. Optional. Default is 100.
+
+    Attributes
+    ----------
+
+    histogram : 2D numpy array of int
+        Number of members with each number of switches, one row per variable and one column
+        per number of switches from 0 to max_count, plus the overflow column. None until the
+        first simulation starts.
+    """
+    def __init__(self, max_count=100):
+        super().__init__()
+        self.max_count = max_count
+        self.reset()
+
+    def reset(self):
+        self.members = 0
+        self.histogram = None
+        self._total = None
+        self._total_squares = None
+
+    @property
+    def mean(self):
+        """
+        The mean number of switches of each variable.
+
+        Returns
+        -------
+
+        numpy array of float
+            One value per variable.
+        """
+        return self._total / self.members
+
+    @property
+    def std(self):
+        """
+        The standard deviation of the number of switches of each variable.
+
+        Returns
+        -------
+
+        numpy array of float
+            One value per variable.
+        """
+        mean = self.mean
+        return np.sqrt(np.maximum(self._total_squares / self.members - mean * mean, 0))
+
+    def on_start(self, t, state):
+        if self.histogram is None:
+            self.histogram = np.zeros((len(state), self.max_count + 2), dtype=np.int64)
+            self._total = np.zeros(len(state), dtype=np.int64)
+            self._total_squares = np.zeros(len(state), dtype=np.int64)
+        self._state = np.asarray(state, dtype=bool)
+        self._counts = np.zeros(len(state), dtype=np.int64)
+
+    def on_switch(self, t, state):
+        state = np.asarray(state, dtype=bool)
+        self._counts += state != self._state
+        self._state = state
+
+    def on_end(self, t):
+        bins = np.minimum(self._counts, self.max_count + 1)
+        self.histogram[np.arange(len(bins)), bins] += 1
+        self._total += self._counts
+        self._total_squares += self._counts * self._counts
+        self.members += 1
+
+    def merge(self, other):
+        self._check_compatible(other)
+        if other.max_count != self.max_count:
+            raise ValueError("Cannot merge switch counts with different maximum counts")
+        if other.histogram is not None:
+            if self.histogram is None:
+                self.histogram = other.histogram.copy()
+                self._total = other._total.copy()
+                self._total_squares = other._total_squares.copy()
+            else:
+                self.histogram += other.histogram
+                self._total += other._total
+                self._total_squares += other._total_squares
+        self.members += other.members
+
+
+class DutyCycles(EnsembleAccumulator):
+    """
+    Accumulates the duty cycle of each variable, i.e. the fraction of the simulated period for
+    which the variable is True.
+
+    Attributes
+    ----------
+
+    total : numpy array of float
+        Sum of the duty cycles of each variable over the members. None until the first
+        simulation starts.
+    total_squares : numpy array of float
+        Sum of the squared duty cycles of each variable over the members.
+    """
+    def __init__(self):
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        self.members = 0
+        self.total = None
+        self.total_squares = None
+
+    @property
+    def mean(self):
+        """
+        The mean duty cycle of each variable.
+
+        Returns
+        -------
+
+        numpy array of float
+            One value per variable.
+        """
+        return self.total / self.members
+
+    @property
+    def std(self):
+        """
+        The standard deviation of the duty cycle of each variable.
+
+        Returns
+        -------
+
+        numpy array of float
+            One value per variable.
+        """
+        mean = self.mean
+        return np.sqrt(np.maximum(self.total_squares / self.members - mean * mean, 0))
+
+    def on_start(self, t, state):
+        if self.total is None:
+            self.total = np.zeros(len(state))
+            self.total_squares = np.zeros(len(state))
+        self._start = t
+        self._last = t
+        self._state = np.asarray(state, dtype=bool)
+        self._true_time = np.zeros(len(state))
+
+    def on_switch(self, t, state):
+        self._true_time += self._state * (t - self._last)
+        self._last = t
+        self._state = np.asarray(state, dtype=bool)
+
+    def on_end(self, t):
+        self._true_time += self._state * (t - self._last)
+        duty_cycles = self._true_time / (t - self._start)
+        self.total += duty_cycles
+        self.total_squares += duty_cycles * duty_cycles
+        self.members += 1
+
+    def merge(self, other):
+        self._check_compatible(other)
+        if other.total is not None:
+            if self.total is None:
+                self.total = other.total.copy()
+                self.total_squares = other.total_squares.copy()
+            else:
+                self.total += other.total
+                self.total_squares += other.total_squares
+        self.members += other.members
+
+
+def run_ensemble(func, members, end, accumulators, max_workers=None, rel_tol=1e-09,
+                 abs_tol=0.0):
+    """
+    Simulates an ensemble of models, in parallel using a process pool, keeping only the
+    statistics gathered by the given accumulators.
+
+    Each worker process accumulates the statistics of its share of the members into empty
+    copies of the accumulators, which are merged into the given accumulators.
+
+    Parameters
+    ----------
+
+    func : function func(Z) or func(Z1,Z2) if forced inputs are used
+        Model function, see BDESolver. When max_workers is not 1 the function is sent to
+        worker processes so it must be picklable, i.e. defined at module level.
+    members : list of (list of float, list of BooleanTimeSeries, list of BooleanTimeSeries)
+        The delays, history and forcing inputs (or None) of each ensemble member.
+    end : float
+        End time of the simulations.
+    accumulators : list of EnsembleAccumulator
+        Accumulators to add the statistics of the members to.
+    max_workers : int
+        Number of worker processes. Optional. Default is None which uses one per CPU. A value
+        of 1 simulates all the members in the current process.
+    rel_tol : float
+        Relative tolerance used when comparing times. Default is 1e-09
+    abs_tol : float
+        Absolute tolerance used when comparing times. Default is 0.0
+
+    Returns
+    -------
+
+    list of EnsembleAccumulator
+        The given accumulators.
+    """
+    if max_workers == 1:
+        _simulate_members((func, members, end, accumulators, rel_tol, abs_tol))
+        return accumulators
+
+    from concurrent.futures import ProcessPoolExecutor
+    n_workers = max_workers or os.cpu_count() or 1
+    chunk_size = max(1, len(members) // (4 * n_workers))
+    tasks = [(func, members[i:i + chunk_size], end,
+              [accumulator.empty() for accumulator in accumulators], rel_tol, abs_tol)
+             for i in range(0, len(members), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        for partial_accumulators in executor.map(_simulate_members, tasks):
+            for accumulator, partial in zip(accumulators, partial_accumulators):
+                accumulator.merge(partial)
+
+    return accumulators
+
+
+def _simulate_members(task):
+    """
+    Simulates a share of the ensemble members.
+
+    Parameters
+    ----------
+
+    task : tuple
+        The model function, members, end time, accumulators and tolerances.
+
+    Returns
+    -------
+
+    list of EnsembleAccumulator
+        The accumulators holding the statistics of the members.
+    """
+    func, members, end, accumulators, rel_tol, abs_tol = task
+    for delays, history, forcing_inputs in members:
+        solver = BDESolver(func, delays, history, forcing_inputs,
+                           rel_tol=rel_tol, abs_tol=abs_tol)
+        for accumulator in accumulators:
+            solver.add_observer(accumulator)
+        solver.solve(end)
+    return accumulators
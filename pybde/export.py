@@ -0,0 +1,112 @@
+import csv
+import numpy as np
+
+FORMATS = ("text", "csv", "tsv")
+
+_SEPARATORS = {"csv": ",", "tsv": "\t"}
+
+
+def export_result(file, t, y, end=None, fmt="text", labels=None, chunk_size=65536):
+    """
+    Writes simulation results to a file in bulk.
+
+    Each output row describes the state of all the variables over one interval between switch
+    points. Rows are formatted in chunks and written with a single write call per chunk.
+
+    The supported formats are:
+
+    * ``text`` - the layout used by BDESolver.print_result, e.g.
+      ``    1.00 ->     2.00 : T F``.
+    * ``csv`` and ``tsv`` - a header row of ``start``, ``end`` and the variable labels, quoted
+      as needed by the csv module, followed by one row per interval with the start and end times at full precision and the
+      state of each variable as 1 or 0. The final interval ends at the end time.
+
+    Parameters
+    ----------
+
+    file : str or file
+        Path of the file to write to or a file object opened for writing text.
+    t : list of float, or numpy array of float
+        Switch point times.
+    y : list of list of bool, or 2D numpy array of bool
+        State of the variables at each switch point.
+    end : float
+        End time of the results. Used by the csv and tsv formats. Optional. Default is the last
+        switch point time.
+    fmt : str
+        One of 'text', 'csv' or 'tsv'. Optional. Default is 'text'.
+    labels : list of str
+        Column names of the variables used by the csv and tsv formats. Optional. Default names
+        are x0, x1, ...
+    chunk_size : int
+        Number of rows formatted per write. Optional. Default is 65536.
+    """
+    if fmt not in FORMATS:
+        raise ValueError("Unknown export format '{}', must be one of {}".format(fmt, FORMATS))
+
+    if isinstance(file, str):
+        with open(file, "w", buffering=1 << 20) as f:
+            export_result(f, t, y, end=end, fmt=fmt, labels=labels, chunk_size=chunk_size)
+        return
+
+    t = np.asarray(t, dtype=float)
+    states = np.asarray(y, dtype=bool)
+    num_variables = states.shape[1]
+
+    if fmt == "text":
+        # Each row runs to the next switch point and the final state is shown as a zero
+        # length interval
+        starts = t
+        stops = np.append(t[1:], t[-1])
+        row_format = "%8.2f -> %8.2f : %s\n"
+        true_char, false_char, separator = "T", "F", " "
+        state_width = 2 * num_variables
+    else:
+        if labels is None:
+            labels = ["x{}".format(i) for i in range(num_variables)]
+        separator = _SEPARATORS[fmt]
+        starts = t
+        stops = np.append(t[1:], t[-1] if end is None else end)
+        row_format = "%r" + separator + "%r" + separator + "%s\n"
+        true_char, false_char = "1", "0"
+        state_width = 2 * num_variables - 1
+        # Labels are quoted if they contain the separator, quotes or line breaks
+        csv.writer(file, delimiter=separator, lineterminator="\n").writerow(
+            ["start", "end"] + list(labels))
+
+    for first in range(0, len(t), chunk_size):
+        last = min(first + chunk_size, len(t))
+        state_strings = _state_strings(
+            states[first:last], true_char, false_char, separator, state_width)
+        file.write("".join([row_format % row for row in zip(
+            starts[first:last].tolist(), stops[first:last].tolist(), state_strings)]))
+
+
+def _state_strings(states, true_char, false_char, separator, width):
+    """
+    Formats each row of a state matrix as a string of characters separated by a separator.
+
+    Parameters
+    ----------
+
+    states : 2D numpy array of bool
+        State matrix, one row per switch point.
+    true_char : str
+        Character used for True.
+    false_char : str
+        Character used for False.
+    separator : str
+        Character placed after each state character.
+    width : int
+        Number of characters to keep from each row.
+
+    Returns
+    -------
+
+    list of str
+        The formatted rows.
+    """
+    chars = np.full((states.shape[0], 2 * states.shape[1]), ord(separator), dtype=np.uint32)
+    chars[:, 0::2] = np.where(states, ord(true_char), ord(false_char))
+    chars = np.ascontiguousarray(chars[:, :width])
+    return chars.view("U{}".format(width)).ravel().tolist()
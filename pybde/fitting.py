@@ -0,0 +1,810 @@
+import itertools
+import math
+import os
+import time
+import numpy as np
+from pybde.bde_solver import BDESolver
+from pybde.boolean_time_series import BooleanTimeSeries
+
+
+class FitStatistics:
+    """
+    Run-time statistics of a delay fit.
+
+    Attributes
+    ----------
+
+    simulations : int
+        Number of candidate delays simulated.
+    memo_hits : int
+        Number of candidate delays whose distance was already known.
+    early_rejections : int
+        Number of simulations stopped early because the candidate could not beat the best fit.
+    prefix_reuses : int
+        Number of simulations that reused part of the previous simulation.
+    wall_time : float
+        Elapsed time of the search in seconds.
+    """
+    def __init__(self):
+        self.simulations = 0
+        self.memo_hits = 0
+        self.early_rejections = 0
+        self.prefix_reuses = 0
+        self.wall_time = 0.0
+
+    def __str__(self):
+        """
+        String showing the statistics.
+
+        Returns
+        -------
+
+        str
+            The statistics.
+        """
+        return ('simulations={}, memo_hits={}, early_rejections={}, prefix_reuses={}, '
+                'wall_time={:.3f}s').format(self.simulations, self.memo_hits,
+                                            self.early_rejections, self.prefix_reuses,
+                                            self.wall_time)
+
+    def merge(self, other):
+        """
+        Adds the counts of another set of statistics to these statistics.
+
+        Parameters
+        ----------
+
+        other : FitStatistics
+            Statistics to add.
+        """
+        self.simulations += other.simulations
+        self.memo_hits += other.memo_hits
+        self.early_rejections += other.early_rejections
+        self.prefix_reuses += other.prefix_reuses
+
+
+class FitResult:
+    """
+    Result of a delay fit.
+
+    Attributes
+    ----------
+
+    delays : list of float
+        The best delays found.
+    distance : float
+        Total Hamming distance between the simulation using the best delays and the target.
+    threshold : float
+        Relative threshold used to produce the target, if thresholds were searched, otherwise
+        None.
+    statistics : FitStatistics
+        Run-time statistics of the fit.
+    """
+    def __init__(self, delays, distance, statistics, threshold=None):
+        self.delays = delays
+        self.distance = distance
+        self.statistics = statistics
+        self.threshold = threshold
+
+    def __str__(self):
+        """
+        String showing the result of the fit.
+
+        Returns
+        -------
+
+        str
+            The result of the fit.
+        """
+        return 'delays={}, distance={}, threshold={}, {}'.format(
+            self.delays, self.distance, self.threshold, self.statistics)
+
+
+class DelayFitter:
+    """
+    Fits the delays of a model so that its simulation is as close as possible to target data,
+    for example thresholded experimental data.
+
+    The distance between a simulation and the target is the sum over the variables of the
+    Hamming distance between the simulated variable and its target over the simulated period.
+
+    To keep searches fast the distance of each candidate is remembered, consecutive
+    simulations reuse the unaffected part of the previous simulation (see BDESolver.resolve),
+    and simulations are stopped early at intermediate times once the distance so far shows the
+    candidate cannot improve on the best fit. Candidates can be evaluated in parallel in a
+    process pool, in which case the model function must be picklable.
+
+    Parameters
+    ----------
+
+    func : function func(Z) or func(Z1,Z2) if forced inputs are used
+        Model function, see BDESolver.
+    history : list of BooleanTimeSeries
+        History time series for each variable.
+    target : list of BooleanTimeSeries
+        Target time series for each variable. A value of None excludes a variable from the
+        distance.
+    forcing_inputs : list of BooleanTimeSeries
+        Time series for each forcing input. Optional. Default value is None.
+    end : float
+        End time of the simulations. Optional. Default is the earliest end of the target time
+        series.
+    max_workers : int
+        Number of worker processes used to evaluate candidates. Optional. Default is 1 which
+        evaluates candidates in the current process. None uses one process per CPU.
+    stages : list of float
+        Fractions of the simulated period after which a simulation may be stopped early.
+        Optional. Default is (0.25, 0.5).
+    decimals : int
+        Number of decimal places delays are rounded to when remembering distances. Optional.
+        Default is 9.
+    rel_tol : float
+        Relative tolerance used when comparing times. Default is 1e-09
+    abs_tol : float
+        Absolute tolerance used when comparing times. Default is 0.0
+    """
+    def __init__(self, func, history, target, forcing_inputs=None, end=None, max_workers=1,
+                 stages=(0.25, 0.5), decimals=9, rel_tol=1e-09, abs_tol=0.0):
+        self.func = func
+        self.history = history
+        self.target = target
+        self.forcing_inputs = forcing_inputs
+        self.max_workers = max_workers
+        self.decimals = decimals
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+
+        self.start = history[0].end
+        if end is None:
+            end = min(bts.end for bts in target if bts is not None)
+        self.end = end
+        if self.start >= end:
+            raise ValueError("end time ({}) must be greater than simulation start time({})".format(
+                end, self.start))
+
+        self.stage_ends = sorted(set(
+            [self.start + f * (end - self.start) for f in stages if 0 < f < 1] + [end]))
+        self.target_cuts = [
+            [None if bts is None else bts.cut(self.start, e) for bts in target]
+            for e in self.stage_ends]
+
+        self.statistics = FitStatistics()
+        self._memo = {}
+        self._solver = None
+        self._executor = None
+
+    def __getstate__(self):
+        """
+        Obtains the state sent to worker processes, leaving out the process pool, remembered
+        distances and current simulation.
+
+        Returns
+        -------
+
+        dict
+            State of the fitter.
+        """
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        state["_solver"] = None
+        state["_memo"] = {}
+        state["statistics"] = FitStatistics()
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Shuts down the worker processes, if any.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def distance(self, delays):
+        """
+        Calculates the distance between the simulation using the given delays and the target.
+
+        Parameters
+        ----------
+
+        delays : list of float
+            Values of the time delays.
+
+        Returns
+        -------
+
+        float
+            Total Hamming distance over all the variables.
+        """
+        return self.evaluate([delays])[0]
+
+    def evaluate(self, candidates, bound=math.inf):
+        """
+        Calculates the distance of each of the candidate delays.
+
+        Parameters
+        ----------
+
+        candidates : list of list of float
+            Candidate values of the time delays.
+        bound : float
+            Distance of the best fit so far. Simulations are stopped early once their distance
+            reaches this value. Optional. Default is infinity.
+
+        Returns
+        -------
+
+        list of float
+            The distance of each candidate. For candidates stopped early this is the distance
+            so far, which is not less than the bound.
+        """
+        keys = [self._key(delays) for delays in candidates]
+
+        todo = []
+        for key in keys:
+            if key in todo or self._is_known(key, bound):
+                self.statistics.memo_hits += 1
+            else:
+                todo.append(key)
+
+        if todo:
+            if self.max_workers == 1 or len(todo) == 1:
+                outcomes = self._evaluate_serial(todo, bound)
+            else:
+                outcomes = self._evaluate_parallel(todo, bound)
+            for key, outcome in zip(todo, outcomes):
+                self._memo[key] = outcome
+
+        return [self._memo[key][0] for key in keys]
+
+    def _is_known(self, key, bound):
+        """
+        Tests if the distance of a candidate is already known well enough.
+
+        Parameters
+        ----------
+
+        key : tuple of float
+            Rounded delays of the candidate.
+        bound : float
+            Distance at which simulations are stopped early.
+
+        Returns
+        -------
+
+        bool
+            True if the distance is known exactly, or the candidate was stopped early at a
+            distance that is not less than the bound.
+        """
+        if key not in self._memo:
+            return False
+        distance, exact = self._memo[key]
+        return exact or distance >= bound
+
+    def grid_search(self, grid, batch_size=None):
+        """
+        Evaluates every combination of the given delay values.
+
+        Parameters
+        ----------
+
+        grid : list of list of float
+            Values to try for each delay.
+        batch_size : int
+            Number of candidates evaluated together. Smaller batches allow more simulations to
+            be stopped early. Optional. Default is four per worker process.
+
+        Returns
+        -------
+
+        FitResult
+            The best fit.
+        """
+        start_time = self._start_search()
+        if batch_size is None:
+            batch_size = 4 * self._n_workers()
+
+        # Vary the last delay fastest so consecutive simulations share long prefixes
+        candidates = [list(delays) for delays in itertools.product(*grid)]
+        best_delays, best_distance = None, math.inf
+        for first in range(0, len(candidates), batch_size):
+            best_delays, best_distance = self._best_of(
+                candidates[first:first + batch_size], best_distance, best_delays)
+
+        return self._result(best_delays, best_distance, start_time)
+
+    def random_search(self, bounds, n_samples, seed=None, batch_size=None):
+        """
+        Evaluates delays drawn uniformly at random from the given bounds.
+
+        Parameters
+        ----------
+
+        bounds : list of (float, float)
+            Lower and upper bound of each delay.
+        n_samples : int
+            Number of candidates to evaluate.
+        seed : int
+            Seed of the random number generator. Optional. Default is None.
+        batch_size : int
+            Number of candidates evaluated together. Smaller batches allow more simulations to
+            be stopped early. Optional. Default is four per worker process.
+
+        Returns
+        -------
+
+        FitResult
+            The best fit.
+        """
+        start_time = self._start_search()
+        rng = np.random.default_rng(seed)
+        lower, upper = np.array(bounds, dtype=float).T
+        if batch_size is None:
+            batch_size = 4 * self._n_workers()
+
+        best_delays, best_distance = None, math.inf
+        for first in range(0, n_samples, batch_size):
+            n = min(batch_size, n_samples - first)
+            candidates = rng.uniform(lower, upper, (n, len(lower))).tolist()
+            best_delays, best_distance = self._best_of(candidates, best_distance, best_delays)
+
+        return self._result(best_delays, best_distance, start_time)
+
+    def coordinate_search(self, initial, step, bounds=None, min_step=1e-3, shrink=0.5,
+                          max_simulations=None):
+        """
+        Improves the delays one coordinate at a time.
+
+        At each iteration every delay is moved up and down by the step size, these candidates
+        are evaluated together and the best improvement is taken. When no candidate improves
+        the fit the step size is reduced.
+
+        Parameters
+        ----------
+
+        initial : list of float
+            Initial values of the delays.
+        step : float
+            Initial step size.
+        bounds : list of (float, float)
+            Lower and upper bound of each delay. Optional. Default is 0 to the length of the
+            history for every delay.
+        min_step : float
+            The search stops when the step size falls below this value. Optional. Default is
+            1e-3.
+        shrink : float
+            Factor by which the step size is reduced. Optional. Default is 0.5.
+        max_simulations : int
+            The search stops after this many simulations. Optional. Default is None which
+            means no limit.
+
+        Returns
+        -------
+
+        FitResult
+            The best fit.
+        """
+        start_time = self._start_search()
+        bounds = self._bounds(bounds, len(initial))
+
+        best_delays = self._clip(initial, bounds)
+        [best_distance] = self.evaluate([best_delays])
+
+        while step >= min_step and not self._out_of_simulations(max_simulations):
+            candidates = []
+            for i in range(len(best_delays)):
+                for direction in [-1, 1]:
+                    delays = list(best_delays)
+                    delays[i] += direction * step
+                    delays = self._clip(delays, bounds)
+                    if delays != best_delays:
+                        candidates.append(delays)
+
+            delays, distance = self._best_of(candidates, best_distance, best_delays)
+            if distance < best_distance:
+                best_delays, best_distance = delays, distance
+            else:
+                step *= shrink
+
+        return self._result(best_delays, best_distance, start_time)
+
+    def nelder_mead(self, initial, step, bounds=None, max_iterations=200, tolerance=1e-6):
+        """
+        Searches for the best delays using the Nelder-Mead simplex method.
+
+        The distance is a piecewise constant function of the delays so the method can stop at
+        a plateau. Restarting from the result or using coordinate_search can help.
+
+        Parameters
+        ----------
+
+        initial : list of float
+            Initial values of the delays.
+        step : float
+            Size of the initial simplex.
+        bounds : list of (float, float)
+            Lower and upper bound of each delay. Optional. Default is 0 to the length of the
+            history for every delay.
+        max_iterations : int
+            Maximum number of iterations. Optional. Default is 200.
+        tolerance : float
+            The search stops when the distances at the simplex vertices differ by less than
+            this value and the simplex is smaller than this value. Optional. Default is 1e-6.
+
+        Returns
+        -------
+
+        FitResult
+            The best fit.
+        """
+        start_time = self._start_search()
+        bounds = self._bounds(bounds, len(initial))
+        n = len(initial)
+
+        def clip(point):
+            return np.array(self._clip(point.tolist(), bounds))
+
+        simplex = [clip(np.array(initial, dtype=float))]
+        for i in range(n):
+            vertex = np.array(initial, dtype=float)
+            vertex[i] += step
+            simplex.append(clip(vertex))
+        values = self.evaluate([vertex.tolist() for vertex in simplex])
+
+        for _ in range(max_iterations):
+            order = np.argsort(values, kind='stable')
+            simplex = [simplex[i] for i in order]
+            values = [values[i] for i in order]
+
+            size = max(np.abs(vertex - simplex[0]).max() for vertex in simplex[1:])
+            if values[-1] - values[0] < tolerance and size < tolerance:
+                break
+
+            centroid = np.mean(simplex[:-1], axis=0)
+            reflected = clip(centroid + (centroid - simplex[-1]))
+            [reflected_value] = self.evaluate([reflected.tolist()], bound=values[-1])
+
+            if reflected_value < values[0]:
+                expanded = clip(centroid + 2 * (centroid - simplex[-1]))
+                [expanded_value] = self.evaluate([expanded.tolist()], bound=reflected_value)
+                if expanded_value < reflected_value:
+                    simplex[-1], values[-1] = expanded, expanded_value
+                else:
+                    simplex[-1], values[-1] = reflected, reflected_value
+            elif reflected_value < values[-2]:
+                simplex[-1], values[-1] = reflected, reflected_value
+            else:
+                contracted = clip(centroid + 0.5 * (simplex[-1] - centroid))
+                [contracted_value] = self.evaluate([contracted.tolist()], bound=values[-1])
+                if contracted_value < values[-1]:
+                    simplex[-1], values[-1] = contracted, contracted_value
+                else:
+                    # Shrink towards the best vertex
+                    simplex = [simplex[0]] + [clip(simplex[0] + 0.5 * (vertex - simplex[0]))
+                                              for vertex in simplex[1:]]
+                    values = [values[0]] + self.evaluate(
+                        [vertex.tolist() for vertex in simplex[1:]])
+
+        best = int(np.argmin(values))
+        return self._result(simplex[best].tolist(), values[best], start_time)
+
+    def _best_of(self, candidates, best_distance, best_delays):
+        """
+        Evaluates candidates and finds the best of them and the current best fit.
+
+        Parameters
+        ----------
+
+        candidates : list of list of float
+            Candidate values of the time delays.
+        best_distance : float
+            Distance of the best fit so far.
+        best_delays : list of float
+            Delays of the best fit so far.
+
+        Returns
+        -------
+
+        list of float, float
+            The best delays and their distance.
+        """
+        if candidates:
+            for delays, distance in zip(candidates, self.evaluate(candidates, best_distance)):
+                if distance < best_distance:
+                    best_delays, best_distance = delays, distance
+        return best_delays, best_distance
+
+    def _evaluate_serial(self, candidates, bound):
+        """
+        Simulates candidates in the current process.
+
+        Parameters
+        ----------
+
+        candidates : list of tuple of float
+            Candidate values of the time delays.
+        bound : float
+            Distance at which simulations are stopped early.
+
+        Returns
+        -------
+
+        list of (float, bool)
+            The distance of each candidate and whether it is exact.
+        """
+        return [self._simulate(list(delays), bound) for delays in candidates]
+
+    def _evaluate_parallel(self, candidates, bound):
+        """
+        Simulates candidates in worker processes. Each worker is given a contiguous share of
+        the candidates so it can reuse prefixes between them.
+
+        Parameters
+        ----------
+
+        candidates : list of tuple of float
+            Candidate values of the time delays.
+        bound : float
+            Distance at which simulations are stopped early.
+
+        Returns
+        -------
+
+        list of (float, bool)
+            The distance of each candidate and whether it is exact.
+        """
+        n_workers = self._n_workers()
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=n_workers)
+
+        chunk_size = int(math.ceil(len(candidates) / n_workers))
+        chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+
+        distances = []
+        for chunk_distances, statistics in self._executor.map(
+                _evaluate_chunk, [(self, chunk, bound) for chunk in chunks]):
+            distances.extend(chunk_distances)
+            self.statistics.merge(statistics)
+        return distances
+
+    def _simulate(self, delays, bound):
+        """
+        Simulates the model with the given delays in stages, stopping once the distance
+        reaches the bound.
+
+        Parameters
+        ----------
+
+        delays : list of float
+            Values of the time delays.
+        bound : float
+            Distance at which the simulation is stopped early.
+
+        Returns
+        -------
+
+        float, bool
+            The distance between the simulation and the target, or the distance so far if the
+            simulation was stopped early, and whether the simulation ran to the end.
+        """
+        self.statistics.simulations += 1
+
+        if self._solver is None:
+            self._solver = BDESolver(self.func, delays, self.history, self.forcing_inputs,
+                                     rel_tol=self.rel_tol, abs_tol=self.abs_tol)
+            results = self._solver.solve(self.stage_ends[0])
+        else:
+            self.statistics.prefix_reuses += 1
+            results = self._solver.resolve(delays, self.stage_ends[0])
+
+        for i, stage_end in enumerate(self.stage_ends):
+            if i > 0:
+                results = self._solver.resolve(end=stage_end)
+
+            distance = 0.0
+            for result, target in zip(results, self.target_cuts[i]):
+                if target is not None:
+                    distance += result.cut(self.start, stage_end).hamming_distance(target)
+
+            if distance >= bound and stage_end < self.end:
+                self.statistics.early_rejections += 1
+                return distance, False
+
+        return distance, True
+
+    def _start_search(self):
+        """
+        Resets the statistics at the start of a search.
+
+        Returns
+        -------
+
+        float
+            Value of time.perf_counter at the start of the search.
+        """
+        self.statistics = FitStatistics()
+        return time.perf_counter()
+
+    def _result(self, delays, distance, start_time):
+        """
+        Builds the result of a search.
+
+        Parameters
+        ----------
+
+        delays : list of float
+            The best delays.
+        distance : float
+            The distance of the best delays.
+        start_time : float
+            Value of time.perf_counter when the search started.
+
+        Returns
+        -------
+
+        FitResult
+            The result of the search.
+        """
+        self.statistics.wall_time = time.perf_counter() - start_time
+        return FitResult(delays, distance, self.statistics)
+
+    def _key(self, delays):
+        """
+        Obtains the key used to remember the distance of the given delays.
+
+        Parameters
+        ----------
+
+        delays : list of float
+            Values of the time delays.
+
+        Returns
+        -------
+
+        tuple of float
+            The rounded delays.
+        """
+        return tuple(round(float(d), self.decimals) for d in delays)
+
+    def _bounds(self, bounds, n_delays):
+        """
+        Obtains the bounds of the delays.
+
+        Parameters
+        ----------
+
+        bounds : list of (float, float)
+            Lower and upper bound of each delay, or None for the default bounds.
+        n_delays : int
+            Number of delays.
+
+        Returns
+        -------
+
+        list of (float, float)
+            The bounds of each delay.
+        """
+        if bounds is None:
+            return [(0.0, self.start)] * n_delays
+        return [(max(lower, 0.0), min(upper, self.start)) for lower, upper in bounds]
+
+    @staticmethod
+    def _clip(delays, bounds):
+        """
+        Moves delays inside their bounds.
+
+        Parameters
+        ----------
+
+        delays : list of float
+            Values of the time delays.
+        bounds : list of (float, float)
+            Lower and upper bound of each delay.
+
+        Returns
+        -------
+
+        list of float
+            The delays moved inside their bounds.
+        """
+        return [min(max(d, lower), upper) for d, (lower, upper) in zip(delays, bounds)]
+
+    def _n_workers(self):
+        """
+        Returns
+        -------
+
+        int
+            Number of worker processes used to evaluate candidates.
+        """
+        return self.max_workers or os.cpu_count() or 1
+
+    def _out_of_simulations(self, max_simulations):
+        """
+        Tests if the simulation budget has been used up.
+
+        Parameters
+        ----------
+
+        max_simulations : int
+            Maximum number of simulations, or None for no limit.
+
+        Returns
+        -------
+
+        bool
+            True if there is a budget and it has been used up.
+        """
+        return max_simulations is not None and self.statistics.simulations >= max_simulations
+
+
+def threshold_search(func, history, data, thresholds, search, **fitter_args):
+    """
+    Fits delays and the relative threshold used to turn numerical data into Boolean target
+    data.
+
+    For each threshold the target data is produced with BooleanTimeSeries.relative_threshold,
+    a DelayFitter is built and the given search is run with it.
+
+    Parameters
+    ----------
+
+    func : function func(Z) or func(Z1,Z2) if forced inputs are used
+        Model function, see BDESolver.
+    history : list of BooleanTimeSeries
+        History time series for each variable.
+    data : list of (list of float, list of float)
+        Times and numerical values of the data for each variable, or None to exclude a
+        variable.
+    thresholds : list of float
+        Relative thresholds to try.
+    search : function search(fitter)
+        Runs a search with the given DelayFitter and returns the FitResult, for example
+        ``lambda fitter: fitter.coordinate_search([1, 1], 0.5)``.
+    fitter_args :
+        Further keyword arguments passed to DelayFitter.
+
+    Returns
+    -------
+
+    FitResult
+        The best fit, with the threshold attribute set to the best threshold.
+    """
+    best = None
+    for threshold in thresholds:
+        target = [None if d is None else BooleanTimeSeries.relative_threshold(d[0], d[1], threshold)
+                  for d in data]
+        with DelayFitter(func, history, target, **fitter_args) as fitter:
+            result = search(fitter)
+        result.threshold = threshold
+        if best is None or result.distance < best.distance:
+            best = result
+    return best
+
+
+def _evaluate_chunk(task):
+    """
+    Simulates a share of the candidates in a worker process.
+
+    Parameters
+    ----------
+
+    task : (DelayFitter, list of tuple of float, float)
+        The fitter, candidates and bound.
+
+    Returns
+    -------
+
+    list of (float, bool), FitStatistics
+        The distance of each candidate, whether it is exact, and the statistics of the
+        simulations.
+    """
+    fitter, candidates, bound = task
+    distances = fitter._evaluate_serial(candidates, bound)
+    return distances, fitter.statistics
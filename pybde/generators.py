@@ -0,0 +1,247 @@
+import numpy as np
+from pybde.histories import random_histories
+
+SPEC_FORMAT = "pybde-random-network"
+SPEC_VERSION = 1
+
+VARIABLE_INPUT = "variable"
+FORCING_INPUT = "forcing"
+
+
+class RandomNetwork:
+    """
+    Reproducible random Boolean delay network for stress and scaling tests.
+
+    Each variable has a number of inputs, each a variable or forcing input at one of the
+    delays, and a random truth table giving its new state for every combination of its inputs.
+    The network is a model function that can be passed to BDESolver, BDESolverValidator and
+    the parallel engines. It can be pickled, and saved and restored as a declarative spec with
+    to_spec and from_spec.
+
+    Parameters
+    ----------
+
+    n_variables : int
+        Number of variables.
+    in_degree : int
+        Number of inputs of each variable. Optional. Default is 2.
+    delays : list of float
+        Values of the time delays. Optional. Default is n_delays delays drawn uniformly from
+        delay_range.
+    n_delays : int
+        Number of delays to draw when delays is not given. Optional. Default is 2.
+    delay_range : (float, float)
+        Range the delays are drawn from. Optional. Default is (0.5, 1.5).
+    n_forcing_inputs : int
+        Number of forcing inputs. Optional. Default is 0.
+    forcing_probability : float
+        Probability that each input is a forcing input rather than a variable. Optional.
+        Default is 0.2 if there are forcing inputs.
+    bias : float
+        Probability that each truth table entry is True. Networks are most active when this is
+        0.5 and become quieter as it moves towards 0 or 1. Optional. Default is 0.5.
+    seed : int
+        Seed of the random number generator. Optional. Default is None.
+
+    Attributes
+    ----------
+
+    delays : list of float
+        Values of the time delays.
+    inputs : list of list of (str, int, int)
+        For each variable the kind (VARIABLE_INPUT or FORCING_INPUT), delay index and index
+        of each input.
+    tables : list of list of bool
+        For each variable its new state for each combination of its inputs. The first input
+        is the most significant bit of the table index.
+    """
+    def __init__(self, n_variables, in_degree=2, delays=None, n_delays=2,
+                 delay_range=(0.5, 1.5), n_forcing_inputs=0, forcing_probability=None,
+                 bias=0.5, seed=None):
+        if n_variables < 1:
+            raise ValueError("There must be at least one variable")
+        if in_degree < 0:
+            raise ValueError("in_degree must not be negative")
+        if not 0 <= bias <= 1:
+            raise ValueError("bias must be between 0 and 1")
+
+        rng = np.random.default_rng(seed)
+
+        if delays is None:
+            delays = rng.uniform(delay_range[0], delay_range[1], n_delays).tolist()
+        if not delays or min(delays) < 0:
+            raise ValueError("There must be at least one delay and delays must not be negative")
+        if forcing_probability is None:
+            forcing_probability = 0.2 if n_forcing_inputs else 0.0
+
+        self.n_variables = n_variables
+        self.n_forcing_inputs = n_forcing_inputs
+        self.delays = [float(d) for d in delays]
+        self.inputs = []
+        self.tables = []
+        for _ in range(n_variables):
+            inputs = []
+            for _ in range(in_degree):
+                delay_index = int(rng.integers(len(self.delays)))
+                if n_forcing_inputs and rng.random() < forcing_probability:
+                    inputs.append((FORCING_INPUT, delay_index, int(rng.integers(n_forcing_inputs))))
+                else:
+                    inputs.append((VARIABLE_INPUT, delay_index, int(rng.integers(n_variables))))
+            self.inputs.append(inputs)
+            self.tables.append((rng.random(2 ** in_degree) < bias).tolist())
+
+    def __call__(self, z, z2=None, variables=None):
+        """
+        Calculates the new state of the variables.
+
+        Parameters
+        ----------
+
+        z : list of list of bool
+            State of the variables at each delay.
+        z2 : list of list of bool
+            State of the forcing inputs at each delay. Optional. Default is None.
+        variables : list of int
+            Indexes of the variables to calculate, see BDESolver.solve_decomposed. Optional.
+            Default is all the variables.
+
+        Returns
+        -------
+
+        list of bool
+            New state of the variables.
+        """
+        if variables is None:
+            variables = range(self.n_variables)
+
+        new_state = []
+        for v in variables:
+            index = 0
+            for kind, delay_index, i in self.inputs[v]:
+                if kind == VARIABLE_INPUT:
+                    index = 2 * index + z[delay_index][i]
+                else:
+                    index = 2 * index + z2[delay_index][i]
+            new_state.append(self.tables[v][index])
+        return new_state
+
+    def dependencies(self):
+        """
+        Lists the variables each variable depends on, for BDESolver.solve_decomposed.
+
+        Returns
+        -------
+
+        list of list of int
+            For each variable, the indexes of the variables it depends on.
+        """
+        return [sorted(set(i for kind, _, i in inputs if kind == VARIABLE_INPUT))
+                for inputs in self.inputs]
+
+    def history(self, length=None, switch_rate=1.0, seed=None):
+        """
+        Generates a random history for the network.
+
+        Parameters
+        ----------
+
+        length : float
+            Length of the history. Optional. Default is the longest delay.
+        switch_rate : float
+            Mean number of switches per unit time of each variable. Optional. Default is 1.
+        seed : int
+            Seed of the random number generator. Optional. Default is None.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            History time series for each variable.
+        """
+        if length is None:
+            length = max(self.delays)
+        return random_histories(self.n_variables, length, 1, switch_rate=switch_rate,
+                                seed=seed)[0]
+
+    def forcing_inputs(self, end, switch_rate=1.0, seed=None):
+        """
+        Generates random forcing inputs for the network. Each forcing input starts in a random
+        state and switches at times drawn from a Poisson process.
+
+        Parameters
+        ----------
+
+        end : float
+            End time of the forcing inputs. This must be at least the end time of the
+            simulation.
+        switch_rate : float
+            Mean number of switches per unit time of each forcing input. Optional. Default
+            is 1.
+        seed : int
+            Seed of the random number generator. Optional. Default is None.
+
+        Returns
+        -------
+
+        list of BooleanTimeSeries
+            Time series for each forcing input, or None if the network has no forcing inputs.
+        """
+        if not self.n_forcing_inputs:
+            return None
+        return random_histories(self.n_forcing_inputs, end, 1, switch_rate=switch_rate,
+                                seed=seed)[0]
+
+    def to_spec(self):
+        """
+        Describes the network as a dictionary that can be saved as JSON.
+
+        Returns
+        -------
+
+        dict
+            The declarative spec of the network.
+        """
+        return {
+            "format": SPEC_FORMAT,
+            "version": SPEC_VERSION,
+            "n_variables": self.n_variables,
+            "n_forcing_inputs": self.n_forcing_inputs,
+            "delays": list(self.delays),
+            "inputs": [[list(i) for i in inputs] for inputs in self.inputs],
+            "tables": [list(table) for table in self.tables],
+        }
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Creates a network from a spec produced by to_spec.
+
+        Parameters
+        ----------
+
+        spec : dict
+            The declarative spec of the network.
+
+        Returns
+        -------
+
+        RandomNetwork
+            The network.
+        """
+        if spec.get("format") != SPEC_FORMAT:
+            raise ValueError("Not a random network spec")
+        if spec.get("version") != SPEC_VERSION:
+            raise ValueError("Unsupported random network spec version: {}".format(
+                spec.get("version")))
+
+        network = cls.__new__(cls)
+        network.n_variables = spec["n_variables"]
+        network.n_forcing_inputs = spec["n_forcing_inputs"]
+        network.delays = list(spec["delays"])
+        network.inputs = [[tuple(i) for i in inputs] for inputs in spec["inputs"]]
+        network.tables = [list(table) for table in spec["tables"]]
+
+        for inputs, table in zip(network.inputs, network.tables):
+            if len(table) != 2 ** len(inputs):
+                raise ValueError("Truth table size does not match number of inputs")
+        return network
@@ -0,0 +1,42 @@
+import numpy as np
+from pybde.boolean_time_series import BooleanTimeSeries
+
+
+def random_histories(n_variables, length, n_histories, switch_rate=1.0, seed=None):
+    """
+    Generates random histories. Each variable starts in a random state and switches at times
+    drawn from a Poisson process.
+
+    Parameters
+    ----------
+
+    n_variables : int
+        Number of variables.
+    length : float
+        Length of each history. This must be at least the longest delay of the model.
+    n_histories : int
+        Number of histories to generate.
+    switch_rate : float
+        Mean number of switches per unit time of each variable. Optional. Default is 1.
+    seed : int
+        Seed of the random number generator. Optional. Default is None.
+
+    Returns
+    -------
+
+    list of list of BooleanTimeSeries
+        The histories, each a list of time series for each variable.
+    """
+    rng = np.random.default_rng(seed)
+    histories = []
+    for _ in range(n_histories):
+        history = []
+        for _ in range(n_variables):
+            n_switches = rng.poisson(switch_rate * length)
+            times = np.sort(rng.uniform(0, length, n_switches))
+            # Switch points must lie strictly inside the history
+            times = times[(times > 0) & (times < length)]
+            states = np.logical_xor(bool(rng.integers(2)), np.arange(len(times) + 1) % 2 == 1)
+            history.append(BooleanTimeSeries([0] + times.tolist(), states.tolist(), length))
+        histories.append(history)
+    return histories
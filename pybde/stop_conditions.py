@@ -0,0 +1,143 @@
+from abc import ABC, abstractmethod
+
+
+class StopCondition(ABC):
+    """
+    Base class of conditions that end a simulation early, see BDESolver.solve.
+
+    A stop condition is called with the time and new state of the variables at each switch
+    point found by the simulation and returns True to stop the simulation there. Before the
+    simulation starts, start is called with the start time and the state of the variables at
+    that time, so conditions that depend on earlier states can reset themselves. Any function
+    func(t, state) can also be used as a stop condition.
+    """
+    def start(self, t, state):
+        """
+        Called at the start of a simulation.
+
+        Parameters
+        ----------
+
+        t : float
+            Start time.
+        state : list of bool
+            State of the variables at the start time.
+        """
+        pass
+
+    @abstractmethod
+    def __call__(self, t, state):
+        """
+        Tests the condition at a switch point.
+
+        Parameters
+        ----------
+
+        t : float
+            Time of the switch point.
+        state : list of bool
+            New state of the variables.
+
+        Returns
+        -------
+
+        bool
+            True to stop the simulation at this switch point.
+        """
+
+
+class VariableBecomes(StopCondition):
+    """
+    Stops the simulation when a variable first switches to the given state.
+
+    Parameters
+    ----------
+
+    variable : int
+        Index of the variable.
+    value : bool
+        State to wait for. Optional. Default is True.
+    """
+    def __init__(self, variable, value=True):
+        self.variable = variable
+        self.value = value
+        self._previous = None
+
+    def start(self, t, state):
+        self._previous = state[self.variable]
+
+    def __call__(self, t, state):
+        new = state[self.variable]
+        switched = new == self.value and self._previous != self.value
+        self._previous = new
+        return switched
+
+
+class StateMatches(StopCondition):
+    """
+    Stops the simulation when the state of the variables matches a pattern.
+
+    Parameters
+    ----------
+
+    pattern : list of bool
+        Required state of each variable, None for variables that can be in either state.
+    """
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    def start(self, t, state):
+        if len(self.pattern) != len(state):
+            raise ValueError("Pattern has {} states but there are {} variables".format(
+                len(self.pattern), len(state)))
+
+    def __call__(self, t, state):
+        for required, value in zip(self.pattern, state):
+            if required is not None and required != value:
+                return False
+        return True
+
+
+class Sequence(StopCondition):
+    """
+    Stops the simulation when conditions are met in order at successive switch points, for
+    example to detect a pattern of states. Each condition is tested once at every switch
+    point.
+
+    Parameters
+    ----------
+
+    conditions : list of StopCondition or function func(t, state)
+        The conditions, in the order they must be met.
+    within : float
+        Longest time from the switch point meeting the first condition to the one meeting the
+        last. Optional. Default is None for no limit.
+    """
+    def __init__(self, conditions, within=None):
+        if not conditions:
+            raise ValueError("A sequence needs at least one condition")
+        self.conditions = conditions
+        self.within = within
+        self._partial = []
+
+    def start(self, t, state):
+        self._partial = []
+        for condition in self.conditions:
+            start = getattr(condition, "start", None)
+            if start is not None:
+                start(t, state)
+
+    def __call__(self, t, state):
+        matches = [condition(t, state) for condition in self.conditions]
+
+        # Partial matches are (time of first match, index of next condition) and must advance
+        # at every switch point
+        partial = [(t, 1)] if matches[0] else []
+        for first_t, i in self._partial:
+            if matches[i] and (self.within is None or t - first_t <= self.within):
+                partial.append((first_t, i + 1))
+        if any(i == len(self.conditions) for _, i in partial):
+            self._partial = []
+            return True
+        self._partial = partial
+        return False
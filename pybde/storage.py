@@ -0,0 +1,106 @@
+import json
+import os
+import numpy as np
+from pybde.boolean_time_series import BooleanTimeSeries
+
+FORMAT_NAME = "pybde-boolean-time-series"
+FORMAT_VERSION = 1
+
+_METADATA_FILE = "metadata.json"
+_TIMES_FILE = "t.npy"
+_STATES_FILE = "y.npy"
+_OFFSETS_FILE = "offsets.npy"
+_ENDS_FILE = "end.npy"
+
+
+def save_boolean_time_series(path, list_of_time_series):
+    """
+    Saves a collection of Boolean time series to a directory in a compact columnar format.
+
+    The time points and states of all the time series are each stored as a single contiguous
+    numpy array (``t.npy`` and ``y.npy``). ``offsets.npy`` holds the position of each time series
+    within these arrays, ``end.npy`` holds the end times and ``metadata.json`` holds the labels
+    and styles.
+
+    Parameters
+    ----------
+
+    path : str
+        Directory to write to. It is created if it does not exist. Existing files in the
+        format are overwritten.
+    list_of_time_series : list of BooleanTimeSeries
+        Time series to save.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    lengths = [len(bts.t) for bts in list_of_time_series]
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    times = np.empty(offsets[-1], dtype=np.float64)
+    states = np.empty(offsets[-1], dtype=np.bool_)
+    for i, bts in enumerate(list_of_time_series):
+        times[offsets[i]:offsets[i+1]] = bts.t
+        states[offsets[i]:offsets[i+1]] = bts.y
+
+    ends = np.array([bts.end for bts in list_of_time_series], dtype=np.float64)
+
+    np.save(os.path.join(path, _TIMES_FILE), times)
+    np.save(os.path.join(path, _STATES_FILE), states)
+    np.save(os.path.join(path, _OFFSETS_FILE), offsets)
+    np.save(os.path.join(path, _ENDS_FILE), ends)
+
+    metadata = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "labels": [bts.label for bts in list_of_time_series],
+        "styles": [bts.style for bts in list_of_time_series],
+    }
+    with open(os.path.join(path, _METADATA_FILE), "w") as f:
+        json.dump(metadata, f)
+
+
+def load_boolean_time_series(path, mmap_mode="r"):
+    """
+    Loads a collection of Boolean time series saved by save_boolean_time_series.
+
+    By default the time and state arrays are memory-mapped so large collections can be opened
+    without reading them fully into memory. Each returned time series holds numpy array views
+    into these arrays as its t and y attributes.
+
+    Parameters
+    ----------
+
+    path : str
+        Directory to read from.
+    mmap_mode : str
+        Memory-map mode passed to numpy.load. Optional. Default is 'r' (read only). Use None to
+        read the arrays into memory.
+
+    Returns
+    -------
+
+    list of BooleanTimeSeries
+        The saved time series.
+    """
+    with open(os.path.join(path, _METADATA_FILE)) as f:
+        metadata = json.load(f)
+
+    if metadata.get("format") != FORMAT_NAME:
+        raise ValueError("{} does not contain saved Boolean time series.".format(path))
+    if metadata.get("version") != FORMAT_VERSION:
+        raise ValueError("Unsupported Boolean time series format version: {}".format(
+            metadata.get("version")))
+
+    times = np.load(os.path.join(path, _TIMES_FILE), mmap_mode=mmap_mode)
+    states = np.load(os.path.join(path, _STATES_FILE), mmap_mode=mmap_mode)
+    offsets = np.load(os.path.join(path, _OFFSETS_FILE))
+    ends = np.load(os.path.join(path, _ENDS_FILE))
+
+    result = []
+    for i, (label, style) in enumerate(zip(metadata["labels"], metadata["styles"])):
+        result.append(BooleanTimeSeries.from_trusted_arrays(
+            times[offsets[i]:offsets[i+1]], states[offsets[i]:offsets[i+1]], ends[i].item(),
+            label=label, style=style))
+
+    return result
@@ -0,0 +1,77 @@
+import unittest
+from pybde import BDESolver, BooleanTimeSeries
+from pybde import find_attractors, random_histories
+from pybde.attractors import FIXED_POINT, PERIODIC
+
+
+def oscillator(z):
+    return [z[0][1], not z[1][0]]
+
+
+def bistable(z):
+    return [z[0][0] and z[1][0]]
+
+
+def shifted_history(solver_result, start, length):
+    history = []
+    for bts in solver_result:
+        cut = bts.cut(start, start + length)
+        history.append(BooleanTimeSeries([t - start for t in cut.t], cut.y, length))
+    return history
+
+
+class TestAttractors(unittest.TestCase):
+
+    def test_fixed_points(self):
+        histories = [[BooleanTimeSeries([0], [True], 1)],
+                     [BooleanTimeSeries([0], [False], 1)],
+                     [BooleanTimeSeries([0, 0.5], [True, False], 1)]]
+        result = find_attractors(bistable, [1, 0.3], histories, 20, max_workers=1)
+
+        self.assertEqual(2, len(result.attractors))
+        for attractor in result.attractors:
+            self.assertEqual(FIXED_POINT, attractor.kind)
+        self.assertEqual([[True]], result.attractors[0].y)
+        self.assertEqual([[False]], result.attractors[1].y)
+        self.assertEqual(result.assignments[1], result.assignments[2])
+        self.assertEqual({result.attractors[0].key: 1/3, result.attractors[1].key: 2/3},
+                         result.basin_fractions())
+
+    def test_periodic_orbit_reached_at_different_phases(self):
+        history = [BooleanTimeSeries([0], [True], 1), BooleanTimeSeries([0], [False], 1)]
+        trajectory = BDESolver(oscillator, [1, 0.5], history).solve(20)
+        histories = [history, shifted_history(trajectory, 10.25, 1),
+                     shifted_history(trajectory, 11.75, 1)]
+
+        result = find_attractors(oscillator, [1, 0.5], histories, 50, max_workers=1)
+
+        self.assertEqual(1, len(result.attractors))
+        [attractor] = result.attractors
+        self.assertEqual(PERIODIC, attractor.kind)
+        self.assertAlmostEqual(3, attractor.period)
+        self.assertEqual(4, len(attractor.t))
+        self.assertEqual([0, 1, 2], attractor.members)
+
+    def test_known_attractor_stops_early(self):
+        history = [BooleanTimeSeries([0], [True], 1), BooleanTimeSeries([0], [False], 1)]
+        result = find_attractors(oscillator, [1, 0.5], [history, history], 50, chunk=1,
+                                 max_workers=1)
+
+        self.assertLess(result.end_times[1], result.end_times[0])
+        self.assertEqual(result.assignments[0], result.assignments[1])
+
+    def test_unresolved(self):
+        history = [BooleanTimeSeries([0], [True], 1), BooleanTimeSeries([0], [False], 1)]
+        result = find_attractors(oscillator, [1, 0.5], [history], 2, max_workers=1)
+
+        self.assertEqual([None], result.assignments)
+        self.assertEqual([0], result.unresolved)
+        self.assertEqual([], result.attractors)
+        self.assertEqual([3], result.end_times)
+
+    def test_parallel_matches_serial(self):
+        histories = random_histories(2, 1, 20, seed=4)
+        serial = find_attractors(oscillator, [1, 0.5], histories, 30, max_workers=1)
+        parallel = find_attractors(oscillator, [1, 0.5], histories, 30, max_workers=2)
+
+        self.assertEqual(serial.assignments, parallel.assignments)
@@ -1,6 +1,9 @@
+import csv
+import io
 import unittest
-from pybde import BDESolver
-from pybde import BooleanTimeSeries
+from concurrent.futures import ThreadPoolExecutor
+from pybde import BDESolver, CancellationToken, SwitchExplosionError, SolveResult
+from pybde import BooleanTimeSeries, RandomNetwork
 
 class TestBDESolver(unittest.TestCase):
 
@@ -373,6 +376,433 @@ class TestBDESolver(unittest.TestCase):
         with self.assertRaises(ValueError):
             BDESolver(lambda z: [z[0][1], not z[1][0]], delays, [history])
 
+    def test_print_result_writes_to_file(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [not z[0][0], z[0][0]], [1], [history, history])
+        solver.solve(3)
+
+        output = io.StringIO()
+        solver.print_result(file=output)
+
+        self.assertEqual("    0.00 ->     1.00 : F F \n"
+                         "    1.00 ->     2.00 : T F \n"
+                         "    2.00 ->     3.00 : F T \n"
+                         "    3.00 ->     3.00 : T F \n", output.getvalue())
+
+    def test_export_result_csv(self):
+        history_a = BooleanTimeSeries([0], [False], 1, label="a")
+        history_b = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [not z[0][0], z[0][0]], [1], [history_a, history_b])
+        solver.solve(2.5)
+
+        output = io.StringIO()
+        solver.export_result(output, fmt="csv", chunk_size=2)
+
+        self.assertEqual("start,end,a,x1\n"
+                         "0.0,1.0,0,0\n"
+                         "1.0,2.0,1,0\n"
+                         "2.0,2.5,0,1\n", output.getvalue())
+
+    def test_export_result_csv_quotes_labels(self):
+        history_a = BooleanTimeSeries([0], [False], 1, label="a, b")
+        history_b = BooleanTimeSeries([0], [False], 1, label='say "hi"')
+        solver = BDESolver(lambda z: [not z[0][0], z[0][0]], [1], [history_a, history_b])
+        solver.solve(2.5)
+
+        output = io.StringIO()
+        solver.export_result(output, fmt="csv")
+
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(["start", "end", "a, b", 'say "hi"'], rows[0])
+        self.assertEqual(["0.0", "1.0", "0", "0"], rows[1])
+
+    def test_export_result_unknown_format(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+        solver.solve(3)
+
+        with self.assertRaises(ValueError):
+            solver.export_result(io.StringIO(), fmt="xml")
+
+    def test_resolve_with_new_delays(self):
+        delays = [1, 0.5]
+        history_a = BooleanTimeSeries([0, 1.5], [True, False], 1.8)
+        history_b = BooleanTimeSeries([0, 0.5], [True, False], 1.8)
+        model = lambda z: [z[0][1], not z[1][0]]
+
+        solver = BDESolver(model, delays, [history_a, history_b])
+        solver.solve(20)
+
+        new_delays = [1, 0.7]
+        resolved = solver.resolve(new_delays)
+        expected = BDESolver(model, new_delays, [history_a, history_b]).solve(20)
+
+        self.assertEqual(new_delays, solver.delays)
+        for output, expected_output in zip(resolved, expected):
+            self.assertEqual(expected_output.t, output.t)
+            self.assertEqual(expected_output.y, output.y)
+            self.assertEqual(20, output.end)
+
+    def test_resolve_with_new_end(self):
+        history = BooleanTimeSeries([0], [False], 1)
+
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+        solver.solve(3)
+
+        [extended] = solver.resolve(end=5.5)
+        self.assertEqual([0, 1, 2, 3, 4, 5], extended.t)
+        self.assertEqual([False, True, False, True, False, True], extended.y)
+        self.assertEqual(5.5, extended.end)
+
+        [shortened] = solver.resolve(end=2.5)
+        self.assertEqual([0, 1, 2], shortened.t)
+        self.assertEqual([False, True, False], shortened.y)
+        self.assertEqual(2.5, shortened.end)
+
+    def test_resolve_before_solve(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+
+        with self.assertRaises(ValueError):
+            solver.resolve([0.5])
+
+    def test_resolve_with_different_number_of_delays(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+        solver.solve(3)
+
+        with self.assertRaises(ValueError):
+            solver.resolve([0.5, 1])
+
+    def test_debug_logging(self):
+        history = BooleanTimeSeries([0, 0.3], [False, True], 1)
+        expected = BDESolver(lambda z: [not z[0][0]], [1], [history]).solve(5)
+
+        with self.assertLogs("pybde.bde_solver", level="DEBUG") as logs:
+            actual = BDESolver(lambda z: [not z[0][0]], [1], [history]).solve(5)
+
+        self.assertEqual(expected[0].t, actual[0].t)
+        self.assertEqual(expected[0].y, actual[0].y)
+        self.assertTrue(any("New state at t=" in line for line in logs.output))
+        self.assertTrue(any("Adding CSP" in line for line in logs.output))
+
+    def test_stats_disabled_by_default(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+        solver.solve(3)
+
+        self.assertIsNone(solver.stats)
+
+    def test_stats(self):
+        history_a = BooleanTimeSeries([0], [True], 1)
+        history_b = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [z[0][1], not z[1][0]], [1, 0.5], [history_a, history_b],
+                           collect_stats=True)
+        result = solver.solve(20)
+
+        stats = solver.stats
+        self.assertEqual(sum(len(bts.t) - 1 for bts in result), stats.state_changes)
+        self.assertGreater(stats.model_evaluations, stats.state_changes)
+        self.assertGreaterEqual(stats.candidates_popped,
+                                stats.model_evaluations + stats.ties_coalesced)
+        self.assertGreater(stats.heap_high_water, 0)
+        self.assertGreater(stats.total_time, 0)
+        self.assertLessEqual(stats.model_time + stats.heap_time + stats.results_time,
+                             stats.total_time)
+        self.assertIn("model evaluations", str(stats))
+
+        # Statistics are for the latest run only
+        solver.resolve(end=21)
+        self.assertIs(stats, solver.stats)
+        self.assertLess(stats.model_evaluations, 10)
+
+    def test_stats_do_not_change_result(self):
+        history = BooleanTimeSeries([0, 0.3], [False, True], 1)
+        expected = BDESolver(lambda z: [not z[0][0]], [1], [history]).solve(10)
+        actual = BDESolver(lambda z: [not z[0][0]], [1], [history], collect_stats=True).solve(10)
+
+        self.assertEqual(expected[0].t, actual[0].t)
+        self.assertEqual(expected[0].y, actual[0].y)
+
+    def test_memory_report_disabled_by_default(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+        solver.solve(3)
+
+        self.assertIsNone(solver.memory_report)
+
+    def test_memory_report(self):
+        history_a = BooleanTimeSeries([0], [True], 1)
+        history_b = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [z[0][1], not z[1][0]], [1, 0.5], [history_a, history_b],
+                           profile_memory=10)
+        solver.solve(20)
+
+        report = solver.memory_report
+        self.assertTrue(2 <= len(report.samples) <= 11)
+        times = [sample.t for sample in report.samples]
+        self.assertEqual(sorted(times), times)
+        self.assertEqual(1, times[0])
+        self.assertEqual(20, report.final.t)
+        self.assertEqual(len(solver.res_t), report.final.result_rows)
+        self.assertEqual(0, report.final.heap_entries)
+        self.assertGreater(report.final.result_bytes, 0)
+        self.assertGreater(report.peak_heap_entries, 0)
+        self.assertGreater(report.peak_live_rows, 0)
+        self.assertGreater(report.results_bytes, 0)
+        self.assertGreater(report.traced_peak, 0)
+        self.assertGreater(report.traced_results_peak, 0)
+        self.assertIn("result rows", str(report))
+
+        # The report is for the latest run only
+        solver.resolve(end=21)
+        self.assertIs(report, solver.memory_report)
+        self.assertEqual(21, report.final.t)
+        self.assertLess(report.samples[0].t, 21)
+        self.assertGreater(report.samples[0].t, 19)
+
+    def test_memory_report_does_not_change_result(self):
+        history = BooleanTimeSeries([0, 0.3], [False, True], 1)
+        expected = BDESolver(lambda z: [not z[0][0]], [1], [history]).solve(10)
+        actual = BDESolver(lambda z: [not z[0][0]], [1], [history], profile_memory=True,
+                           collect_stats=True).solve(10)
+
+        self.assertEqual(expected[0].t, actual[0].t)
+        self.assertEqual(expected[0].y, actual[0].y)
+
+    def test_progress_by_simulated_time(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+        calls = []
+        solver.solve(10.5, progress=lambda *args: calls.append(args), progress_interval=None,
+                     progress_step=3)
+
+        self.assertEqual([1, 4, 7, 10, 10.5], [t for t, _, _ in calls])
+        self.assertEqual([0, 3, 6, 9, 10], [switches for _, switches, _ in calls])
+        self.assertEqual(0, calls[-1][2])
+
+    def test_progress_by_wall_time(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+        calls = []
+        solver.solve(5, progress=lambda *args: calls.append(args), progress_interval=0)
+
+        # Every candidate switch point and the end
+        self.assertEqual([1, 2, 3, 4, 5, 5], [t for t, _, _ in calls])
+
+    def test_cancel(self):
+        history_a = BooleanTimeSeries([0], [True], 1)
+        history_b = BooleanTimeSeries([0], [False], 1)
+        expected = BDESolver(lambda z: [z[0][1], not z[1][0]], [1, 0.5],
+                             [history_a, history_b]).solve(20)
+
+        token = CancellationToken()
+
+        def progress(t, switches, heap_size):
+            if t >= 8:
+                token.cancel()
+
+        solver = BDESolver(lambda z: [z[0][1], not z[1][0]], [1, 0.5], [history_a, history_b])
+        partial = solver.solve(20, progress=progress, progress_interval=0, cancel=token)
+
+        self.assertTrue(solver.cancelled)
+        self.assertTrue(8 < solver.end_t < 20)
+        for e, p in zip(expected, partial):
+            self.assertEqual(solver.end_t, p.end)
+            self.assertEqual([t for t in e.t if t < solver.end_t], p.t)
+            self.assertEqual(e.y[:len(p.y)], p.y)
+
+        # The simulation can be continued
+        result = solver.resolve(end=20)
+        self.assertFalse(solver.cancelled)
+        for e, r in zip(expected, result):
+            self.assertEqual(e.t, r.t)
+            self.assertEqual(e.y, r.y)
+
+    def test_hooks_use_the_finder_of_the_run(self):
+        # Statistics use a finder subclass, monitoring must not bypass it
+        history = BooleanTimeSeries([0, 0.3], [False, True], 1)
+        plain = BDESolver(lambda z: [not z[0][0]], [1], [history], collect_stats=True)
+        expected = plain.solve(10)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history], collect_stats=True,
+                           profile_memory=10, max_switches=1000)
+        result = solver.solve(10, progress=lambda t, switches, heap_size: None)
+
+        self.assertEqual(expected[0].t, result[0].t)
+        self.assertEqual(plain.stats.candidates_popped, solver.stats.candidates_popped)
+        self.assertEqual(10, solver.memory_report.final.t)
+
+    def test_cancel_before_start(self):
+        token = CancellationToken()
+        token.cancel()
+        history = BooleanTimeSeries([0, 0.5], [False, True], 1)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+        result = solver.solve(10, cancel=token)
+
+        self.assertTrue(solver.cancelled)
+        self.assertEqual(1, solver.end_t)
+        self.assertEqual([0, 0.5], result[0].t)
+        self.assertEqual(1, result[0].end)
+
+    def explosive_solver(self, **budgets):
+        # Each switch spawns two candidates 0.001 apart so the switch density doubles each unit
+        history = BooleanTimeSeries([0, 0.5], [False, True], 1)
+        return BDESolver(lambda z: [z[0][0] != z[1][0]], [1, 0.999], [history], **budgets)
+
+    def test_max_switches(self):
+        solver = self.explosive_solver(max_switches=100)
+        with self.assertRaises(SwitchExplosionError) as context:
+            solver.solve(100)
+
+        error = context.exception
+        self.assertIsInstance(error, RuntimeError)
+        self.assertEqual("max_switches", error.budget)
+        self.assertEqual(100, error.limit)
+        self.assertEqual(101, error.value)
+        self.assertEqual(101, error.switches)
+        self.assertTrue(1 < error.t < 100)
+        self.assertEqual([(0, error.densest_count)], error.busiest_variables)
+        self.assertAlmostEqual(1, error.densest_window[1] - error.densest_window[0])
+        self.assertIn("max_switches", str(error))
+
+        # The solver holds the results up to the time the run stopped
+        self.assertEqual(error.t, solver.end_t)
+        self.assertEqual(error.t, error.results[0].end)
+        self.assertEqual(len(solver.t) + 101, len(solver.res_t))
+        self.assertFalse(solver.cancelled)
+
+    def test_max_heap_size(self):
+        solver = self.explosive_solver(max_heap_size=50)
+        with self.assertRaises(SwitchExplosionError) as context:
+            solver.solve(100)
+
+        self.assertEqual("max_heap_size", context.exception.budget)
+        self.assertEqual(51, context.exception.value)
+        self.assertEqual(51, context.exception.heap_size)
+
+    def test_max_switch_rate(self):
+        solver = self.explosive_solver(max_switch_rate=20, rate_window=0.5)
+        with self.assertRaises(SwitchExplosionError) as context:
+            solver.solve(100)
+
+        error = context.exception
+        self.assertEqual("max_switch_rate", error.budget)
+        self.assertGreater(error.value, 20)
+        self.assertAlmostEqual(0.5, error.densest_window[1] - error.densest_window[0])
+        self.assertGreaterEqual(error.densest_count, 10)
+
+    def test_budgets_not_exceeded(self):
+        history_a = BooleanTimeSeries([0], [True], 1)
+        history_b = BooleanTimeSeries([0], [False], 1)
+        expected = BDESolver(lambda z: [z[0][1], not z[1][0]], [1, 0.5],
+                             [history_a, history_b]).solve(20)
+        actual = BDESolver(lambda z: [z[0][1], not z[1][0]], [1, 0.5], [history_a, history_b],
+                           max_switches=100, max_heap_size=100, max_switch_rate=10).solve(20)
+
+        for e, a in zip(expected, actual):
+            self.assertEqual(e.t, a.t)
+            self.assertEqual(e.y, a.y)
+
+    def test_invalid_budget(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        with self.assertRaises(ValueError):
+            BDESolver(lambda z: [not z[0][0]], [1], [history], max_switches=0)
+        with self.assertRaises(ValueError):
+            BDESolver(lambda z: [not z[0][0]], [1], [history], rate_window=-1)
+
+    def test_run_does_not_change_solver(self):
+        history_a = BooleanTimeSeries([0], [True], 1)
+        history_b = BooleanTimeSeries([0], [False], 1)
+        expected = BDESolver(lambda z: [z[0][1], not z[1][0]], [1, 0.5],
+                             [history_a, history_b]).solve(20)
+        solver = BDESolver(lambda z: [z[0][1], not z[1][0]], [1, 0.5], [history_a, history_b],
+                           collect_stats=True)
+        stats = solver.stats
+        t, y = list(solver.t), list(solver.y)
+        result = solver.run(20)
+
+        self.assertIsInstance(result, SolveResult)
+        for e, r in zip(expected, result.results):
+            self.assertEqual(e.t, r.t)
+            self.assertEqual(e.y, r.y)
+        self.assertEqual(20, result.end_t)
+        self.assertEqual([1, 0.5], result.delays)
+        self.assertFalse(result.cancelled)
+        self.assertIsNone(result.stopped_by)
+        self.assertGreater(result.stats.model_evaluations, 0)
+
+        self.assertIsNone(solver.results)
+        self.assertIsNone(solver.res_t)
+        self.assertIsNone(solver.end_t)
+        self.assertIs(stats, solver.stats)
+        self.assertEqual(0, stats.model_evaluations)
+        self.assertEqual(t, solver.t)
+        self.assertEqual(y, solver.y)
+
+    def test_run_with_delays(self):
+        history = BooleanTimeSeries([0, 0.3], [False, True], 2)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+        expected = BDESolver(lambda z: [not z[0][0]], [1.5], [history]).solve(10)
+        result = solver.run(10, delays=[1.5])
+
+        self.assertEqual(expected[0].t, result.results[0].t)
+        self.assertEqual([1], solver.delays)
+        with self.assertRaises(ValueError):
+            solver.run(10, delays=[3])
+
+    def test_run_rejects_memory_profiling(self):
+        history = BooleanTimeSeries([0, 0.3], [False, True], 2)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history], profile_memory=True)
+        with self.assertRaises(ValueError):
+            solver.run(10)
+
+    def test_run_cancelled(self):
+        token = CancellationToken()
+        token.cancel()
+        history = BooleanTimeSeries([0, 0.5], [False, True], 1)
+        solver = BDESolver(lambda z: [not z[0][0]], [1], [history])
+        result = solver.run(10, cancel=token)
+
+        self.assertTrue(result.cancelled)
+        self.assertEqual(1, result.end_t)
+        self.assertFalse(solver.cancelled)
+
+    def test_concurrent_runs(self):
+        network = RandomNetwork(30, n_forcing_inputs=2, seed=7)
+        forcing_inputs = network.forcing_inputs(40, seed=8)
+        history = network.history(length=3, seed=9)
+        solver = BDESolver(network, network.delays, history, forcing_inputs)
+        all_delays = [[d * (1 + 0.05 * i) for d in network.delays] for i in range(8)]
+        expected = []
+        for delays in all_delays:
+            expected.append(BDESolver(network, delays, history, forcing_inputs).solve(40))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda d: solver.run(40, delays=d), all_delays))
+
+        for e, r in zip(expected, results):
+            for e_bts, r_bts in zip(e, r.results):
+                self.assertEqual(e_bts.t, r_bts.t)
+                self.assertEqual(e_bts.y, r_bts.y)
+        self.assertIsNone(solver.res_t)
+
+    def test_plot_result_does_not_change_results(self):
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+        except ImportError:
+            self.skipTest("matplotlib is not installed")
+        history = BooleanTimeSeries([0], [False], 1, label="x")
+        forcing_input = BooleanTimeSeries([0, 2], [False, True], 5, label="input")
+        solver = BDESolver(lambda z, z2: [z2[0][0]], [1], [history], [forcing_input])
+        results = solver.solve(5)
+        solver.plot_result()
+        plt.close("all")
+
+        self.assertEqual(1, len(solver.results))
+        self.assertEqual(1, len(results))
+
 
 if __name__ == '__main__':
     unittest.main()
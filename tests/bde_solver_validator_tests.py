@@ -1,6 +1,14 @@
+import random
 import unittest
+import numpy as np
 from pybde import BooleanTimeSeries, BDESolver
 from pybde import bde_solver_validator
+from pybde import validate_many
+
+
+def two_variable_model(z):
+    return [z[0][1], not z[1][0]]
+
 
 class TestBDESolverValidator(unittest.TestCase):
 
@@ -71,4 +79,138 @@ class TestBDESolverValidator(unittest.TestCase):
 
         self.assertEqual(0, validator.validate(1.7, x_end))
 
+    def test_invalid_result(self):
+
+        history = BooleanTimeSeries([0], [False], 1)
+        result = [BooleanTimeSeries([0, 1, 2.5], [False, True, False], 3)]
+
+        validator = bde_solver_validator.BDESolverValidator(lambda z : [not z[0][0]], [1], result)
+
+        self.assertAlmostEqual(0.5, validator.validate(1, 3))
+
+    def test_vectorized_model_function(self):
+
+        tau1 = 1
+        tau2 = 0.5
+        delays = [tau1, tau2]
+
+        history_a = BooleanTimeSeries([0, 1.5], [True, False], 1.8)
+        history_b = BooleanTimeSeries([0, 0.5], [True, False], 1.8)
+
+        x_end = 50
+
+        solver = BDESolver(lambda z:[z[0][1], not z[1][0]], delays, [history_a, history_b])
+        result = solver.solve(x_end)
+
+        validator = bde_solver_validator.BDESolverValidator(
+            lambda z:[z[0][1], ~z[1][0]], delays, result, vectorized=True)
+
+        self.assertEqual(0, validator.validate(1.8, x_end))
+
+    def test_seeded_validation_is_reproducible(self):
+
+        history = BooleanTimeSeries([0], [False], 1)
+        result = [BooleanTimeSeries([0, 1, 2.5], [False, True, False], 20)]
+
+        validator = bde_solver_validator.BDESolverValidator(lambda z : [not z[0][0]], [1], result)
+
+        accuracy = validator.validate(1, 20, n_random=50, seed=3, refinement_rounds=2)
+        evaluations = validator.evaluations
+
+        self.assertEqual(accuracy, validator.validate(
+            1, 20, n_random=50, seed=3, refinement_rounds=2))
+        self.assertEqual(evaluations, validator.evaluations)
+
+    def test_evaluation_budget(self):
+
+        history = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z : [not z[0][0]], [1], [history])
+        result = solver.solve(10)
+
+        validator = bde_solver_validator.BDESolverValidator(lambda z : [not z[0][0]], [1], result)
+
+        self.assertEqual(0, validator.validate(1, 10, n_random=0))
+        switch_point_evaluations = validator.evaluations
+
+        self.assertEqual(0, validator.validate(
+            1, 10, seed=1, max_evaluations=switch_point_evaluations + 10,
+            refinement_rounds=5))
+        self.assertLessEqual(validator.evaluations, switch_point_evaluations + 10)
+
+    def test_evaluation_budget_includes_derived_times(self):
+
+        history = BooleanTimeSeries([0, 0.3, 0.6], [False, True, False], 1)
+        solver = BDESolver(lambda z : [not z[0][0]], [1], [history])
+        result = solver.solve(30)
+
+        # Switches found among the new times add derived times, which count towards the budget
+        validator = bde_solver_validator.BDESolverValidator(lambda z : [not z[0][0]], [1], result)
+        validator._add_candidate_times(
+            np.empty(0), np.empty((0, 1), dtype=bool), np.linspace(1, 30, 50), 1, 30,
+            max_evaluations=60)
+        self.assertEqual(60, validator.evaluations)
+
+    def test_seed_from_random_module(self):
+
+        history = BooleanTimeSeries([0], [False], 1)
+        solver = BDESolver(lambda z : [not z[0][0]], [1], [history])
+        result = solver.solve(20)
+
+        validator = bde_solver_validator.BDESolverValidator(
+            lambda z : [not z[0][0]], [0.7], result)
+        random.seed(4)
+        accuracy = validator.validate(1, 20, n_random=50)
+        random.seed(4)
+        self.assertEqual(accuracy, validator.validate(1, 20, n_random=50))
+
+    def test_stop_when_discrepancy_exceeded(self):
+
+        history = BooleanTimeSeries([0], [False], 1)
+        result = [BooleanTimeSeries([0, 1, 2.5], [False, True, False], 10)]
+
+        validator = bde_solver_validator.BDESolverValidator(lambda z : [not z[0][0]], [1], result)
+
+        self.assertLess(0, validator.validate(1, 10, n_random=0))
+        switch_point_evaluations = validator.evaluations
+
+        self.assertLess(0, validator.validate(
+            1, 10, seed=1, refinement_rounds=5, max_discrepancy=0.1))
+        self.assertEqual(switch_point_evaluations, validator.evaluations)
+
+    def test_refinement_adds_evaluations(self):
+
+        history = BooleanTimeSeries([0], [False], 1)
+        result = [BooleanTimeSeries([0, 1, 2.5], [False, True, False], 10)]
+
+        validator = bde_solver_validator.BDESolverValidator(lambda z : [not z[0][0]], [1], result)
+
+        accuracy = validator.validate(1, 10, n_random=0)
+        switch_point_evaluations = validator.evaluations
+
+        self.assertAlmostEqual(accuracy, validator.validate(
+            1, 10, n_random=0, seed=1, refinement_rounds=2, refinement_points=20))
+        self.assertLess(switch_point_evaluations, validator.evaluations)
+
+    def test_validate_many(self):
+
+        delays = [1, 0.5]
+        history_a = BooleanTimeSeries([0, 1.5], [True, False], 1.8)
+        history_b = BooleanTimeSeries([0, 0.5], [True, False], 1.8)
+
+        result = BDESolver(two_variable_model, delays, [history_a, history_b]).solve(10)
+        broken = [result[0], BooleanTimeSeries([0], [True], 10)]
+
+        members = [(delays, result, None), (delays, broken, None), (delays, result, None)]
+
+        for max_workers in [1, 2]:
+            ensemble = validate_many(two_variable_model, members, 1.8, 10,
+                                     max_workers=max_workers, seed=5)
+
+            self.assertEqual(3, len(ensemble.accuracies))
+            self.assertEqual(0, ensemble.accuracies[0])
+            self.assertLess(0, ensemble.accuracies[1])
+            self.assertEqual([1], ensemble.invalid_members())
+            self.assertAlmostEqual(2 / 3, ensemble.fraction_valid())
+            self.assertEqual(ensemble.accuracies[1], ensemble.max())
+            self.assertEqual(ensemble.evaluations[0], ensemble.evaluations[2])
 
@@ -20,6 +20,20 @@ class TestBooleanTimeSeries(unittest.TestCase):
         sp = BooleanTimeSeries([0, 1, 2, 3], [True], 10)
         self.assertEqual([True, False, True, False], sp.y)
 
+    def test_pad_out_states_from_numpy_arrays(self):
+        sp = BooleanTimeSeries(np.array([0, 1, 2, 3]), np.array([True]), 10)
+        self.assertEqual([True, False, True, False], sp.y)
+
+    def test_from_trusted_arrays_does_not_validate(self):
+        t = [0, 1, 2]
+        y = [True, False, True]
+        sp = BooleanTimeSeries.from_trusted_arrays(t, y, 3, label="x", style="r-")
+        self.assertIs(t, sp.t)
+        self.assertIs(y, sp.y)
+        self.assertEqual(3, sp.end)
+        self.assertEqual("x", sp.label)
+        self.assertEqual("r-", sp.style)
+
     def test_basic_cut(self):
         sp = BooleanTimeSeries([0, 1, 4], [True], 10)
         sp = sp.cut(0, 3)
@@ -100,6 +114,15 @@ class TestBooleanTimeSeries(unittest.TestCase):
         self.assertEqual([True, False, True, False], sp.y)
         self.assertEqual(10, sp.end)
 
+    def test_compress_keeps_first_point(self):
+        sp = BooleanTimeSeries([0, 1, 2], [False, False, False], 3).compress()
+        self.assertEqual([0], sp.t)
+        self.assertEqual([False], sp.y)
+
+        sp = BooleanTimeSeries([0], [True], 3).compress()
+        self.assertEqual([0], sp.t)
+        self.assertEqual([True], sp.y)
+
     def test_basic_merge(self):
         in1 = BooleanTimeSeries([0, 1, 2, 3], [True, False, True, False], 4)
         in2 = BooleanTimeSeries([0, 1, 2.5, 3], [True, False, True, False], 4)
@@ -130,6 +153,21 @@ class TestBooleanTimeSeries(unittest.TestCase):
         self.assertEqual([True, False, True, False], out2.y)
         self.assertEqual(4, out2.end)
 
+    def test_unmerge_numpy_arrays_removes_redundant_points(self):
+
+        t = np.array([0, 1, 2, 2.5, 3])
+        y = np.array([[True, False], [True, True], [False, True], [False, True], [False, False]])
+
+        [out1, out2] = BooleanTimeSeries.unmerge(t, y, 4)
+
+        self.assertEqual([0, 2], out1.t)
+        self.assertEqual([True, False], out1.y)
+        self.assertEqual(4, out1.end)
+
+        self.assertEqual([0, 1, 3], out2.t)
+        self.assertEqual([False, True, False], out2.y)
+        self.assertEqual(4, out2.end)
+
     def test_hamming_distance_to_self_is_zero(self):
         sp = BooleanTimeSeries([0, 1, 2, 3], [True, False, True, False], 4)
         self.assertEqual(0, sp.hamming_distance(sp))
@@ -281,4 +319,79 @@ class TestBooleanTimeSeries(unittest.TestCase):
 
         self.assertEqual(True, bts.get_state(1.5))
 
+    def test_to_plot_data(self):
+        bts = BooleanTimeSeries([0, 1, 2], [True, False, True], 3)
+        plot_t, plot_y = bts.to_plot_data(offset=0.5)
+
+        self.assertEqual([0, 1, 1, 2, 2, 3], plot_t)
+        self.assertEqual([1.5, 1.5, 0.5, 0.5, 1.5, 1.5], plot_y)
+
+    def test_to_plot_data_switch_on_end(self):
+        bts = BooleanTimeSeries([0, 1, 2], [True, False, True], 2)
+        plot_t, plot_y = bts.to_plot_data()
+
+        self.assertEqual([0, 1, 1, 2, 2], plot_t)
+        self.assertEqual([1, 1, 0, 0, 1], plot_y)
+
+    def test_decimated_plot_data_without_dense_switches(self):
+        bts = BooleanTimeSeries([0, 1, 2], [True, False, True], 3)
+        plot_t, plot_y, regions = bts.to_decimated_plot_data(3)
+
+        self.assertEqual([0, 1, 1, 2, 2, 3], plot_t.tolist())
+        self.assertEqual([1, 1, 0, 0, 1, 1], plot_y.tolist())
+        self.assertEqual([], regions)
+
+    def test_decimated_plot_data_merges_dense_switches(self):
+        bts = BooleanTimeSeries([0, 1, 4.1, 4.2, 4.3, 5.2, 5.4, 8], [True], 10)
+        plot_t, plot_y, regions = bts.to_decimated_plot_data(10)
+
+        self.assertEqual([(4.0, 6.0)], regions)
+        self.assertEqual([0, 1, 1, 6, 6, 8, 8, 10], plot_t.tolist())
+        self.assertEqual([1, 1, 0, 0, 1, 1, 0, 0], plot_y.tolist())
+
+    def test_decimated_plot_data_visible_range(self):
+        bts = BooleanTimeSeries([0, 1, 2, 3, 4], [True], 5)
+        plot_t, plot_y, regions = bts.to_decimated_plot_data(2, x_range=(1.5, 3.5))
+
+        self.assertEqual([1.5, 2, 2, 3, 3, 3.5], plot_t.tolist())
+        self.assertEqual([0, 0, 1, 1, 0, 0], plot_y.tolist())
+        self.assertEqual([], regions)
+
+    def test_decimated_plot_data_switch_at_region_end(self):
+        bts = BooleanTimeSeries([0, 4.1, 4.2, 4.3, 5.0], [False], 10)
+        plot_t, plot_y, regions = bts.to_decimated_plot_data(10)
+
+        self.assertEqual([(4.0, 5.0)], regions)
+        self.assertEqual([0, 5, 5, 10], plot_t.tolist())
+        self.assertEqual([0, 0, 0, 0], plot_y.tolist())
+
+    def test_plot_visible_range(self):
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+        except ImportError:
+            self.skipTest("matplotlib is not installed")
+        bts = BooleanTimeSeries([0, 1, 2, 3, 4], [True], 5)
+        bts.plot(x_range=(1.5, 3.5))
+        [line] = plt.gca().lines
+        plt.close("all")
+
+        self.assertEqual([1.5, 2, 2, 3, 3, 3.5], list(line.get_xdata()))
+        self.assertEqual([0, 0, 1, 1, 0, 0], list(line.get_ydata()))
+
+    def test_get_states(self):
+        bts = BooleanTimeSeries([0, 1, 2], [False, True, False], 3)
+
+        states = bts.get_states([0, 0.5, 1, 1.5, 2 - 1e-12, 2, 3])
+
+        self.assertEqual([False, False, True, True, False, False, False], states.tolist())
+
+    def test_get_states_outside_range(self):
+        bts = BooleanTimeSeries([0, 1, 2], [False, True, False], 3)
+
+        with self.assertRaises(ValueError):
+            bts.get_states([-1, 1])
+        with self.assertRaises(ValueError):
+            bts.get_states([1, 3.5])
 
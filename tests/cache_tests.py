@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+import unittest
+from pybde import BDESolver, BooleanTimeSeries, SolveCache
+
+
+def model(z):
+    return [not z[0][0]]
+
+
+class TestSolveCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = SolveCache(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_solver(self, delay=1):
+        history = BooleanTimeSeries([0], [False], 1, label="x")
+        return BDESolver(model, [delay], [history])
+
+    def test_cached_result_matches_solve(self):
+        [expected] = self.make_solver().solve(10)
+
+        [first] = self.cache.solve(self.make_solver(), 10, "not-model-v1")
+        solver = self.make_solver()
+        [second] = self.cache.solve(solver, 10, "not-model-v1")
+
+        self.assertEqual(1, self.cache.misses)
+        self.assertEqual(1, self.cache.hits)
+        for output in [first, second]:
+            self.assertEqual(expected.t, output.t)
+            self.assertEqual(expected.y, output.y)
+            self.assertEqual(10, output.end)
+            self.assertEqual("x", output.label)
+        self.assertEqual(10, solver.end_t)
+        self.assertEqual(len(expected.t), len(solver.res_t))
+
+    def test_cache_hit_resets_previous_run(self):
+        self.cache.solve(self.make_solver(), 10, "not-model-v1")
+
+        history = BooleanTimeSeries([0], [False], 1, label="x")
+        solver = BDESolver(model, [1], [history], collect_stats=True)
+        solver.solve(10, stop=lambda t, state: t > 3)
+        self.assertIsNotNone(solver.stopped_by)
+        self.assertGreater(solver.stats.model_evaluations, 0)
+
+        self.cache.solve(solver, 10, "not-model-v1")
+        self.assertIsNone(solver.stopped_by)
+        self.assertFalse(solver.cancelled)
+        self.assertEqual(10, solver.end_t)
+        self.assertEqual(0, solver.stats.model_evaluations)
+
+    def test_key_depends_on_inputs(self):
+        key = SolveCache.key(self.make_solver(), 10, "not-model-v1")
+
+        self.assertEqual(key, SolveCache.key(self.make_solver(), 10, "not-model-v1"))
+        self.assertNotEqual(key, SolveCache.key(self.make_solver(), 11, "not-model-v1"))
+        self.assertNotEqual(key, SolveCache.key(self.make_solver(0.5), 10, "not-model-v1"))
+        self.assertNotEqual(key, SolveCache.key(self.make_solver(), 10, "not-model-v2"))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.solve(self.make_solver(), 10, "a")
+        self.cache.solve(self.make_solver(), 10, "b")
+        key_a = SolveCache.key(self.make_solver(), 10, "a")
+        key_b = SolveCache.key(self.make_solver(), 10, "b")
+
+        # Make a the most recently used result
+        old = time.time() - 100
+        os.utime(self.cache._path(key_b), (old, old))
+        self.cache.get(key_a)
+
+        self.cache.evict(os.path.getsize(self.cache._path(key_a)))
+
+        self.assertIsNotNone(self.cache.get(key_a))
+        self.assertIsNone(self.cache.get(key_b))
+
+    def test_clear(self):
+        self.cache.solve(self.make_solver(), 10, "a")
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get(SolveCache.key(self.make_solver(), 10, "a")))
+
+
+if __name__ == '__main__':
+    unittest.main()
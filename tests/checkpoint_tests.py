@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from pybde import BDESolver, BooleanTimeSeries, CancellationToken, RandomNetwork
+from pybde.checkpoint import load_checkpoint
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "run.npz")
+        self.network = RandomNetwork(20, n_forcing_inputs=2, bias=0.3, seed=3)
+        self.history = self.network.history(seed=4)
+        self.forcing_inputs = self.network.forcing_inputs(30, seed=5)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_solver(self, history=None):
+        return BDESolver(self.network, self.network.delays, history or self.history,
+                         self.forcing_inputs)
+
+    def assert_identical(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for e, a in zip(expected, actual):
+            self.assertEqual(e.t, a.t)
+            self.assertEqual(e.y, a.y)
+            self.assertEqual(e.end, a.end)
+
+    def test_resume_from_periodic_checkpoint(self):
+        expected = self.make_solver().solve(20)
+
+        # Keep a copy of the latest checkpoint when the simulation passes t=8
+        snapshot = os.path.join(self.temp_dir.name, "snapshot.npz")
+
+        def progress(t, switches, heap_size):
+            if t > 8 and os.path.exists(self.path) and not os.path.exists(snapshot):
+                shutil.copy(self.path, snapshot)
+
+        self.make_solver().solve(20, progress=progress, progress_interval=0,
+                                 checkpoint=self.path, checkpoint_interval=None,
+                                 checkpoint_step=2)
+        self.assertEqual(20, load_checkpoint(snapshot)["end"])
+        self.assertTrue(self.history[0].end < load_checkpoint(snapshot)["heap"][0][0] <= 8)
+
+        solver = self.make_solver()
+        self.assert_identical(expected, solver.resume(snapshot))
+        self.assertEqual(20, solver.end_t)
+
+    def test_resume_after_cancel(self):
+        expected = self.make_solver().solve(20)
+
+        token = CancellationToken()
+
+        def progress(t, switches, heap_size):
+            if t > 10:
+                token.cancel()
+
+        solver = self.make_solver()
+        solver.solve(20, progress=progress, progress_interval=0, cancel=token,
+                     checkpoint=self.path, checkpoint_interval=None)
+        self.assertTrue(solver.cancelled)
+        self.assertTrue(os.path.exists(self.path))
+
+        # Resumed by a new solver, e.g. in a new process
+        self.assert_identical(expected, self.make_solver().resume(self.path))
+
+    def test_checkpoint_contents(self):
+        solver = self.make_solver()
+        solver.solve(20, checkpoint=self.path, checkpoint_interval=None, checkpoint_step=5)
+        state = load_checkpoint(self.path)
+
+        self.assertEqual(self.network.delays, state["delays"])
+        self.assertEqual((1e-09, 0.0), (state["rel_tol"], state["abs_tol"]))
+        self.assertEqual(len(self.network.delays), len(state["indices"]))
+        self.assertEqual(len(self.network.delays), len(state["forced_indices"]))
+        self.assertEqual(len(solver.t), state["first_row"])
+        self.assertEqual(solver.res_t[:len(state["res_t"])], state["res_t"])
+        self.assertEqual(solver.res_y[:len(state["res_y"])], state["res_y"])
+        heap = state["heap"]
+        for i in range(1, len(heap)):
+            self.assertLessEqual(heap[(i - 1) // 2], heap[i])
+        self.assertEqual([f for f in os.listdir(self.temp_dir.name)], ["run.npz"])
+
+    def test_resume_with_different_history(self):
+        self.make_solver().solve(20, checkpoint=self.path, checkpoint_interval=None,
+                                 checkpoint_step=5)
+        other_history = self.network.history(seed=6)
+        with self.assertRaises(ValueError):
+            self.make_solver(other_history).resume(self.path)
+
+    def test_resume_with_different_tolerances(self):
+        self.make_solver().solve(20, checkpoint=self.path, checkpoint_interval=None,
+                                 checkpoint_step=5)
+        solver = BDESolver(self.network, self.network.delays, self.history,
+                           self.forcing_inputs, rel_tol=1e-6)
+        with self.assertRaises(ValueError):
+            solver.resume(self.path)
+
+    def test_not_a_checkpoint(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        with open(self.path, "wb") as f:
+            np.savez(f, t=np.zeros(1))
+        with self.assertRaises(ValueError):
+            BDESolver(lambda z: [not z[0][0]], [1], [history]).resume(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import math
+import random
+import unittest
+from pybde import BDESolver, BooleanTimeSeries
+from pybde.decomposition import strongly_connected_components
+
+
+def feed_forward(z, z2=None, variables=None):
+    # x0 <-> x1 oscillate, x2 follows x1, x3 and x4 follow x2 and each other
+    state = [z[0][1], not z[1][0], z[0][1], z[1][2] != z[0][4], z[0][3]]
+    if z2 is not None:
+        state[2] = state[2] and z2[0][0]
+    if variables is None:
+        return state
+    return [state[v] for v in variables]
+
+
+def forced_feed_forward(z1, z2, variables=None):
+    return feed_forward(z1, z2, variables)
+
+
+DEPENDENCIES = [[1], [0], [1], [2, 4], [3]]
+
+
+def make_history():
+    return [BooleanTimeSeries([0], [True], 1), BooleanTimeSeries([0, 0.3], [False, True], 1),
+            BooleanTimeSeries([0], [False], 1), BooleanTimeSeries([0, 0.6], [True, False], 1),
+            BooleanTimeSeries([0], [False], 1)]
+
+
+class TestDecomposition(unittest.TestCase):
+
+    def assert_same_results(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for e, a in zip(expected, actual):
+            e.compress()
+            a.compress()
+            self.assertEqual(e.y, a.y)
+            self.assertEqual(len(e.t), len(a.t))
+            # Switch times agree within the solver's tolerance
+            for t1, t2 in zip(e.t, a.t):
+                self.assertTrue(math.isclose(t1, t2, rel_tol=1e-09), (t1, t2))
+            self.assertEqual(e.end, a.end)
+
+    def assert_same_arrays(self, expected, actual):
+        self.assertEqual(len(expected.res_t), len(actual.res_t))
+        for t1, t2 in zip(expected.res_t, actual.res_t):
+            self.assertTrue(math.isclose(t1, t2, rel_tol=1e-09), (t1, t2))
+        self.assertEqual([list(y) for y in expected.res_y], [list(y) for y in actual.res_y])
+
+    def test_strongly_connected_components(self):
+        self.assertEqual([[0, 1], [2], [3, 4]], strongly_connected_components(DEPENDENCIES))
+        self.assertEqual([[0], [1], [2]], strongly_connected_components([[], [0], [1]]))
+        self.assertEqual([[0, 1, 2]], strongly_connected_components([[2], [0], [1]]))
+
+    def test_deep_network(self):
+        n = 5000
+        components = strongly_connected_components([[i - 1] if i else [] for i in range(n)])
+        self.assertEqual([[i] for i in range(n)], components)
+
+    def test_unknown_dependency(self):
+        with self.assertRaises(ValueError):
+            strongly_connected_components([[1]])
+
+    def test_matches_solve(self):
+        expected = BDESolver(feed_forward, [1, 0.5], make_history()).solve(12)
+        solver = BDESolver(feed_forward, [1, 0.5], make_history())
+        actual = solver.solve_decomposed(12, DEPENDENCIES, max_workers=1)
+
+        self.assert_same_results(expected, actual)
+        self.assertEqual(12, solver.end_t)
+        self.assertEqual(12, solver.res_t[-1])
+
+    def test_result_arrays_match_solve(self):
+        # The last switch is before the end time so there is no row at the end time
+        expected = BDESolver(feed_forward, [1, 0.5], make_history())
+        expected.solve(12.25)
+        actual = BDESolver(feed_forward, [1, 0.5], make_history())
+        actual.solve_decomposed(12.25, DEPENDENCIES, max_workers=1)
+
+        self.assertLess(expected.res_t[-1], 12.25)
+        self.assert_same_arrays(expected, actual)
+        self.assertEqual(12.25, actual.end_t)
+
+    def test_resets_previous_run(self):
+        solver = BDESolver(feed_forward, [1, 0.5], make_history(), collect_stats=True)
+        solver.solve(12, stop=lambda t, state: t > 3)
+        self.assertIsNotNone(solver.stopped_by)
+
+        solver.solve_decomposed(12, DEPENDENCIES, max_workers=1)
+        self.assertIsNone(solver.stopped_by)
+        self.assertFalse(solver.cancelled)
+        self.assertEqual(0, solver.stats.model_evaluations)
+
+    def test_forcing_inputs(self):
+        forcing = [BooleanTimeSeries([0, 3, 7], [True, False, True], 12)]
+        expected = BDESolver(forced_feed_forward, [1, 0.5], make_history(), forcing).solve(12)
+        actual = BDESolver(forced_feed_forward, [1, 0.5], make_history(),
+                           forcing).solve_decomposed(12, DEPENDENCIES, max_workers=1)
+
+        self.assert_same_results(expected, actual)
+
+    def test_partial_model_function_in_parallel(self):
+        expected = BDESolver(feed_forward, [1, 0.5], make_history()).solve(12)
+        actual = BDESolver(feed_forward, [1, 0.5], make_history()).solve_decomposed(
+            12, DEPENDENCIES, max_workers=2, partial=True)
+
+        self.assert_same_results(expected, actual)
+
+    def test_random_networks(self):
+        rng = random.Random(2)
+        for _ in range(30):
+            n = rng.randint(2, 7)
+            inputs = [[(rng.randrange(2), rng.randrange(n)) for _ in range(rng.randint(1, 3))]
+                      for _ in range(n)]
+            dependencies = [sorted(set(v for _, v in variable_inputs))
+                            for variable_inputs in inputs]
+
+            def model(z, inputs=inputs):
+                return [sum(z[d][v] for d, v in variable_inputs) % 2 == 1
+                        for variable_inputs in inputs]
+
+            history = [BooleanTimeSeries([0, 0.4], [False, True], 1) if rng.random() < 0.5
+                       else BooleanTimeSeries([0], [rng.random() < 0.5], 1) for _ in range(n)]
+            delays = [rng.uniform(0.2, 1), rng.uniform(0.2, 1)]
+
+            expected_solver = BDESolver(model, delays, history)
+            expected = expected_solver.solve(6)
+            actual_solver = BDESolver(model, delays, history)
+            actual = actual_solver.solve_decomposed(6, dependencies, max_workers=1)
+            self.assert_same_results(expected, actual)
+            self.assert_same_arrays(expected_solver, actual_solver)
+
+    def test_wrong_number_of_dependencies(self):
+        with self.assertRaises(ValueError):
+            BDESolver(feed_forward, [1, 0.5], make_history()).solve_decomposed(12, [[1], [0]])
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+from pybde import BDESolver, BooleanTimeSeries
+from pybde import StateFractions, SwitchCounts, DutyCycles, run_ensemble
+from pybde.ensemble import EnsembleAccumulator
+
+
+def model(z):
+    return [not z[0][0]]
+
+
+def make_members():
+    return [([delay], [BooleanTimeSeries([0], [False], 1)], None) for delay in [0.5, 1]]
+
+
+class RecordingObserver:
+
+    def __init__(self):
+        self.events = []
+
+    def on_start(self, t, state):
+        self.events.append(("start", t, state))
+
+    def on_switch(self, t, state):
+        self.events.append(("switch", t, state))
+
+    def on_end(self, t):
+        self.events.append(("end", t))
+
+
+class TestEnsemble(unittest.TestCase):
+
+    def test_observer_events(self):
+        solver = BDESolver(model, [1], [BooleanTimeSeries([0], [False], 1)])
+        observer = RecordingObserver()
+        solver.add_observer(observer)
+        solver.solve(3)
+
+        self.assertEqual([("start", 1, [False]),
+                          ("switch", 1, [True]),
+                          ("switch", 2, [False]),
+                          ("switch", 3, [True]),
+                          ("end", 3)], observer.events)
+
+    def test_state_fractions(self):
+        fractions = StateFractions([0, 1.25, 1.75, 2.25, 3, 4])
+        run_ensemble(model, make_members(), 3, [fractions], max_workers=1)
+
+        # delay 0.5 switches at 1, 1.5, 2, 2.5, 3 and delay 1 switches at 1, 2, 3
+        expected = [np.nan, 1, 0.5, 0.5, 1, np.nan]
+        np.testing.assert_array_equal(expected, fractions.fractions[:, 0])
+        self.assertEqual([0, 2, 2, 2, 2, 0], fractions.member_counts.tolist())
+        self.assertEqual(2, fractions.members)
+
+    def test_switch_counts(self):
+        counts = SwitchCounts(max_count=4)
+        run_ensemble(model, make_members(), 3, [counts], max_workers=1)
+
+        self.assertEqual([[0, 0, 0, 1, 0, 1]], counts.histogram.tolist())
+        self.assertEqual([4], counts.mean.tolist())
+        self.assertEqual([1], counts.std.tolist())
+
+    def test_duty_cycles(self):
+        duty_cycles = DutyCycles()
+        run_ensemble(model, make_members(), 3, [duty_cycles], max_workers=1)
+
+        np.testing.assert_allclose([0.5], duty_cycles.mean)
+        np.testing.assert_allclose([0], duty_cycles.std, atol=1e-12)
+
+    def test_parallel_matches_serial(self):
+        members = make_members() * 5
+        serial = [StateFractions(np.linspace(1, 3, 17)), SwitchCounts(), DutyCycles()]
+        parallel = [accumulator.empty() for accumulator in serial]
+
+        run_ensemble(model, members, 3, serial, max_workers=1)
+        run_ensemble(model, members, 3, parallel, max_workers=2)
+
+        np.testing.assert_array_equal(serial[0].fractions, parallel[0].fractions)
+        np.testing.assert_array_equal(serial[1].histogram, parallel[1].histogram)
+        np.testing.assert_allclose(serial[2].mean, parallel[2].mean)
+        for accumulator in parallel:
+            self.assertEqual(10, accumulator.members)
+
+    def test_merge_incompatible(self):
+        with self.assertRaises(ValueError):
+            StateFractions([0, 1]).merge(StateFractions([0, 2]))
+        with self.assertRaises(ValueError):
+            SwitchCounts().merge(DutyCycles())
+
+    def test_accumulator_must_implement_events(self):
+        class OnlyStart(EnsembleAccumulator):
+            def on_start(self, t, state):
+                pass
+
+        with self.assertRaises(TypeError):
+            EnsembleAccumulator()
+        with self.assertRaises(TypeError):
+            OnlyStart()
@@ -0,0 +1,106 @@
+import random
+import unittest
+from pybde import BDESolver, BooleanTimeSeries, DelayFitter, threshold_search
+
+
+def model(z):
+    return [z[0][1], not z[1][0]]
+
+
+class TestDelayFitter(unittest.TestCase):
+
+    def setUp(self):
+        self.history = [BooleanTimeSeries([0, 0.7], [True, False], 2),
+                        BooleanTimeSeries([0], [False], 2)]
+        self.target = BDESolver(model, [1, 0.5], self.history).solve(15)
+
+    def expected_distance(self, delays):
+        result = BDESolver(model, delays, self.history).solve(15)
+        return sum(r.cut(2, 15).hamming_distance(t.cut(2, 15))
+                   for r, t in zip(result, self.target))
+
+    def test_distance_matches_solve(self):
+        fitter = DelayFitter(model, self.history, self.target)
+        rng = random.Random(1)
+        for _ in range(50):
+            delays = [round(rng.uniform(0.05, 2), 6), round(rng.uniform(0.05, 2), 6)]
+            self.assertAlmostEqual(self.expected_distance(delays), fitter.distance(delays))
+        self.assertEqual(50, fitter.statistics.simulations)
+        self.assertEqual(49, fitter.statistics.prefix_reuses)
+
+    def test_distance_is_memoized(self):
+        fitter = DelayFitter(model, self.history, self.target)
+        first = fitter.distance([1.5, 0.25])
+        second = fitter.distance([1.5, 0.25])
+
+        self.assertEqual(first, second)
+        self.assertEqual(1, fitter.statistics.simulations)
+        self.assertEqual(1, fitter.statistics.memo_hits)
+
+    def test_early_rejection_is_not_reused_as_exact(self):
+        fitter = DelayFitter(model, self.history, self.target)
+        [bound] = fitter.evaluate([[2, 1.5]], bound=0)
+        self.assertEqual(1, fitter.statistics.early_rejections)
+        self.assertGreaterEqual(bound, 0)
+
+        self.assertAlmostEqual(self.expected_distance([2, 1.5]), fitter.distance([2, 1.5]))
+        self.assertEqual(2, fitter.statistics.simulations)
+
+    def test_grid_search(self):
+        fitter = DelayFitter(model, self.history, self.target)
+        values = [0.25 * i for i in range(1, 9)]
+        result = fitter.grid_search([values, values])
+
+        self.assertEqual([1, 0.5], result.delays)
+        self.assertEqual(0, result.distance)
+        self.assertEqual(64, result.statistics.simulations)
+        self.assertGreater(result.statistics.early_rejections, 0)
+
+    def test_parallel_grid_search(self):
+        values = [0.25 * i for i in range(1, 9)]
+        with DelayFitter(model, self.history, self.target, max_workers=2) as fitter:
+            result = fitter.grid_search([values, values])
+
+        self.assertEqual([1, 0.5], result.delays)
+        self.assertEqual(0, result.distance)
+
+    def test_random_search_is_reproducible(self):
+        fitter = DelayFitter(model, self.history, self.target)
+        first = fitter.random_search([(0.1, 2), (0.1, 2)], 20, seed=3)
+        second = DelayFitter(model, self.history, self.target).random_search(
+            [(0.1, 2), (0.1, 2)], 20, seed=3)
+
+        self.assertEqual(first.delays, second.delays)
+        self.assertEqual(first.distance, second.distance)
+        self.assertAlmostEqual(self.expected_distance(first.delays), first.distance)
+
+    def test_coordinate_search_improves(self):
+        fitter = DelayFitter(model, self.history, self.target)
+        result = fitter.coordinate_search([1.25, 0.75], 0.25)
+
+        self.assertLess(result.distance, self.expected_distance([1.25, 0.75]))
+        self.assertAlmostEqual(self.expected_distance(result.delays), result.distance)
+
+    def test_nelder_mead_improves(self):
+        fitter = DelayFitter(model, self.history, self.target)
+        result = fitter.nelder_mead([1.2, 0.7], 0.2)
+
+        self.assertLessEqual(result.distance, self.expected_distance([1.2, 0.7]))
+        self.assertAlmostEqual(self.expected_distance(result.delays), result.distance)
+        for delay in result.delays:
+            self.assertTrue(0 <= delay <= 2)
+
+    def test_threshold_search(self):
+        t = [i * 0.5 for i in range(31)]
+        data = [(t, [1.0 if bts.get_state(x) else 0.0 for x in t]) for bts in self.target]
+        values = [0.25 * i for i in range(1, 9)]
+
+        result = threshold_search(model, self.history, data, [0.25, 0.5],
+                                  lambda fitter: fitter.grid_search([values, values]))
+
+        self.assertIn(result.threshold, [0.25, 0.5])
+        self.assertIsNotNone(result.delays)
+
+    def test_end_must_follow_history(self):
+        with self.assertRaises(ValueError):
+            DelayFitter(model, self.history, self.target, end=1)
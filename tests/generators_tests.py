@@ -0,0 +1,131 @@
+import json
+import math
+import pickle
+import unittest
+from pybde import BDESolver, RandomNetwork
+from pybde.generators import FORCING_INPUT, VARIABLE_INPUT
+
+
+class TestRandomNetwork(unittest.TestCase):
+
+    def assert_same_results(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for e, a in zip(expected, actual):
+            e.compress()
+            a.compress()
+            self.assertEqual(e.y, a.y)
+            self.assertEqual(len(e.t), len(a.t))
+            # Switch times agree within the solver's tolerance
+            for t1, t2 in zip(e.t, a.t):
+                self.assertTrue(math.isclose(t1, t2, rel_tol=1e-09), (t1, t2))
+
+    def test_structure(self):
+        network = RandomNetwork(10, in_degree=3, n_delays=4, delay_range=(1, 2),
+                                n_forcing_inputs=2, forcing_probability=0.5, seed=1)
+
+        self.assertEqual(4, len(network.delays))
+        for d in network.delays:
+            self.assertTrue(1 <= d <= 2)
+        self.assertEqual(10, len(network.inputs))
+        kinds = set()
+        for inputs, table in zip(network.inputs, network.tables):
+            self.assertEqual(3, len(inputs))
+            self.assertEqual(8, len(table))
+            for kind, delay_index, i in inputs:
+                kinds.add(kind)
+                self.assertTrue(0 <= delay_index < 4)
+                self.assertTrue(0 <= i < (10 if kind == VARIABLE_INPUT else 2))
+        self.assertEqual({VARIABLE_INPUT, FORCING_INPUT}, kinds)
+
+    def test_same_seed_gives_same_network(self):
+        a = RandomNetwork(20, seed=3)
+        b = RandomNetwork(20, seed=3)
+        c = RandomNetwork(20, seed=4)
+        self.assertEqual(a.to_spec(), b.to_spec())
+        self.assertNotEqual(a.to_spec(), c.to_spec())
+
+    def test_given_delays(self):
+        network = RandomNetwork(3, delays=[0.5, 1], seed=0)
+        self.assertEqual([0.5, 1.0], network.delays)
+
+    def test_bias(self):
+        self.assertFalse(any(any(t) for t in RandomNetwork(10, bias=0, seed=0).tables))
+        self.assertTrue(all(all(t) for t in RandomNetwork(10, bias=1, seed=0).tables))
+
+    def test_model_function(self):
+        network = RandomNetwork(2, in_degree=0, seed=0)
+        network.inputs = [[(VARIABLE_INPUT, 0, 1), (FORCING_INPUT, 1, 0)],
+                          [(VARIABLE_INPUT, 1, 0)]]
+        network.tables = [[False, True, True, False], [True, False]]
+
+        z = [[False, True], [True, False]]
+        z2 = [[False], [False]]
+        self.assertEqual([True, False], network(z, z2))
+        self.assertEqual([False], network(z, z2, variables=[1]))
+
+    def test_dependencies(self):
+        network = RandomNetwork(2, in_degree=0, seed=0)
+        network.inputs = [[(VARIABLE_INPUT, 0, 1), (FORCING_INPUT, 1, 0), (VARIABLE_INPUT, 1, 1)],
+                          []]
+        self.assertEqual([[1], []], network.dependencies())
+
+    def test_history_and_forcing_inputs(self):
+        network = RandomNetwork(5, delays=[1, 2], n_forcing_inputs=2, seed=0)
+        history = network.history(seed=1)
+        self.assertEqual(5, len(history))
+        for bts in history:
+            self.assertEqual(2, bts.end)
+
+        forcing_inputs = network.forcing_inputs(10, seed=1)
+        self.assertEqual(2, len(forcing_inputs))
+        for bts in forcing_inputs:
+            self.assertEqual(10, bts.end)
+
+        self.assertIsNone(RandomNetwork(5, seed=0).forcing_inputs(10))
+
+    def test_spec_and_pickle_round_trip(self):
+        network = RandomNetwork(15, in_degree=3, n_forcing_inputs=2, seed=2)
+        history = network.history(seed=3)
+        forcing_inputs = network.forcing_inputs(20, seed=4)
+        expected = BDESolver(network, network.delays, history, forcing_inputs).solve(15)
+
+        from_spec = RandomNetwork.from_spec(json.loads(json.dumps(network.to_spec())))
+        self.assert_same_results(
+            expected, BDESolver(from_spec, network.delays, history, forcing_inputs).solve(15))
+
+        unpickled = pickle.loads(pickle.dumps(network))
+        self.assert_same_results(
+            expected, BDESolver(unpickled, network.delays, history, forcing_inputs).solve(15))
+
+    def test_invalid_spec(self):
+        spec = RandomNetwork(3, seed=0).to_spec()
+        with self.assertRaises(ValueError):
+            RandomNetwork.from_spec(dict(spec, format="other"))
+        with self.assertRaises(ValueError):
+            RandomNetwork.from_spec(dict(spec, version=99))
+        with self.assertRaises(ValueError):
+            RandomNetwork.from_spec(dict(spec, tables=[[True]] * 3))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            RandomNetwork(0)
+        with self.assertRaises(ValueError):
+            RandomNetwork(3, bias=1.5)
+        with self.assertRaises(ValueError):
+            RandomNetwork(3, delays=[])
+        with self.assertRaises(ValueError):
+            RandomNetwork(3, in_degree=-1)
+
+    def test_solve_decomposed_matches_solve(self):
+        network = RandomNetwork(12, in_degree=1, n_forcing_inputs=1, seed=5)
+        history = network.history(seed=6)
+        forcing_inputs = network.forcing_inputs(20, seed=7)
+        expected = BDESolver(network, network.delays, history, forcing_inputs).solve(12)
+
+        solver = BDESolver(network, network.delays, history, forcing_inputs)
+        self.assert_same_results(expected, solver.solve_decomposed(
+            12, network.dependencies(), max_workers=1, partial=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
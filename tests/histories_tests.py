@@ -0,0 +1,18 @@
+import unittest
+from pybde import random_histories
+
+
+class TestRandomHistories(unittest.TestCase):
+
+    def test_random_histories(self):
+        histories = random_histories(3, 2, 5, switch_rate=4, seed=1)
+
+        self.assertEqual(5, len(histories))
+        for history in histories:
+            self.assertEqual(3, len(history))
+            for bts in history:
+                self.assertEqual(0, bts.t[0])
+                self.assertEqual(2, bts.end)
+                self.assertLess(bts.t[-1], 2)
+        self.assertEqual([bts.t for bts in histories[0]],
+                         [bts.t for bts in random_histories(3, 2, 5, switch_rate=4, seed=1)[0]])
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+import unittest
+
+
+class TestImport(unittest.TestCase):
+
+    def test_import_does_not_load_matplotlib(self):
+        output = subprocess.check_output(
+            [sys.executable, "-c", "import sys, pybde; print('matplotlib' in sys.modules)"],
+            universal_newlines=True)
+        self.assertEqual("False", output.strip())
+
+    def test_import_does_not_load_process_pool(self):
+        output = subprocess.check_output(
+            [sys.executable, "-c",
+             "import sys, pybde; print('concurrent.futures.process' in sys.modules)"],
+            universal_newlines=True)
+        self.assertEqual("False", output.strip())
+
+
+if __name__ == '__main__':
+    unittest.main()
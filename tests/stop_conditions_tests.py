@@ -0,0 +1,151 @@
+import unittest
+from pybde import BDESolver, BooleanTimeSeries
+from pybde import StopCondition, VariableBecomes, StateMatches, Sequence
+
+
+def two_variable_model(z):
+    return [z[0][1], not z[1][0]]
+
+
+def two_variable_solver():
+    history_a = BooleanTimeSeries([0], [True], 1)
+    history_b = BooleanTimeSeries([0], [False], 1)
+    return BDESolver(two_variable_model, [1, 0.5], [history_a, history_b])
+
+
+class CountSwitches(StopCondition):
+
+    def __init__(self, n):
+        self.n = n
+        self.count = 0
+        self.started = None
+
+    def start(self, t, state):
+        self.count = 0
+        self.started = (t, state)
+
+    def __call__(self, t, state):
+        self.count += 1
+        return self.count == self.n
+
+
+class TestStopConditions(unittest.TestCase):
+
+    def setUp(self):
+        self.full = two_variable_solver().solve(20)
+
+    def switches(self, variable):
+        bts = self.full[variable]
+        return [(t, y) for t, y in zip(bts.t[1:], bts.y[1:])]
+
+    def assert_truncated(self, solver, results, end):
+        self.assertEqual(end, solver.end_t)
+        for full, result in zip(self.full, results):
+            self.assertEqual(end, result.end)
+            self.assertEqual([t for t in full.t if t <= end], result.t)
+            self.assertEqual(full.y[:len(result.y)], result.y)
+
+    def test_variable_becomes(self):
+        first_true = min(t for t, y in self.switches(1) if y)
+        solver = two_variable_solver()
+        condition = VariableBecomes(1)
+        results = solver.solve(20, stop=condition)
+
+        self.assertIs(condition, solver.stopped_by)
+        self.assertFalse(solver.cancelled)
+        self.assert_truncated(solver, results, first_true)
+
+    def test_variable_becomes_ignores_initial_state(self):
+        # x1 is True at the start so the first switch to True comes after a switch to False
+        first_false = min(t for t, y in self.switches(0) if not y)
+        first_true = min(t for t, y in self.switches(0) if y and t > first_false)
+        solver = two_variable_solver()
+        results = solver.solve(20, stop=VariableBecomes(0, True))
+
+        self.assert_truncated(solver, results, first_true)
+
+    def test_state_matches(self):
+        solver = two_variable_solver()
+        results = solver.solve(20, stop=StateMatches([False, None]))
+        first_false = min(t for t, y in self.switches(0) if not y)
+
+        self.assert_truncated(solver, results, first_false)
+
+    def test_function_and_list_of_conditions(self):
+        solver = two_variable_solver()
+        results = solver.solve(20, stop=[lambda t, state: False, lambda t, state: t >= 5])
+
+        self.assertTrue(solver.end_t >= 5)
+        self.assertTrue(callable(solver.stopped_by))
+        self.assert_truncated(solver, results, solver.end_t)
+
+    def test_start_is_called(self):
+        solver = two_variable_solver()
+        condition = CountSwitches(3)
+        solver.solve(20, stop=condition)
+
+        self.assertEqual((1, [True, False]), condition.started)
+        self.assertEqual(3, condition.count)
+
+    def test_not_met(self):
+        solver = two_variable_solver()
+        results = solver.solve(20, stop=lambda t, state: t > 30)
+
+        self.assertIsNone(solver.stopped_by)
+        self.assert_truncated(solver, results, 20)
+
+    def test_state_matches_wrong_length(self):
+        with self.assertRaises(ValueError):
+            two_variable_solver().solve(20, stop=StateMatches([True, True, True]))
+
+    def test_continue_after_stop(self):
+        solver = two_variable_solver()
+        solver.solve(20, stop=CountSwitches(4))
+        results = solver.resolve(end=20)
+
+        self.assertIsNone(solver.stopped_by)
+        self.assert_truncated(solver, results, 20)
+
+    def test_sequence(self):
+        states = [[self.full[0].get_state(t), self.full[1].get_state(t)]
+                  for t in sorted(set(self.full[0].t[1:] + self.full[1].t[1:]))]
+        pattern = states[3:6]
+        times = sorted(set(self.full[0].t[1:] + self.full[1].t[1:]))
+
+        solver = two_variable_solver()
+        results = solver.solve(20, stop=Sequence([StateMatches(p) for p in pattern]))
+
+        # The earliest occurrence of the pattern ends at or before its occurrence at 3:6
+        self.assertTrue(solver.end_t <= times[5])
+        i = times.index(solver.end_t)
+        self.assertEqual(pattern, states[i - 2:i + 1])
+        self.assert_truncated(solver, results, solver.end_t)
+
+    def test_sequence_within(self):
+        condition = Sequence([StateMatches([True, None]), StateMatches([None, True])], within=1)
+        condition.start(0, [False, False])
+
+        self.assertFalse(condition(1, [True, False]))
+        self.assertTrue(condition(1.5, [True, True]))
+
+        condition.start(0, [False, False])
+        self.assertFalse(condition(1, [True, False]))
+        self.assertFalse(condition(2.5, [True, True]))
+
+        # The conditions must be met at successive switch points
+        condition.start(0, [False, False])
+        self.assertFalse(condition(1, [True, False]))
+        self.assertFalse(condition(1.2, [False, False]))
+        self.assertFalse(condition(1.4, [False, True]))
+
+    def test_stop_condition_must_implement_call(self):
+        with self.assertRaises(TypeError):
+            StopCondition()
+
+    def test_empty_sequence(self):
+        with self.assertRaises(ValueError):
+            Sequence([])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from pybde import BooleanTimeSeries, BDESolver
+from pybde import save_boolean_time_series, load_boolean_time_series
+
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "series")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_load(self):
+        in1 = BooleanTimeSeries([0, 1, 2, 3], [True, False, True, False], 4, label="a", style="r-")
+        in2 = BooleanTimeSeries([0, 2.5], [False, True], 4.5, label="b")
+
+        save_boolean_time_series(self.path, [in1, in2])
+        [out1, out2] = load_boolean_time_series(self.path)
+
+        self.assertIsInstance(out1.t, np.memmap)
+        self.assertEqual([0, 1, 2, 3], out1.t.tolist())
+        self.assertEqual([True, False, True, False], out1.y.tolist())
+        self.assertEqual(4, out1.end)
+        self.assertEqual("a", out1.label)
+        self.assertEqual("r-", out1.style)
+
+        self.assertEqual([0, 2.5], out2.t.tolist())
+        self.assertEqual([False, True], out2.y.tolist())
+        self.assertEqual(4.5, out2.end)
+        self.assertEqual("b", out2.label)
+        self.assertIsNone(out2.style)
+
+    def test_load_without_memory_mapping(self):
+        bts = BooleanTimeSeries([0, 1], [True, False], 2)
+
+        save_boolean_time_series(self.path, [bts])
+        [loaded] = load_boolean_time_series(self.path, mmap_mode=None)
+
+        self.assertNotIsInstance(loaded.t, np.memmap)
+        self.assertEqual([0, 1], loaded.t.tolist())
+
+    def test_loaded_series_can_be_used(self):
+        history = BooleanTimeSeries([0], [False], 1)
+        result = BDESolver(lambda z: [not z[0][0]], [1], [history]).solve(3)
+
+        save_boolean_time_series(self.path, result)
+        [loaded] = load_boolean_time_series(self.path)
+
+        self.assertEqual(True, loaded.get_state(1.5))
+        self.assertEqual(0, loaded.hamming_distance(result[0]))
+
+    def test_error_loading_other_directory(self):
+        os.makedirs(self.path)
+        with open(os.path.join(self.path, "metadata.json"), "w") as f:
+            f.write("{}")
+
+        with self.assertRaises(ValueError):
+            load_boolean_time_series(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()